@@ -20,11 +20,12 @@ from common.types import (
     FileContent,
     Part,
 )
+from common.client import ArtifactAssembler
 from hosts.multiagent.host_agent import HostAgent
 from hosts.multiagent.remote_agent_connection import (
     TaskCallbackArg,
 )
-from utils.agent_card import get_agent_card
+from utils.agent_card import get_agent_card_async
 from service.server.application_manager import ApplicationManager
 from google.adk import Runner
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
@@ -58,7 +59,8 @@ class ADKHostManager(ApplicationManager):
     self._events = {}
     self._pending_message_ids = []
     self._agents = []
-    self._artifact_chunks = {}
+    # Chunked artifacts are kept in memory, since the UI renders their parts.
+    self._artifact_assembler = ArtifactAssembler(spill_threshold=None)
     self._session_service = InMemorySessionService()
     self._artifact_service = InMemoryArtifactService()
     self._memory_service = InMemoryMemoryService()
@@ -335,28 +337,13 @@ class ADKHostManager(ApplicationManager):
     return current_task
 
   def process_artifact_event(self, current_task:Task, task_update_event: TaskArtifactUpdateEvent):
-    artifact = task_update_event.artifact
-    if not artifact.append:
-      #received the first chunk or entire payload for an artifact
-      if artifact.lastChunk is None or artifact.lastChunk:
-        #lastChunk bit is missing or is set to true, so this is the entire payload
-        #add this to artifacts
-        if not current_task.artifacts:
-          current_task.artifacts = []
-        current_task.artifacts.append(artifact)
-      else:
-        #this is a chunk of an artifact, stash it in temp store for assemling
-        if not task_update_event.id in self._artifact_chunks:
-              self._artifact_chunks[task_update_event.id] = {}
-        self._artifact_chunks[task_update_event.id][artifact.index] = artifact
-    else:
-        # we received an append chunk, add to the existing temp artifact
-        current_temp_artifact = self._artifact_chunks[task_update_event.id][artifact.index]
-        # TODO handle if current_temp_artifact is missing
-        current_temp_artifact.parts.extend(artifact.parts)
-        if artifact.lastChunk:
-          current_task.artifacts.append(current_temp_artifact)
-          del self._artifact_chunks[task_update_event.id][artifact.index]
+    artifact = self._artifact_assembler.add(task_update_event.id, task_update_event.artifact)
+    if artifact is None:
+      # A chunk of an artifact that is not complete yet.
+      return
+    if not current_task.artifacts:
+      current_task.artifacts = []
+    current_task.artifacts.append(artifact)
 
   def add_event(self, event: Event):
     self._events[event.id] = event
@@ -391,8 +378,8 @@ class ADKHostManager(ApplicationManager):
         rval.append((message_id, ""))
     return rval
 
-  def register_agent(self, url):
-    agent_data = get_agent_card(url)
+  async def register_agent(self, url):
+    agent_data = await get_agent_card_async(url)
     if not agent_data.url:
       agent_data.url = url
     self._agents.append(agent_data)
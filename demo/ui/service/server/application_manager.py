@@ -17,7 +17,7 @@ class ApplicationManager(ABC):
     pass
 
   @abstractmethod
-  def register_agent(self, url: str):
+  async def register_agent(self, url: str):
     pass
 
   @abstractmethod
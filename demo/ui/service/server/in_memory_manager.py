@@ -13,7 +13,7 @@ from common.types import (
     AgentCard,
     DataPart,
 )
-from utils.agent_card import get_agent_card
+from utils.agent_card import get_agent_card_async
 from service.server.application_manager import ApplicationManager
 from service.server import test_image
 
@@ -156,8 +156,8 @@ class InMemoryFakeAgentManager(ApplicationManager):
       return rval
     return self._pending_message_ids
 
-  def register_agent(self, url):
-    agent_data = get_agent_card(url)
+  async def register_agent(self, url):
+    agent_data = await get_agent_card_async(url)
     if not agent_data.url:
       agent_data.url = url
     self._agents.append(agent_data)
@@ -6,6 +6,7 @@ import uuid
 from typing import Any
 from fastapi import APIRouter
 from fastapi import Request, Response
+from fastapi.responses import RedirectResponse
 from common.types import Message, Task, FilePart, FileContent
 from .in_memory_manager import InMemoryFakeAgentManager
 from .application_manager import ApplicationManager
@@ -166,7 +167,7 @@ class ConversationServer:
   async def _register_agent(self, request: Request):
     message_data = await request.json()
     url = message_data['params']
-    self.manager.register_agent(url)
+    await self.manager.register_agent(url)
     return RegisterAgentResponse()
 
   async def _list_agents(self):
@@ -176,6 +177,9 @@ class ConversationServer:
     if file_id not in self._file_cache:
       raise Exception("file not found")
     part = self._file_cache[file_id]
+    if part.file.uri:
+      # Uploaded to the agent's blob endpoint; served from there.
+      return RedirectResponse(part.file.uri)
     if "image" in part.file.mimeType:
       return Response(
           content=base64.b64decode(part.file.bytes),
@@ -1,9 +1,10 @@
-import requests
+from common.client import A2ACardResolver
 from common.types import AgentCard
 
 def get_agent_card(remote_agent_address: str) -> AgentCard:
-  """Get the agent card."""
-  agent_card = requests.get(
-      f"http://{remote_agent_address}/.well-known/agent.json"
-  )
-  return AgentCard(**agent_card.json())
+  """Get the agent card, reusing the process-wide agent card cache."""
+  return A2ACardResolver(f"http://{remote_agent_address}").get_agent_card()
+
+async def get_agent_card_async(remote_agent_address: str) -> AgentCard:
+  """Get the agent card without blocking the event loop."""
+  return await A2ACardResolver(f"http://{remote_agent_address}").get_agent_card_async()
@@ -8,6 +8,7 @@ from agent import ImageGenerationAgent
 import click
 from common.server import A2AServer
 from common.types import AgentCapabilities, AgentCard, AgentSkill, MissingAPIKeyError
+from common.utils.in_memory_cache import InMemoryCache
 import logging
 import os
 from task_manager import AgentTaskManager
@@ -18,15 +19,25 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Generated images are kept per session, base64 encoded, for this long and
+# within this much memory; the least recently used sessions go first.
+IMAGE_CACHE_MAX_BYTES = 256 * 2**20
+IMAGE_CACHE_TTL = 60 * 60
+
 @click.command()
 @click.option("--host", "host", default="localhost")
 @click.option("--port", "port", default=10001)
-def main(host, port):
+@click.option("--cache-max-mb", "cache_max_mb", default=IMAGE_CACHE_MAX_BYTES // 2**20)
+def main(host, port, cache_max_mb):
   """Entry point for the A2A + CrewAI Image generation sample."""
   try:
     if not os.getenv("GOOGLE_API_KEY"):
         raise MissingAPIKeyError("GOOGLE_API_KEY environment variable not set.")
 
+    InMemoryCache().configure(
+        max_bytes=cache_max_mb * 2**20, default_ttl=IMAGE_CACHE_TTL
+    )
+
     capabilities = AgentCapabilities(streaming=False)
     skill = AgentSkill(
         id="image_generator",
@@ -121,8 +121,10 @@ def generate_image_tool(prompt: str, session_id: str, artifact_file_id: str = No
           # Session doesn't exist, create it with the new item
           cache.set(session_id, {data.id: data})
         else:
-          # Session exists, update the existing dictionary directly
+          # Session exists, update the existing dictionary directly, and set
+          # it again so that the cache accounts for its new size.
           session_data[data.id] = data
+          cache.set(session_id, session_data)
 
         return data.id
       except Exception as e:
@@ -218,6 +220,7 @@ class ImageGenerationAgent:
     try:
       cache.get(session_id)
       return session_data[image_key]
-    except KeyError:
+    except (KeyError, TypeError):
+      # TypeError: the session has expired or was evicted from the cache.
       logger.error(f"Error generating image")
       return Imagedata(error="Error generating image, please try again.")
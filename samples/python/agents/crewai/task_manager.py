@@ -65,28 +65,6 @@ class AgentTaskManager(InMemoryTaskManager):
 
     await self.upsert_task(request.params)
 
-  async def _update_store(
-      self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
-  ) -> Task:
-    async with self.lock:
-      try:
-        task = self.tasks[task_id]
-      except KeyError as exc:
-        logger.error("Task %s not found for updating the task", task_id)
-        raise ValueError(f"Task {task_id} not found") from exc
-
-      task.status = status
-
-      if status.message is not None:
-        self.task_messages[task_id].append(status.message)
-
-      if artifacts is not None:
-        if task.artifacts is None:
-          task.artifacts = []
-        task.artifacts.extend(artifacts)
-
-      return task
-
   async def _invoke(self, request: SendTaskRequest) -> SendTaskResponse:
     task_send_params: TaskSendParams = request.params
     query = self._get_user_query(task_send_params)
@@ -111,7 +89,7 @@ class AgentTaskManager(InMemoryTaskManager):
       parts = [{"type": "text", "text": data.error}]
 
     print(f"Final Result ===> {result}")
-    task = await self._update_store(
+    task = await self.update_store(
         task_send_params.id,
         TaskStatus(state=TaskState.COMPLETED),
         [Artifact(parts=parts)],
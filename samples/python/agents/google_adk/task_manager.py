@@ -10,7 +10,6 @@ from common.types import (
     TaskArtifactUpdateEvent,
     TextPart,
     TaskState,
-    Task,
     SendTaskResponse,
     InternalError,
     JSONRPCResponse,
@@ -58,7 +57,7 @@ class AgentTaskManager(InMemoryTaskManager):
               artifacts = [Artifact(parts=parts, index=0, append=False)]
           message = Message(role="agent", parts=parts)
           task_status = TaskStatus(state=task_state, message=message)
-          await self._update_store(task_send_params.id, task_status, artifacts)
+          await self.update_store(task_send_params.id, task_status, artifacts)
           task_update_event = TaskStatusUpdateEvent(
                 id=task_send_params.id,
                 status=task_status,
@@ -121,23 +120,6 @@ class AgentTaskManager(InMemoryTaskManager):
             return error
         await self.upsert_task(request.params)
         return self._stream_generator(request)
-    async def _update_store(
-        self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
-    ) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError:
-                logger.error(f"Task {task_id} not found for updating the task")
-                raise ValueError(f"Task {task_id} not found")
-            task.status = status
-            #if status.message is not None:
-            #    self.task_messages[task_id].append(status.message)
-            if artifacts is not None:
-                if task.artifacts is None:
-                    task.artifacts = []
-                task.artifacts.extend(artifacts)
-            return task
     async def _invoke(self, request: SendTaskRequest) -> SendTaskResponse:
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
@@ -148,7 +130,7 @@ class AgentTaskManager(InMemoryTaskManager):
             raise ValueError(f"Error invoking agent: {e}")
         parts = [{"type": "text", "text": result}]
         task_state = TaskState.INPUT_REQUIRED if "MISSING_INFO:" in result else TaskState.COMPLETED
-        task = await self._update_store(
+        task = await self.update_store(
             task_send_params.id,
             TaskStatus(
                 state=task_state, message=Message(role="agent", parts=parts)
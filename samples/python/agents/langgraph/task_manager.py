@@ -12,10 +12,8 @@ from common.types import (
     JSONRPCResponse,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
-    TaskArtifactUpdateEvent,
     TaskStatusUpdateEvent,
     Task,
-    TaskIdParams,
     PushNotificationConfig,
     SetTaskPushNotificationRequest,
     SetTaskPushNotificationResponse,
@@ -23,9 +21,11 @@ from common.types import (
     TaskNotFoundError,
     InvalidParamsError,
 )
+from common.server.artifact_streamer import ArtifactStreamer
 from common.server.task_manager import InMemoryTaskManager
 from agents.langgraph.agent import CurrencyAgent
 from common.utils.push_notification_auth import PushNotificationSenderAuth
+from common.utils.push_notification_dispatcher import PushNotificationDispatcher
 import common.server.utils as utils
 from typing import Union
 import asyncio
@@ -37,7 +37,9 @@ logger = logging.getLogger(__name__)
 
 class AgentTaskManager(InMemoryTaskManager):
     def __init__(self, agent: CurrencyAgent, notification_sender_auth: PushNotificationSenderAuth):
-        super().__init__()
+        super().__init__(
+            notification_dispatcher=PushNotificationDispatcher(notification_sender_auth)
+        )
         self.agent = agent
         self.notification_sender_auth = notification_sender_auth
 
@@ -49,7 +51,6 @@ class AgentTaskManager(InMemoryTaskManager):
             async for item in self.agent.stream(query, task_send_params.sessionId):
                 is_task_complete = item["is_task_complete"]
                 require_user_input = item["require_user_input"]
-                artifact = None
                 message = None
                 parts = [{"type": "text", "text": item["content"]}]
                 end_stream = False
@@ -63,26 +64,15 @@ class AgentTaskManager(InMemoryTaskManager):
                     end_stream = True
                 else:
                     task_state = TaskState.COMPLETED
-                    artifact = Artifact(parts=parts, index=0, append=False)
+                    # Stored and sent to subscribers in chunks, so a long
+                    # answer does not travel as a single event.
+                    await ArtifactStreamer(self, task_send_params.id).send_text(item["content"])
                     end_stream = True
 
                 task_status = TaskStatus(state=task_state, message=message)
-                latest_task = await self.update_store(
-                    task_send_params.id,
-                    task_status,
-                    None if artifact is None else [artifact],
-                )
+                latest_task = await self.update_store(task_send_params.id, task_status, None)
                 await self.send_task_notification(latest_task)
 
-                if artifact:
-                    task_artifact_update_event = TaskArtifactUpdateEvent(
-                        id=task_send_params.id, artifact=artifact
-                    )
-                    await self.enqueue_events_for_sse(
-                        task_send_params.id, task_artifact_update_event
-                    )                    
-                    
-
                 task_update_event = TaskStatusUpdateEvent(
                     id=task_send_params.id, status=task_status, final=end_stream
                 )
@@ -215,27 +205,10 @@ class AgentTaskManager(InMemoryTaskManager):
         push_info = await self.get_push_notification_info(task.id)
 
         logger.info(f"Notifying for task {task.id} => {task.status.state}")
-        await self.notification_sender_auth.send_push_notification(
-            push_info.url,
-            data=task.model_dump(exclude_none=True)
+        self.notification_dispatcher.enqueue(
+            task.id, push_info.url, task.model_dump_json(exclude_none=True).encode()
         )
 
-    async def on_resubscribe_to_task(
-        self, request
-    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        task_id_params: TaskIdParams = request.params
-        try:
-            sse_event_queue = await self.setup_sse_consumer(task_id_params.id, True)
-            return self.dequeue_events_for_sse(request.id, task_id_params.id, sse_event_queue)
-        except Exception as e:
-            logger.error(f"Error while reconnecting to SSE stream: {e}")
-            return JSONRPCResponse(
-                id=request.id,
-                error=InternalError(
-                    message=f"An error occurred while reconnecting to stream: {e}"
-                ),
-            )
-    
     async def set_push_notification_info(self, task_id: str, push_notification_config: PushNotificationConfig):
         # Verify the ownership of notification URL by issuing a challenge request.
         is_verified = await self.notification_sender_auth.verify_push_notification_url(push_notification_config.url)
@@ -1,4 +1,4 @@
-from common.server import A2AServer
+from common.server import A2AServer, BlobStore
 from common.types import AgentCard, AgentCapabilities, AgentSkill, MissingAPIKeyError
 from common.utils.push_notification_auth import PushNotificationSenderAuth
 from agents.llama_index_file_chat.task_manager import LlamaIndexTaskManager
@@ -16,7 +16,13 @@ logger = logging.getLogger(__name__)
 @click.command()
 @click.option("--host", "host", default="localhost")
 @click.option("--port", "port", default=10010)
-def main(host, port):
+@click.option(
+    "--enable-uploads",
+    "enable_uploads",
+    is_flag=True,
+    help="Accept unauthenticated file uploads on /blobs, so clients can send large documents by uri",
+)
+def main(host, port, enable_uploads):
     """Starts the Currency Agent server."""
     try:
         if not os.getenv("GOOGLE_API_KEY"):
@@ -47,14 +53,18 @@ def main(host, port):
 
         notification_sender_auth = PushNotificationSenderAuth()
         notification_sender_auth.generate_jwk()
+        # Lets clients upload large documents instead of inlining them.
+        blob_store = BlobStore() if enable_uploads else None
         server = A2AServer(
             agent_card=agent_card,
             task_manager=LlamaIndexTaskManager(
                 agent=ParseAndChat(), 
-                notification_sender_auth=notification_sender_auth
+                notification_sender_auth=notification_sender_auth,
+                blob_store=blob_store,
             ),
             host=host,
             port=port,
+            blob_store=blob_store,
         )
 
         server.app.add_route(
@@ -1,6 +1,9 @@
 import asyncio
 import logging
+import time
 import traceback
+import base64
+from collections import OrderedDict
 from typing import AsyncIterable, Union, Dict, Any
 import common.server.utils as utils
 
@@ -22,12 +25,14 @@ from common.types import (
     TaskArtifactUpdateEvent,
     TaskStatusUpdateEvent,
     Task,
-    TaskIdParams,
     PushNotificationConfig,
     InvalidParamsError,
 )
+from common.server.blob_store import BlobStore
 from common.server.task_manager import InMemoryTaskManager
+from common.utils.file_content import read_file_content
 from common.utils.push_notification_auth import PushNotificationSenderAuth
+from common.utils.push_notification_dispatcher import PushNotificationDispatcher
 
 from llama_index.core.workflow import Context
 
@@ -44,19 +49,53 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
     ]
     SUPPORTED_OUTPUT_TYPES = ["text","text/plain"]
 
-    def __init__(self, agent: ParseAndChat, notification_sender_auth: PushNotificationSenderAuth):
-        super().__init__()
+    def __init__(
+        self,
+        agent: ParseAndChat,
+        notification_sender_auth: PushNotificationSenderAuth,
+        max_sessions: int = 1000,
+        blob_store: BlobStore | None = None,
+    ):
+        super().__init__(
+            notification_dispatcher=PushNotificationDispatcher(notification_sender_auth)
+        )
         self.agent = agent
+        # The server's upload store, so files sent by uri to it are read from disk.
+        self.blob_store = blob_store
         self.notification_sender_auth = notification_sender_auth
-        # Store context state by session ID
+        # Store context state by session ID, least recently used first
         # Ideally, you would use a database or other kv store the context state
-        self.ctx_states: Dict[str, Dict[str, Any]] = {}  
+        self.ctx_states: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self.ctx_state_updated_at: Dict[str, float] = {}
+        self.max_sessions = max_sessions
+
+    def _save_ctx_state(self, session_id: str, ctx_state: Dict[str, Any]):
+        self.ctx_states[session_id] = ctx_state
+        self.ctx_states.move_to_end(session_id)
+        self.ctx_state_updated_at[session_id] = time.monotonic()
+        while len(self.ctx_states) > self.max_sessions:
+            oldest_session_id, _ = self.ctx_states.popitem(last=False)
+            self.ctx_state_updated_at.pop(oldest_session_id, None)
+
+    def _drop_ctx_state(self, session_id: str):
+        self.ctx_states.pop(session_id, None)
+        self.ctx_state_updated_at.pop(session_id, None)
+
+    async def sweep_expired_tasks(self) -> int:
+        evicted = await super().sweep_expired_tasks()
+        ttl = self.task_retention.terminal_task_ttl
+        if ttl is not None:
+            cutoff = time.monotonic() - ttl
+            for session_id, updated_at in list(self.ctx_state_updated_at.items()):
+                if updated_at <= cutoff:
+                    self._drop_ctx_state(session_id)
+        return evicted
 
     async def _run_streaming_agent(self, request: SendTaskStreamingRequest):
         task_send_params: TaskSendParams = request.params
         task_id = task_send_params.id
         session_id = task_send_params.sessionId
-        input_event = self._get_input_event(task_send_params)
+        input_event = await self._get_input_event(task_send_params)
 
         try:
             ctx = None
@@ -112,7 +151,7 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
                     metadata = {str(k): v for k, v in metadata.items()}                    
 
                 # save the context state to resume the current session
-                self.ctx_states[session_id] = handler.ctx.to_dict()
+                self._save_ctx_state(session_id, handler.ctx.to_dict())
                 
                 artifact = Artifact(parts=parts, index=0, append=False, metadata=metadata)
                 task_status = TaskStatus(state=TaskState.COMPLETED)
@@ -142,8 +181,7 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
             )
             
             # Clean up context in case of error
-            if session_id in self.ctx_states:
-                del self.ctx_states[session_id]
+            self._drop_ctx_state(session_id)
 
     def _validate_request(
         self, request: Union[SendTaskRequest, SendTaskStreamingRequest]
@@ -187,7 +225,7 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
         await self.send_task_notification(task)
 
         task_send_params: TaskSendParams = request.params
-        input_event = self._get_input_event(task_send_params)
+        input_event = await self._get_input_event(task_send_params)
         
         try:
             # Check if we have a saved context for this session
@@ -230,8 +268,7 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
             logger.error(traceback.format_exc())
             
             # Clean up context in case of error
-            if session_id in self.ctx_states:
-                del self.ctx_states[session_id]
+            self._drop_ctx_state(session_id)
             
             # Return error response
             parts = [{"type": "text", "text": f"Error: {str(e)}"}]
@@ -273,16 +310,21 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
                 ),
             )
 
-    def _get_input_event(self, task_send_params: TaskSendParams) -> InputEvent:
+    async def _get_input_event(self, task_send_params: TaskSendParams) -> InputEvent:
         """Extract file attachment if present in the message parts."""
         file_data = None
         file_name = None
         text_parts = []
         for part in task_send_params.message.parts:
             if isinstance(part, FilePart):
-                file_data =part.file.bytes
                 file_name = part.file.name
-                if file_data is None:
+                if part.file.bytes is not None:
+                    file_data = part.file.bytes
+                elif part.file.uri is not None:
+                    # Uploaded out of band; the workflow takes base64.
+                    content = await read_file_content(part.file, self.blob_store)
+                    file_data = base64.b64encode(content).decode()
+                else:
                     raise ValueError("File data is missing!")
             elif isinstance(part, TextPart):
                 text_parts.append(part.text)
@@ -302,27 +344,10 @@ class LlamaIndexTaskManager(InMemoryTaskManager):
         push_info = await self.get_push_notification_info(task.id)
 
         logger.info(f"Notifying for task {task.id} => {task.status.state}")
-        await self.notification_sender_auth.send_push_notification(
-            push_info.url,
-            data=task.model_dump(exclude_none=True)
+        self.notification_dispatcher.enqueue(
+            task.id, push_info.url, task.model_dump_json(exclude_none=True).encode()
         )
 
-    async def on_resubscribe_to_task(
-        self, request
-    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        task_id_params: TaskIdParams = request.params
-        try:
-            sse_event_queue = await self.setup_sse_consumer(task_id_params.id, True)
-            return self.dequeue_events_for_sse(request.id, task_id_params.id, sse_event_queue)
-        except Exception as e:
-            logger.error(f"Error while reconnecting to SSE stream: {e}")
-            return JSONRPCResponse(
-                id=request.id,
-                error=InternalError(
-                    message=f"An error occurred while reconnecting to stream: {e}"
-                ),
-            )
-    
     async def set_push_notification_info(self, task_id: str, push_notification_config: PushNotificationConfig):
         # Verify the ownership of notification URL by issuing a challenge request.
         is_verified = await self.notification_sender_auth.verify_push_notification_url(push_notification_config.url)
@@ -21,7 +21,6 @@ from common.types import (
     SendTaskStreamingResponse,
     Task,
     TaskArtifactUpdateEvent,
-    TaskIdParams,
     TaskSendParams,
     TaskState,
     TaskStatus,
@@ -29,6 +28,7 @@ from common.types import (
     TextPart,
 )
 from common.utils.push_notification_auth import PushNotificationSenderAuth
+from common.utils.push_notification_dispatcher import PushNotificationDispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +39,9 @@ class AgentTaskManager(InMemoryTaskManager):
         agent: ExtractorAgent,
         notification_sender_auth: PushNotificationSenderAuth,
     ):
-        super().__init__()
+        super().__init__(
+            notification_dispatcher=PushNotificationDispatcher(notification_sender_auth)
+        )
         self.agent = agent
         self.notification_sender_auth = notification_sender_auth
 
@@ -286,28 +288,10 @@ class AgentTaskManager(InMemoryTaskManager):
         push_info = await self.get_push_notification_info(task.id)
 
         logger.info(f"Notifying for task {task.id} => {task.status.state}")
-        await self.notification_sender_auth.send_push_notification(
-            push_info.url, data=task.model_dump(exclude_none=True)
+        self.notification_dispatcher.enqueue(
+            task.id, push_info.url, task.model_dump_json(exclude_none=True).encode()
         )
 
-    async def on_resubscribe_to_task(
-        self, request
-    ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
-        task_id_params: TaskIdParams = request.params
-        try:
-            sse_event_queue = await self.setup_sse_consumer(task_id_params.id, True)
-            return self.dequeue_events_for_sse(  # type: ignore
-                request.id, task_id_params.id, sse_event_queue
-            )
-        except Exception as e:
-            logger.error(f"Error while reconnecting to SSE stream: {e}")
-            return JSONRPCResponse(
-                id=request.id,
-                error=InternalError(
-                    message=f"An error occurred while reconnecting to stream: {e}"
-                ),
-            )
-
     async def set_push_notification_info(
         self, task_id: str, push_notification_config: PushNotificationConfig
     ):
@@ -19,6 +19,7 @@ from common.types import (
     TaskStatusUpdateEvent,
 )
 from common.utils.push_notification_auth import PushNotificationSenderAuth
+from common.utils.push_notification_dispatcher import PushNotificationDispatcher
 
 from agents.semantickernel.agent import SemanticKernelTravelAgent
 
@@ -30,7 +31,9 @@ class TaskManager(InMemoryTaskManager):
 
     def __init__(self, notification_sender_auth: PushNotificationSenderAuth):
         """Initialize the TaskManager with a notification sender."""
-        super().__init__()
+        super().__init__(
+            notification_dispatcher=PushNotificationDispatcher(notification_sender_auth)
+        )
         self.agent = SemanticKernelTravelAgent()
         self.notification_sender_auth = notification_sender_auth
 
@@ -202,6 +205,6 @@ class TaskManager(InMemoryTaskManager):
         if not await self.has_push_notification_info(task.id):
             return
         push_info = await self.get_push_notification_info(task.id)
-        await self.notification_sender_auth.send_push_notification(
-            push_info.url, data=task.model_dump(exclude_none=True)
+        self.notification_dispatcher.enqueue(
+            task.id, push_info.url, task.model_dump_json(exclude_none=True).encode()
         )
@@ -0,0 +1,88 @@
+"""Memory and time to reassemble a large artifact streamed in chunks.
+
+Splits a `--size-mb` file into `--chunk-kb` append chunks with
+ArtifactStreamer, then reassembles them on the client:
+
+- extend parts: the previous approach of the demo's ADKHostManager, which
+  extends the first chunk's parts with those of every following chunk
+  and then has to join them;
+- assembler: ArtifactAssembler keeping everything in memory;
+- assembler, spill: ArtifactAssembler with the default spill threshold, so
+  the file goes to a temporary file.
+
+Reports the peak memory allocated while reassembling (tracemalloc). The
+chunks themselves are generated one at a time, as they would arrive.
+
+    python -m benchmarks.bench_artifact_assembly
+"""
+
+import argparse
+import base64
+import os
+import time
+import tracemalloc
+from urllib.parse import urlparse
+
+from common.client import ArtifactAssembler
+from common.client.artifact_assembler import DEFAULT_SPILL_THRESHOLD
+from common.server import ArtifactStreamer
+
+
+def chunks(data: bytes, chunk_size: int):
+    streamer = ArtifactStreamer(task_manager=None, task_id="task", chunk_size=chunk_size)
+    return streamer.file_chunks(data, 0, name="out.bin", mime_type="application/octet-stream")
+
+
+def extend_parts(data: bytes, chunk_size: int) -> bytes:
+    artifact = None
+    for chunk in chunks(data, chunk_size):
+        if artifact is None:
+            artifact = chunk
+        else:
+            artifact.parts.extend(chunk.parts)
+    return base64.b64decode("".join(part.file.bytes for part in artifact.parts))
+
+
+def assembler(spill_threshold: int | None):
+    def reassemble(data: bytes, chunk_size: int) -> bytes:
+        artifact = None
+        assembler = ArtifactAssembler(spill_threshold=spill_threshold)
+        for chunk in chunks(data, chunk_size):
+            artifact = assembler.add("task", chunk) or artifact
+        file = artifact.parts[0].file
+        if file.uri is None:
+            return base64.b64decode(file.bytes)
+        # Only the size is checked for spilled files, to leave their reading
+        # out of the measurement.
+        path = urlparse(file.uri).path
+        size = os.path.getsize(path)
+        os.remove(path)
+        return size
+
+    return reassemble
+
+
+def main(size_mb: int, chunk_kb: int):
+    data = os.urandom(size_mb * 2**20)
+    print(f"{size_mb} MB file in {chunk_kb} KiB chunks")
+    for name, fn in (
+        ("extend parts", extend_parts),
+        ("assembler", assembler(None)),
+        ("assembler, spill", assembler(DEFAULT_SPILL_THRESHOLD)),
+    ):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = fn(data, chunk_kb * 1024)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert result in (data, len(data)), "artifact was corrupted"
+        print(f"{name:<20} {elapsed * 1000:>8.0f} ms  peak allocated {peak / 2**20:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    args = parser.parse_args()
+    main(args.size_mb, args.chunk_kb)
@@ -0,0 +1,111 @@
+"""Time to first byte and per-event size of a large streamed artifact.
+
+An agent generates `--size-mb` of text in `--pieces` pieces, taking
+`--delay` seconds per piece. It is sent to an SSE subscriber of an
+InMemoryTaskManager either:
+
+- whole: as one TaskArtifactUpdateEvent once it is all generated, as the
+  sample agents do;
+- streamed: with ArtifactStreamer, in append chunks as it is generated.
+
+The subscriber renders every event to JSON as A2AServer does. The script
+reports when the first artifact byte reached it, when the artifact was
+complete, and the size of the largest event.
+
+    python -m benchmarks.bench_artifact_streaming
+"""
+
+import argparse
+import asyncio
+import time
+
+from common.server import ArtifactStreamer, InMemoryTaskManager
+from common.server.task_store import InMemoryTaskStore
+from common.types import (
+    Artifact,
+    Message,
+    TaskArtifactUpdateEvent,
+    TaskSendParams,
+    TextPart,
+)
+
+
+class BenchTaskManager(InMemoryTaskManager):
+    def __init__(self):
+        super().__init__(task_store=InMemoryTaskStore())
+
+    async def on_send_task(self, request):
+        pass
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+async def generate(size: int, pieces: int, delay: float):
+    piece, remainder = divmod(size, pieces)
+    for i in range(pieces):
+        await asyncio.sleep(delay)
+        # The last piece carries the remainder, so the pieces add up to size.
+        yield "x" * (piece + (remainder if i == pieces - 1 else 0))
+
+
+async def produce(task_manager, mode: str, size: int, pieces: int, delay: float, chunk_size: int):
+    if mode == "streamed":
+        await ArtifactStreamer(task_manager, "task", chunk_size).send_text(
+            generate(size, pieces, delay)
+        )
+        return
+    text = "".join([piece async for piece in generate(size, pieces, delay)])
+    artifact = Artifact(parts=[TextPart(text=text)])
+    await task_manager.update_store("task", None, [artifact])
+    await task_manager.enqueue_events_for_sse(
+        "task", TaskArtifactUpdateEvent(id="task", artifact=artifact)
+    )
+
+
+async def run(mode: str, size: int, pieces: int, delay: float, chunk_size: int):
+    task_manager = BenchTaskManager()
+    await task_manager.upsert_task(
+        TaskSendParams(id="task", message=Message(role="user", parts=[TextPart(text="go")]))
+    )
+    queue = await task_manager.setup_sse_consumer("task")
+
+    start = time.perf_counter()
+    producer = asyncio.create_task(produce(task_manager, mode, size, pieces, delay, chunk_size))
+    first_byte = None
+    largest = events = received = 0
+    while received < size:
+        _, event = await queue.get()
+        body = event.model_dump_json(exclude_none=True)
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        largest = max(largest, len(body))
+        received += sum(len(part.text) for part in event.artifact.parts)
+        events += 1
+    complete = time.perf_counter() - start
+    await producer
+
+    task = await task_manager.task_store.get_task("task")
+    [artifact] = task.artifacts
+    assert sum(len(part.text) for part in artifact.parts) == size
+    print(
+        f"{mode:<10} first byte {first_byte * 1000:>8.1f} ms  complete {complete * 1000:>8.1f} ms"
+        f"  events {events:>6}  largest event {largest / 1024:>10,.0f} KiB"
+    )
+
+
+def main(size_mb: int, pieces: int, delay: float, chunk_kb: int):
+    size = size_mb * 2**20
+    print(f"{size_mb} MB of text in {pieces} pieces, {delay * 1000:.0f} ms each, {chunk_kb} KiB chunks")
+    for mode in ("whole", "streamed"):
+        asyncio.run(run(mode, size, pieces, delay, chunk_kb * 1024))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=20)
+    parser.add_argument("--pieces", type=int, default=40)
+    parser.add_argument("--delay", type=float, default=0.01)
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    args = parser.parse_args()
+    main(args.size_mb, args.pieces, args.delay, args.chunk_kb)
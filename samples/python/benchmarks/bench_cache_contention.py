@@ -0,0 +1,171 @@
+"""Cache throughput and latency with many threads and coroutines.
+
+Threads: `--threads` threads each do `--ops` operations (one set to every
+four gets, over `--keys` keys, with a `--keys`/2 entry limit so eviction
+runs too) on
+
+- InMemoryCache: the singleton, one lock for every key;
+- striped: a namespace whose keys are spread over `--stripes` locks.
+
+Coroutines: `--coroutines` coroutines on one event loop each do
+`--coroutine-ops` operations of the same mix while `--load-threads`
+threads keep hammering InMemoryCache, using either
+
+- InMemoryCache: shared with the threads, so the loop thread waits for
+  their lock;
+- AsyncCache: a cache of the loop's own, which takes no lock.
+
+Reports per-operation latency and, for coroutines, the longest time the
+loop was blocked. Under the GIL threads do not run in parallel, so striping
+shows its gains on a free-threaded build.
+
+    python -m benchmarks.bench_cache_contention --threads 1 8 32
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import threading
+import time
+
+from benchmarks.utils import summarize
+from common.utils.in_memory_cache import AsyncCache, InMemoryCache
+
+
+def operations(keys: int, ops: int, seed: int) -> list[tuple[bool, str]]:
+    rng = random.Random(seed)
+    return [(rng.random() < 0.2, f"key{rng.randrange(keys)}") for _ in range(ops)]
+
+
+def hammer(cache, work, latencies, stop=None):
+    while True:
+        for is_set, key in work:
+            start = time.perf_counter()
+            if is_set:
+                cache.set(key, key)
+            else:
+                cache.get(key)
+            latencies.append(time.perf_counter() - start)
+        if stop is None or stop.is_set():
+            return
+
+
+def run_threads(name: str, cache, num_threads: int, keys: int, ops: int):
+    cache.clear()
+    cache.configure(max_entries=keys // 2)
+    results = [[] for _ in range(num_threads)]
+    threads = [
+        threading.Thread(target=hammer, args=(cache, operations(keys, ops, n), results[n]))
+        for n in range(num_threads)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    print(summarize(f"{num_threads:>3} threads, {name}", sum(results, []), elapsed))
+
+
+async def coroutine(cache, work, latencies, is_async: bool):
+    for i, (is_set, key) in enumerate(work):
+        start = time.perf_counter()
+        if is_async:
+            if is_set:
+                await cache.set(key, key)
+            else:
+                await cache.get(key)
+        elif is_set:
+            cache.set(key, key)
+        else:
+            cache.get(key)
+        latencies.append(time.perf_counter() - start)
+        if i % 16 == 0:
+            await asyncio.sleep(0)
+
+
+async def watch_loop(stop: asyncio.Event) -> float:
+    """Returns the longest time the loop took to come back to this task."""
+    longest = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0)
+        longest = max(longest, time.perf_counter() - start)
+    return longest
+
+
+async def run_coroutines(name: str, cache, num_coroutines: int, keys: int, ops: int):
+    is_async = isinstance(cache, AsyncCache)
+    cache.configure(max_entries=keys // 2)
+    latencies = []
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_loop(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        coroutine(cache, operations(keys, ops, n), latencies, is_async)
+        for n in range(num_coroutines)
+    ))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    stall = await watcher
+    print(
+        summarize(f"{num_coroutines:>3} coroutines, {name}", latencies, elapsed)
+        + f"  loop stall={stall * 1000:.1f}ms"
+    )
+
+
+def run_coroutines_under_load(
+    num_threads: int, num_coroutines: int, keys: int, ops: int, coroutine_ops: int
+):
+    shared = InMemoryCache()
+    shared.clear()
+    shared.configure(max_entries=keys // 2)
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=hammer, args=(shared, operations(keys, ops, n), [], stop))
+        for n in range(num_threads)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for cache in (shared, AsyncCache()):
+            asyncio.run(run_coroutines(
+                type(cache).__name__, cache, num_coroutines, keys, coroutine_ops
+            ))
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def main(
+    thread_counts: list[int],
+    num_coroutines: int,
+    coroutine_ops: int,
+    load_threads: int,
+    stripes: int,
+    keys: int,
+    ops: int,
+):
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{keys} keys, {ops} operations per worker, {stripes} stripes, GIL {'on' if gil else 'off'}")
+    striped = InMemoryCache.namespace("bench-striped", lock_stripes=stripes)
+    for num_threads in thread_counts:
+        run_threads("InMemoryCache", InMemoryCache(), num_threads, keys, ops)
+        run_threads("striped", striped, num_threads, keys, ops)
+    print(f"with {load_threads} threads on InMemoryCache:")
+    run_coroutines_under_load(load_threads, num_coroutines, keys, ops, coroutine_ops)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--coroutines", type=int, default=100)
+    parser.add_argument("--coroutine-ops", type=int, default=200)
+    parser.add_argument("--load-threads", type=int, default=4)
+    parser.add_argument("--stripes", type=int, default=16)
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--ops", type=int, default=20_000)
+    args = parser.parse_args()
+    main(args.threads, args.coroutines, args.coroutine_ops, args.load_threads, args.stripes, args.keys, args.ops)
@@ -0,0 +1,112 @@
+"""Per-call latency of sequential tasks/get polling from A2AClient.
+
+Starts an A2AServer on localhost and polls one task, comparing the previous
+behaviour (a new `httpx.AsyncClient`, and so a new TCP connection, per call)
+with the pooled client A2AClient now keeps across calls.
+
+    python -m benchmarks.bench_client_pooling
+"""
+
+import argparse
+import asyncio
+import socket
+import threading
+import time
+
+import httpx
+import uvicorn
+
+from benchmarks.utils import summarize
+from common.client import A2AClient
+from common.server import A2AServer, InMemoryTaskManager
+from common.server.task_store import InMemoryTaskStore
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    GetTaskRequest,
+    GetTaskResponse,
+    Task,
+    TaskState,
+    TaskStatus,
+)
+
+
+class PollingTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        pass
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> uvicorn.Server:
+    task_manager = PollingTaskManager(task_store=InMemoryTaskStore())
+    task_manager.tasks["task"] = Task(id="task", status=TaskStatus(state=TaskState.WORKING))
+    agent_card = AgentCard(
+        name="Polling",
+        url=f"http://127.0.0.1:{port}/",
+        version="1.0.0",
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+    app = A2AServer(agent_card=agent_card, task_manager=task_manager).app
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def get_task_per_call_client(url: str) -> GetTaskResponse:
+    request = GetTaskRequest(params={"id": "task"})
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json=request.model_dump(), timeout=30)
+        response.raise_for_status()
+        return GetTaskResponse(**response.json())
+
+
+async def poll(get_task, repeat: int) -> list[float]:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await get_task()
+        latencies.append(time.perf_counter() - start)
+        assert response.result.id == "task"
+    return latencies
+
+
+async def main(repeat: int):
+    port = free_port()
+    server = start_server(port)
+    url = f"http://127.0.0.1:{port}/"
+    try:
+        print(
+            summarize(
+                "new AsyncClient per call",
+                await poll(lambda: get_task_per_call_client(url), repeat),
+            )
+        )
+        async with A2AClient(url=url) as client:
+            print(
+                summarize(
+                    "pooled A2AClient",
+                    await poll(lambda: client.get_task({"id": "task"}), repeat),
+                )
+            )
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat))
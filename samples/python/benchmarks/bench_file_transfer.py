@@ -0,0 +1,181 @@
+"""Peak RSS and latency of sending a large file to an agent.
+
+Starts an A2AServer with a BlobStore on localhost, whose task manager reads
+the attached file and hashes it, and sends it a task with a 20 MB file:
+
+- inline: the file as base64 `bytes` in the JSON-RPC request, as before;
+- auto: the same payload, which A2AClient now uploads to the blob endpoint
+  and sends by uri;
+- upload: the file streamed from disk with `A2AClient.upload_file`.
+
+Each mode runs in its own process, so that the peak RSS it reports (client
+and server together, above the process's baseline) is its own.
+
+    python -m benchmarks.bench_file_transfer
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import uvicorn
+
+from benchmarks.bench_client_pooling import free_port
+from benchmarks.utils import summarize
+from common.client import A2AClient
+from common.server import A2AServer, BlobStore, InMemoryTaskManager
+from common.server.task_store import InMemoryTaskStore
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    FileContent,
+    FilePart,
+    Message,
+    SendTaskResponse,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+MODES = ("inline", "auto", "upload")
+
+
+class HashingTaskManager(InMemoryTaskManager):
+    """Reads the attached file, from the request or the blob store, and
+    completes the task with its sha256."""
+
+    def __init__(self, blob_store: BlobStore):
+        super().__init__(task_store=InMemoryTaskStore())
+        self.blob_store = blob_store
+
+    async def on_send_task(self, request):
+        file = request.params.message.parts[-1].file
+        digest = hashlib.sha256()
+        if file.bytes is not None:
+            digest.update(base64.b64decode(file.bytes))
+        else:
+            with self.blob_store.open(file.uri.rsplit("/", 1)[1]) as f:
+                while chunk := f.read(256 * 1024):
+                    digest.update(chunk)
+        await self.upsert_task(request.params)
+        task = await self.update_store(
+            request.params.id,
+            TaskStatus(
+                state=TaskState.COMPLETED,
+                message=Message(role="agent", parts=[TextPart(text=digest.hexdigest())]),
+            ),
+            None,
+        )
+        return SendTaskResponse(id=request.id, result=task)
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+def start_server(port: int):
+    blob_store = BlobStore(max_blob_size=1024 * 2**20)
+    agent_card = AgentCard(
+        name="Files",
+        url=f"http://127.0.0.1:{port}/",
+        version="1.0.0",
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+    app = A2AServer(
+        agent_card=agent_card,
+        task_manager=HashingTaskManager(blob_store),
+        blob_store=blob_store,
+    ).app
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return agent_card, blob_store
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def send(client: A2AClient, mode: str, path: str, task_id: str) -> str:
+    if mode == "upload":
+        file = await client.upload_file(path)
+    else:
+        with open(path, "rb") as f:
+            file = FileContent(
+                name=os.path.basename(path),
+                mimeType="application/octet-stream",
+                bytes=base64.b64encode(f.read()).decode(),
+            )
+    params = TaskSendParams(
+        id=task_id,
+        message=Message(role="user", parts=[TextPart(text="hash this"), FilePart(file=file)]),
+    )
+    response = await client.send_task(params)
+    return response.result.status.message.parts[0].text
+
+
+async def run_mode(mode: str, path: str, repeat: int):
+    agent_card, blob_store = start_server(free_port())
+    with open(path, "rb") as f:
+        expected = hashlib.sha256(f.read()).hexdigest()
+    client = A2AClient(
+        agent_card=agent_card,
+        timeout=120,
+        upload_threshold=None if mode == "inline" else 1024 * 1024,
+    )
+    baseline = peak_rss_mb()
+
+    latencies = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        digest = await send(client, mode, path, f"task_{i}")
+        latencies.append(time.perf_counter() - start)
+        assert digest == expected, "file was corrupted in transit"
+        # Keep the disk usage of repeated runs flat.
+        for blob_id in list(blob_store.blobs):
+            blob_store.delete(blob_id)
+
+    await client.close()
+    print(summarize(f"{mode}", latencies))
+    print(f"{'':<48} peak RSS +{peak_rss_mb() - baseline:.0f} MB")
+
+
+def main(size_mb: int, repeat: int):
+    with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as f:
+        f.write(os.urandom(size_mb * 2**20))
+    try:
+        print(f"{size_mb} MB file, {repeat} transfers per mode")
+        for mode in MODES:
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_file_transfer",
+                 "--mode", mode, "--file", f.name, "--repeat", str(repeat)],
+                check=True,
+            )
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        asyncio.run(run_mode(args.mode, args.file, args.repeat))
+    else:
+        main(args.size_mb, args.repeat)
@@ -0,0 +1,80 @@
+"""Push-notification ingestion throughput.
+
+Posts signed task notifications (a share of them redeliveries) concurrently
+to a PushNotificationListener through an in-process ASGI transport, with a
+consumer that only counts batches, and prints the listener's metrics:
+ingest rate, verify latency, duplicates and batch sizes.
+
+    python -m benchmarks.bench_push_listener
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.bench_push_signing import make_task
+from hosts.cli.push_notification_listener import PushNotificationListener
+from common.utils.push_notification_auth import (
+    PushNotificationReceiverAuth,
+    PushNotificationSenderAuth,
+)
+
+
+async def main(notifications: int, duplicates: float, concurrency: int, algorithm: str):
+    sender = PushNotificationSenderAuth()
+    sender.generate_jwk(algorithm)
+    receiver = PushNotificationReceiverAuth()
+    receiver.add_signing_keys(sender.public_keys)
+
+    async def consumer(batch):
+        pass
+
+    listener = PushNotificationListener("localhost", 0, receiver, consumer=consumer)
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=listener.app), base_url="http://listener"
+    )
+
+    unique = int(notifications * (1 - duplicates))
+    requests = []
+    for i in range(unique):
+        task = make_task(history_size=5)
+        task.id = f"task_{i}"
+        body = task.model_dump_json(exclude_none=True).encode()
+        requests.append((body, sender.get_auth_headers(body)))
+    # Redeliveries of already sent notifications.
+    requests += requests[: notifications - unique]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def post(body, headers):
+        async with semaphore:
+            response = await client.post("/notify", content=body, headers=headers)
+            response.raise_for_status()
+
+    worker = asyncio.create_task(listener.deliver_batches())
+    start = time.perf_counter()
+    await asyncio.gather(*(post(body, headers) for body, headers in requests))
+    await listener.queue.join()
+    elapsed = time.perf_counter() - start
+    worker.cancel()
+
+    print(f"{notifications} notifications in {elapsed:.2f}s ({notifications / elapsed:,.0f}/s end to end)")
+    for name, value in listener.metrics().items():
+        if "latency" in name and value is not None:
+            value = f"{value * 1e6:.1f}us"
+        elif isinstance(value, float):
+            value = f"{value:,.0f}"
+        print(f"  {name:<40} {value}")
+    print(f"  {'mean batch size':<40} {listener.delivered / max(listener.batches, 1):.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notifications", type=int, default=5000)
+    parser.add_argument("--duplicates", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--algorithm", default="ES256")
+    args = parser.parse_args()
+    asyncio.run(main(args.notifications, args.duplicates, args.concurrency, args.algorithm))
@@ -0,0 +1,88 @@
+"""Push-notification signing throughput.
+
+Measures, for each supported key type, the cost of producing the signed
+request for a task notification: the previous path (`model_dump`, a
+`json.dumps` to hash the payload, and a second serialization by httpx for
+the request body) against the current one (one `model_dump_json`, whose
+bytes are hashed and sent as is).
+
+    python -m benchmarks.bench_push_signing
+"""
+
+import argparse
+import hashlib
+import json
+import time
+
+import httpx
+import jwt
+
+from benchmarks.utils import summarize, timed
+from common.types import Artifact, Message, Task, TaskState, TaskStatus, TextPart
+from common.utils.push_notification_auth import (
+    SIGNING_ALGORITHMS,
+    PushNotificationSenderAuth,
+)
+
+
+def make_task(history_size: int) -> Task:
+    return Task(
+        id="task",
+        sessionId="session",
+        status=TaskStatus(
+            state=TaskState.COMPLETED,
+            message=Message(role="agent", parts=[TextPart(text="Done")]),
+        ),
+        artifacts=[Artifact(parts=[TextPart(text="The exchange rate is 0.91 EUR.")])],
+        history=[
+            Message(role="user", parts=[TextPart(text=f"Message {i}")])
+            for i in range(history_size)
+        ],
+    )
+
+
+def previous_path(sender: PushNotificationSenderAuth, task: Task) -> httpx.Request:
+    data = task.model_dump(exclude_none=True)
+    body_sha256 = sender._calculate_request_body_sha256(data)
+    token = jwt.encode(
+        {"iat": int(time.time()), "request_body_sha256": body_sha256},
+        key=sender.private_key_jwk,
+        headers={"kid": sender.private_key_jwk.key_id},
+        algorithm=sender.algorithm,
+    )
+    return httpx.Request(
+        "POST", "http://localhost/", json=data, headers={"Authorization": f"Bearer {token}"}
+    )
+
+
+def current_path(sender: PushNotificationSenderAuth, task: Task) -> httpx.Request:
+    body = task.model_dump_json(exclude_none=True).encode()
+    return httpx.Request(
+        "POST", "http://localhost/", content=body, headers=sender.get_auth_headers(body)
+    )
+
+
+def main(history_size: int, repeat: int):
+    task = make_task(history_size)
+    for algorithm in SIGNING_ALGORITHMS:
+        sender = PushNotificationSenderAuth()
+        sender.generate_jwk(algorithm)
+        body = current_path(sender, task).content
+        assert json.loads(body) == json.loads(previous_path(sender, task).content)
+        assert hashlib.sha256(body).hexdigest() in str(
+            jwt.decode(
+                current_path(sender, task).headers["Authorization"].removeprefix("Bearer "),
+                options={"verify_signature": False},
+            )
+        )
+
+        for label, fn in (("dump + json.dumps + json=", previous_path), ("model_dump_json", current_path)):
+            print(summarize(f"{algorithm}: {label}", timed(lambda: fn(sender, task), repeat)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.history_size, args.repeat)
@@ -0,0 +1,118 @@
+"""Push-notification verification throughput on the receiver.
+
+Verifies a batch of signed task notifications with each supported key type,
+comparing the previous path (the handler parses the body, then the verifier
+looks the key up through PyJWKClient, tries every algorithm and reads the
+body again) with the current one (`read_push_notification`: a cached key per
+kid, the key's own algorithm, one hash of the raw bytes and one parse).
+
+    python -m benchmarks.bench_push_verification
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+
+import jwt
+from jwt import PyJWKClient
+
+from benchmarks.bench_push_signing import make_task
+from benchmarks.utils import summarize
+from common.utils.push_notification_auth import (
+    AUTH_HEADER_PREFIX,
+    SIGNING_ALGORITHMS,
+    PushNotificationReceiverAuth,
+    PushNotificationSenderAuth,
+)
+from starlette.requests import Request
+
+
+class LocalJWKClient(PyJWKClient):
+    """PyJWKClient whose JWKS "fetch" returns the sender's keys directly."""
+
+    def __init__(self, public_keys):
+        super().__init__("http://localhost/.well-known/jwks.json")
+        self.public_keys = public_keys
+
+    def fetch_data(self):
+        data = {"keys": self.public_keys}
+        if self.jwk_set_cache is not None:
+            self.jwk_set_cache.put(data)
+        return data
+
+
+def make_request(body: bytes, headers: dict[str, str]) -> Request:
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/notify",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    return Request(scope, receive)
+
+
+async def previous_path(jwks_client: PyJWKClient, request: Request) -> dict:
+    data = await request.json()
+    token = request.headers["Authorization"][len(AUTH_HEADER_PREFIX):]
+    signing_key = jwks_client.get_signing_key_from_jwt(token)
+    decode_token = jwt.decode(
+        token,
+        signing_key,
+        options={"require": ["iat", "request_body_sha256"]},
+        algorithms=list(SIGNING_ALGORITHMS),
+    )
+    body = await request.body()
+    if hashlib.sha256(body).hexdigest() != decode_token["request_body_sha256"]:
+        raise ValueError("Invalid request body")
+    if time.time() - decode_token["iat"] > 60 * 5:
+        raise ValueError("Token is expired")
+    return data
+
+
+async def measure(verify, requests: list[Request]) -> tuple[list[float], float]:
+    latencies = []
+    started = time.perf_counter()
+    for request in requests:
+        start = time.perf_counter()
+        await verify(request)
+        latencies.append(time.perf_counter() - start)
+    return latencies, time.perf_counter() - started
+
+
+async def main(history_size: int, notifications: int):
+    body = make_task(history_size).model_dump_json(exclude_none=True).encode()
+    print(f"payload: {len(body)} bytes")
+    for algorithm in SIGNING_ALGORITHMS:
+        sender = PushNotificationSenderAuth()
+        sender.generate_jwk(algorithm)
+        jwks_client = LocalJWKClient(sender.public_keys)
+        receiver = PushNotificationReceiverAuth()
+        receiver.add_signing_keys(sender.public_keys)
+        headers = sender.get_auth_headers(body)
+
+        def fresh_requests():
+            # Request bodies can only be read once per Request object.
+            return [make_request(body, headers) for _ in range(notifications)]
+
+        assert await previous_path(jwks_client, make_request(body, headers)) == json.loads(body)
+        assert await receiver.read_push_notification(make_request(body, headers)) == json.loads(body)
+
+        for label, verify in (
+            ("PyJWKClient + request.json()", lambda r: previous_path(jwks_client, r)),
+            ("read_push_notification", receiver.read_push_notification),
+        ):
+            latencies, elapsed = await measure(verify, fresh_requests())
+            print(summarize(f"{algorithm}: {label}", latencies, elapsed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history-size", type=int, default=20)
+    parser.add_argument("--notifications", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.history_size, args.notifications))
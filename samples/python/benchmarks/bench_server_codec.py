@@ -0,0 +1,106 @@
+"""Request decoding and response encoding cost in A2AServer.
+
+Compares the previous path (`json.loads` -> `validate_python` on the way in,
+`model_dump` -> stdlib json on the way out) with the current one
+(`validate_json` on the raw body, `model_dump_json` on the way out) for a
+small tasks/get and a tasks/send carrying a 5 MB file.
+
+    python -m benchmarks.bench_server_codec
+"""
+
+import argparse
+import base64
+import json
+import os
+import time
+
+from starlette.responses import JSONResponse
+
+from benchmarks.utils import summarize
+from common.server.server import ModelResponse
+from common.types import (
+    A2ARequest,
+    FileContent,
+    FilePart,
+    GetTaskRequest,
+    Message,
+    SendTaskRequest,
+    SendTaskResponse,
+    Task,
+    TaskQueryParams,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+def make_payloads(file_size: int) -> dict[str, tuple[bytes, SendTaskResponse]]:
+    get_request = GetTaskRequest(id=1, params=TaskQueryParams(id="task", historyLength=1))
+    small_message = Message(role="user", parts=[TextPart(text="What is 1 USD in EUR?")])
+    small_response = SendTaskResponse(
+        id=1,
+        result=Task(
+            id="task", status=TaskStatus(state=TaskState.COMPLETED), history=[small_message]
+        ),
+    )
+
+    file_message = Message(
+        role="user",
+        parts=[
+            TextPart(text="Summarize this document"),
+            FilePart(
+                file=FileContent(
+                    name="doc.pdf",
+                    mimeType="application/pdf",
+                    bytes=base64.b64encode(os.urandom(file_size)).decode(),
+                )
+            ),
+        ],
+    )
+    send_request = SendTaskRequest(id=2, params=TaskSendParams(id="task", message=file_message))
+    file_response = SendTaskResponse(
+        id=2,
+        result=Task(
+            id="task", status=TaskStatus(state=TaskState.COMPLETED), history=[file_message]
+        ),
+    )
+    return {
+        "small": (get_request.model_dump_json().encode(), small_response),
+        f"{file_size / 2**20:.0f}MB file": (send_request.model_dump_json().encode(), file_response),
+    }
+
+
+def dict_path(body: bytes, response: SendTaskResponse) -> bytes:
+    A2ARequest.validate_python(json.loads(body))
+    return JSONResponse(response.model_dump(exclude_none=True)).body
+
+
+def direct_path(body: bytes, response: SendTaskResponse) -> bytes:
+    A2ARequest.validate_json(body)
+    return ModelResponse(response).body
+
+
+def run(fn, body: bytes, response: SendTaskResponse, duration: float) -> list[float]:
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        fn(body, response)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main(file_size: int, duration: float):
+    for name, (body, response) in make_payloads(file_size).items():
+        assert json.loads(dict_path(body, response)) == json.loads(direct_path(body, response))
+        for label, fn in (("dict + stdlib json", dict_path), ("validate_json + model_dump_json", direct_path)):
+            print(summarize(f"{name}: {label}", run(fn, body, response, duration)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--file-size", type=int, default=5 * 2**20)
+    parser.add_argument("--duration", type=float, default=2.0)
+    args = parser.parse_args()
+    main(args.file_size, args.duration)
@@ -0,0 +1,76 @@
+"""Cost of windowing a long task history for tasks/get and tasks/send.
+
+Compares the previous `append_task_history` (a `model_copy` followed by a
+slice that builds a new history list) with the serialization-time window
+(`Task.with_history_window`), both for building the response task and for
+building plus serializing it, across several history lengths.
+
+    python -m benchmarks.bench_task_history
+"""
+
+import argparse
+import json
+
+from benchmarks.utils import summarize, timed
+from common.server.server import ModelResponse
+from common.types import (
+    GetTaskResponse,
+    Message,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+def make_task(history_size: int) -> Task:
+    return Task(
+        id="task",
+        status=TaskStatus(state=TaskState.WORKING),
+        history=[
+            Message(role="agent" if i % 2 else "user", parts=[TextPart(text=f"Message {i}")])
+            for i in range(history_size)
+        ],
+    )
+
+
+def copy_and_slice(task: Task, history_length: int | None) -> Task:
+    new_task = task.model_copy()
+    if history_length is not None and history_length > 0:
+        new_task.history = new_task.history[-history_length:]
+    else:
+        new_task.history = []
+    return new_task
+
+
+def window(task: Task, history_length: int | None) -> Task:
+    return task.with_history_window(history_length)
+
+
+def main(history_size: int, repeat: int):
+    task = make_task(history_size)
+    for history_length in (None, 10, history_size):
+        expected = ModelResponse(GetTaskResponse(id=1, result=copy_and_slice(task, history_length))).body
+        actual = ModelResponse(GetTaskResponse(id=1, result=window(task, history_length))).body
+        assert json.loads(expected) == json.loads(actual)
+
+        for label, fn in (("model_copy + slice", copy_and_slice), ("history window", window)):
+            name = f"history={history_size} window={history_length}: {label}"
+            print(summarize(f"{name}", timed(lambda: fn(task, history_length), repeat)))
+            print(
+                summarize(
+                    f"{name} + encode",
+                    timed(
+                        lambda: ModelResponse(GetTaskResponse(id=1, result=fn(task, history_length))),
+                        repeat,
+                    ),
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20_000)
+    args = parser.parse_args()
+    main(args.history_size, args.repeat)
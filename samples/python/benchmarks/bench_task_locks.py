@@ -0,0 +1,98 @@
+"""Write throughput and tasks/get latency with many concurrently streaming tasks.
+
+Every task streams `--updates` status updates through `update_store` while a
+poller issues tasks/get against random tasks. The SQLite store is used so a
+write actually yields to the event loop while its lock is held; with
+`lock_stripes=1` every writer shares one lock, as the old global lock did.
+
+    python -m benchmarks.bench_task_locks --tasks 1 8 64 512
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.utils import summarize
+from common.server.task_manager import InMemoryTaskManager
+from common.server.task_store import SQLiteTaskStore
+from common.types import (
+    GetTaskRequest,
+    Message,
+    TaskQueryParams,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+class BenchTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        pass
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+async def stream_updates(task_manager: InMemoryTaskManager, task_id: str, updates: int):
+    message = Message(role="agent", parts=[TextPart(text="working")])
+    for _ in range(updates):
+        await task_manager.update_store(
+            task_id, TaskStatus(state=TaskState.WORKING, message=message), None
+        )
+
+
+async def poll(task_manager: InMemoryTaskManager, task_ids: list[str], stop: asyncio.Event):
+    latencies = []
+    while not stop.is_set():
+        request = GetTaskRequest(params=TaskQueryParams(id=random.choice(task_ids)))
+        start = time.perf_counter()
+        await task_manager.on_get_task(request)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0)
+    return latencies
+
+
+async def run(path: str, num_tasks: int, updates: int, lock_stripes: int):
+    store = SQLiteTaskStore(path)
+    task_manager = BenchTaskManager(task_store=store, lock_stripes=lock_stripes)
+    task_ids = [f"task-{num_tasks}-{lock_stripes}-{i}" for i in range(num_tasks)]
+    message = Message(role="user", parts=[TextPart(text="hello")])
+    for task_id in task_ids:
+        await task_manager.upsert_task(TaskSendParams(id=task_id, message=message))
+
+    stop = asyncio.Event()
+    poller = asyncio.create_task(poll(task_manager, task_ids, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(stream_updates(task_manager, t, updates) for t in task_ids))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    latencies = await poller
+    await store.close()
+
+    total = num_tasks * updates
+    print(
+        f"tasks={num_tasks:<5} stripes={lock_stripes:<3} "
+        f"{total / elapsed:>10,.0f} updates/s   "
+        + summarize("tasks/get during streaming", latencies)
+    )
+
+
+async def main(task_counts: list[int], updates: int, stripes: int):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "tasks.db")
+        for num_tasks in task_counts:
+            for lock_stripes in (1, stripes):
+                await run(path, num_tasks, updates, lock_stripes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1, 8, 64, 512])
+    parser.add_argument("--updates", type=int, default=50)
+    parser.add_argument("--stripes", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.updates, args.stripes))
@@ -0,0 +1,98 @@
+"""tasks/get latency with 100k+ stored tasks, in memory and in SQLite.
+
+    python -m benchmarks.bench_task_store --tasks 100000 --lookups 20000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.utils import summarize
+from common.server.task_manager import InMemoryTaskManager
+from common.server.task_store import InMemoryTaskStore, SQLiteTaskStore, TaskStore
+from common.types import (
+    GetTaskRequest,
+    Message,
+    Task,
+    TaskQueryParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+
+class BenchTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        pass
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+def make_task(i: int) -> Task:
+    message = Message(role="agent", parts=[TextPart(text=f"result {i} " * 8)])
+    return Task(
+        id=f"task-{i}",
+        sessionId=f"session-{i % 1000}",
+        status=TaskStatus(state=TaskState.COMPLETED, message=message),
+        history=[message],
+    )
+
+
+async def populate(store: TaskStore, num_tasks: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, num_tasks, concurrency):
+        await asyncio.gather(
+            *(
+                store.save_task(make_task(i))
+                for i in range(offset, min(offset + concurrency, num_tasks))
+            )
+        )
+    return time.perf_counter() - start
+
+
+async def measure_get(store: TaskStore, num_tasks: int, lookups: int) -> list[float]:
+    task_manager = BenchTaskManager(task_store=store)
+    ids = [f"task-{random.randrange(num_tasks)}" for _ in range(lookups)]
+    latencies = []
+    for i, task_id in enumerate(ids):
+        request = GetTaskRequest(id=i, params=TaskQueryParams(id=task_id, historyLength=1))
+        start = time.perf_counter()
+        response = await task_manager.on_get_task(request)
+        latencies.append(time.perf_counter() - start)
+        assert response.result is not None
+    return latencies
+
+
+async def main(num_tasks: int, lookups: int, concurrency: int):
+    store = InMemoryTaskStore()
+    elapsed = await populate(store, num_tasks, concurrency)
+    print(f"in-memory: stored {num_tasks:,} tasks in {elapsed:.2f}s")
+    print(summarize("tasks/get in-memory", await measure_get(store, num_tasks, lookups)))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "tasks.db")
+        store = SQLiteTaskStore(path)
+        elapsed = await populate(store, num_tasks, concurrency)
+        print(
+            f"sqlite: stored {num_tasks:,} tasks in {elapsed:.2f}s "
+            f"({num_tasks / elapsed:,.0f} writes/s, {concurrency} concurrent writers)"
+        )
+        await store.close()
+
+        # A fresh store has an empty working set, so every lookup hits disk.
+        store = SQLiteTaskStore(path)
+        print(summarize("tasks/get sqlite (cold restart)", await measure_get(store, num_tasks, lookups)))
+        await store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.lookups, args.concurrency))
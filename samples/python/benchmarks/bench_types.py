@@ -0,0 +1,161 @@
+"""Events per second per core for the models in common/types.py.
+
+Times, on a single thread, the objects a task manager builds for every
+streamed chunk (Message, TaskStatus, Artifact and the update events, wrapped
+in a SendTaskStreamingResponse) in the ways they could be built:
+
+- validated, dict parts: the regular constructors, with parts given as dicts
+  the way most agents pass them;
+- validated, model parts: the regular constructors, with part models;
+- model_construct: pydantic's unvalidated constructor;
+- unvalidated floor: allocating the model and setting its `__dict__`
+  directly, which is the least any construction path can cost.
+
+The last rows render the responses to JSON, as A2AServer does for every SSE
+event. They put the cost of construction next to the cost of sending.
+
+    python -m benchmarks.bench_types
+"""
+
+import argparse
+import functools
+import time
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+from benchmarks.utils import summarize, timed
+from common.types import (
+    Artifact,
+    FileContent,
+    FilePart,
+    Message,
+    SendTaskStreamingResponse,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+FILE_BYTES = "aGVsbG8gd29ybGQ=" * 64
+
+
+@functools.cache
+def defaults(cls: type[BaseModel]) -> dict[str, Any]:
+    return {
+        name: field.default
+        for name, field in cls.model_fields.items()
+        if not field.is_required() and field.default_factory is None
+    }
+
+
+def floor(cls: type[BaseModel], **values: Any) -> Any:
+    model = cls.__new__(cls)
+    object.__setattr__(model, "__dict__", {**defaults(cls), **values})
+    object.__setattr__(model, "__pydantic_fields_set__", set(values))
+    object.__setattr__(model, "__pydantic_extra__", None)
+    object.__setattr__(model, "__pydantic_private__", None)
+    return model
+
+
+def builders(texts: list[str]) -> dict[str, dict[str, Callable[[], object]]]:
+    text_dicts = lambda: [{"type": "text", "text": t} for t in texts]  # noqa: E731
+    text_parts = lambda: [TextPart(text=t) for t in texts]  # noqa: E731
+    file_part = FilePart(file=FileContent(name="out.txt", bytes=FILE_BYTES))
+    message = Message(role="agent", parts=text_parts())
+    status = TaskStatus(state=TaskState.WORKING, message=message)
+    artifact = Artifact(parts=[*text_parts(), file_part], index=0, append=False)
+    status_event = TaskStatusUpdateEvent(id="task", status=status)
+
+    def construct(cls, **values):
+        return lambda: cls.model_construct(**values)
+
+    def unvalidated(cls, **values):
+        return lambda: floor(cls, **values)
+
+    return {
+        "Message": {
+            "validated, dict parts": lambda: Message(role="agent", parts=text_dicts()),
+            "validated, model parts": lambda: Message(role="agent", parts=message.parts),
+            "model_construct": construct(Message, role="agent", parts=message.parts),
+            "unvalidated floor": unvalidated(Message, role="agent", parts=message.parts),
+        },
+        "TaskStatus": {
+            "validated": lambda: TaskStatus(state=TaskState.WORKING, message=message),
+            "model_construct": construct(TaskStatus, state=TaskState.WORKING, message=message),
+            "unvalidated floor": unvalidated(
+                TaskStatus, state=TaskState.WORKING, message=message, timestamp=status.timestamp
+            ),
+        },
+        "Artifact": {
+            "validated, dict parts": lambda: Artifact(
+                parts=[*text_dicts(), {"type": "file", "file": {"bytes": FILE_BYTES}}],
+                index=0,
+                append=False,
+            ),
+            "validated, model parts": lambda: Artifact(
+                parts=artifact.parts, index=0, append=False
+            ),
+            "model_construct": construct(Artifact, parts=artifact.parts, index=0, append=False),
+            "unvalidated floor": unvalidated(
+                Artifact, parts=artifact.parts, index=0, append=False
+            ),
+        },
+        "status update response": {
+            "validated": lambda: SendTaskStreamingResponse(
+                id=1, result=TaskStatusUpdateEvent(id="task", status=status), event_id=7
+            ),
+            "model_construct": lambda: SendTaskStreamingResponse.model_construct(
+                id=1,
+                result=TaskStatusUpdateEvent.model_construct(id="task", status=status),
+                event_id=7,
+            ),
+            "unvalidated floor": lambda: floor(
+                SendTaskStreamingResponse,
+                id=1,
+                result=floor(TaskStatusUpdateEvent, id="task", status=status),
+                event_id=7,
+            ),
+        },
+        "artifact update response": {
+            "validated": lambda: SendTaskStreamingResponse(
+                id=1, result=TaskArtifactUpdateEvent(id="task", artifact=artifact), event_id=7
+            ),
+            "model_construct": lambda: SendTaskStreamingResponse.model_construct(
+                id=1,
+                result=TaskArtifactUpdateEvent.model_construct(id="task", artifact=artifact),
+                event_id=7,
+            ),
+            "unvalidated floor": lambda: floor(
+                SendTaskStreamingResponse,
+                id=1,
+                result=floor(TaskArtifactUpdateEvent, id="task", artifact=artifact),
+                event_id=7,
+            ),
+        },
+        "render as SSE data": {
+            "status update response": lambda: SendTaskStreamingResponse(
+                id=1, result=status_event
+            ).model_dump_json(exclude_none=True),
+        },
+    }
+
+
+def main(parts: int, repeat: int):
+    texts = [f"chunk {i} of the agent's answer" for i in range(parts)]
+    print(f"{parts} text part(s) per message, {repeat} objects per row, one core")
+    for model, ways in builders(texts).items():
+        for way, fn in ways.items():
+            fn()
+            start = time.perf_counter()
+            latencies = timed(fn, repeat)
+            print(summarize(f"{model}: {way}", latencies, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parts", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=50_000)
+    args = parser.parse_args()
+    main(args.parts, args.repeat)
@@ -0,0 +1,113 @@
+"""Encode/decode throughput and payload size of the A2A wire formats.
+
+Compares JSON (`model_dump_json` / `model_validate_json`, as A2AServer
+does) with MessagePack and CBOR (`WireFormat.dump` / `decode` followed by
+`model_validate`) for a Task with history and an artifact, a streamed
+artifact update carrying a file, and an AgentCard.
+
+    python -m benchmarks.bench_wire_format
+"""
+
+import argparse
+import os
+
+from benchmarks.bench_push_signing import make_task
+from benchmarks.utils import summarize, timed
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+    Artifact,
+    FileContent,
+    FilePart,
+    SendTaskStreamingResponse,
+    TaskArtifactUpdateEvent,
+    TextPart,
+)
+from common.utils.wire_format import get_wire_format
+import base64
+
+
+def make_artifact_event(file_size: int) -> SendTaskStreamingResponse:
+    return SendTaskStreamingResponse(
+        id="request",
+        result=TaskArtifactUpdateEvent(
+            id="task",
+            artifact=Artifact(
+                name="chart",
+                parts=[
+                    TextPart(text="Generated chart"),
+                    FilePart(
+                        file=FileContent(
+                            name="chart.png",
+                            mimeType="image/png",
+                            bytes=base64.b64encode(os.urandom(file_size)).decode(),
+                        )
+                    ),
+                ],
+                index=0,
+            ),
+        ),
+    )
+
+
+def make_agent_card() -> AgentCard:
+    return AgentCard(
+        name="Currency Agent",
+        description="Helps with exchange rates for currencies",
+        url="http://localhost:10000/",
+        version="1.0.0",
+        capabilities=AgentCapabilities(streaming=True, pushNotifications=True),
+        defaultInputModes=["text", "text/plain"],
+        defaultOutputModes=["text", "text/plain"],
+        skills=[
+            AgentSkill(
+                id=f"skill_{i}",
+                name="Currency Exchange Rates Tool",
+                description="Helps with exchange values between various currencies",
+                tags=["currency conversion", "currency exchange"],
+                examples=["What is exchange rate between USD and GBP?"],
+            )
+            for i in range(5)
+        ],
+    )
+
+
+def main(history_size: int, file_size: int, repeat: int):
+    formats = {name: get_wire_format(name) for name in ("msgpack", "cbor")}
+    models = {
+        "Task": make_task(history_size),
+        "SendTaskStreamingResponse": make_artifact_event(file_size),
+        "AgentCard": make_agent_card(),
+    }
+    for label, model in models.items():
+        model_type = type(model)
+        body = model.model_dump_json(exclude_none=True).encode()
+        print(f"{label}: json {len(body):,} bytes", end="")
+        for name, wire_format in formats.items():
+            print(f", {name} {len(wire_format.dump(model, exclude_none=True)):,} bytes", end="")
+        print()
+
+        print(summarize(f"  encode json", timed(lambda: model.model_dump_json(exclude_none=True), repeat)))
+        for name, wire_format in formats.items():
+            print(summarize(f"  encode {name}", timed(lambda: wire_format.dump(model, exclude_none=True), repeat)))
+
+        print(summarize(f"  decode json", timed(lambda: model_type.model_validate_json(body), repeat)))
+        for name, wire_format in formats.items():
+            encoded = wire_format.dump(model, exclude_none=True)
+            assert model_type.model_validate(wire_format.decode(encoded)) == model
+            print(
+                summarize(
+                    f"  decode {name}",
+                    timed(lambda: model_type.model_validate(wire_format.decode(encoded)), repeat),
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history-size", type=int, default=20)
+    parser.add_argument("--file-size", type=int, default=64 * 1024)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.history_size, args.file_size, args.repeat)
@@ -0,0 +1,35 @@
+"""Small helpers shared by the benchmark scripts."""
+
+import statistics
+import time
+from typing import Callable
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(name: str, latencies: list[float], elapsed: float | None = None) -> str:
+    """Formats a one-line summary of per-operation latencies (in seconds)."""
+    if elapsed is None:
+        elapsed = sum(latencies)
+    rate = len(latencies) / elapsed if elapsed else float("inf")
+    return (
+        f"{name:<48} n={len(latencies):<8} {rate:>12,.0f} ops/s"
+        f"  p50={percentile(latencies, 50) * 1e6:>9.1f}us"
+        f"  p99={percentile(latencies, 99) * 1e6:>9.1f}us"
+        f"  mean={statistics.fmean(latencies) * 1e6 if latencies else 0:>9.1f}us"
+    )
+
+
+def timed(fn: Callable[[], object], repeat: int) -> list[float]:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return latencies
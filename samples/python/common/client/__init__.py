@@ -1,4 +1,17 @@
-from .client import A2AClient
-from .card_resolver import A2ACardResolver
+from .client import A2AClient, TaskEventStream, TaskResult, gather_tasks
+from .artifact_assembler import ArtifactAssembler
+from .card_resolver import A2ACardResolver, get_agent_cards
+from .resilience import CircuitBreaker, CircuitState, ResiliencePolicy
 
-__all__ = ["A2AClient", "A2ACardResolver"]
+__all__ = [
+    "A2AClient",
+    "A2ACardResolver",
+    "ArtifactAssembler",
+    "CircuitBreaker",
+    "CircuitState",
+    "ResiliencePolicy",
+    "TaskEventStream",
+    "TaskResult",
+    "gather_tasks",
+    "get_agent_cards",
+]
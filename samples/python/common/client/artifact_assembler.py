@@ -0,0 +1,261 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, BinaryIO
+from common.types import (
+    Artifact,
+    FileContent,
+    FilePart,
+    Part,
+    SendTaskStreamingResponse,
+    TaskArtifactUpdateEvent,
+    TextPart,
+)
+import base64
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPILL_THRESHOLD = 8 * 2**20
+DEFAULT_PARTIAL_TIMEOUT = 300
+
+
+@dataclass
+class _Segment:
+    """A part of an artifact being assembled, which later chunks may continue."""
+
+    part: Part
+    pieces: list[str] = field(default_factory=list)
+    spill: BinaryIO | None = None
+
+    @property
+    def joinable(self) -> bool:
+        return isinstance(self.part, TextPart) or self.spillable
+
+    @property
+    def spillable(self) -> bool:
+        return isinstance(self.part, FilePart) and self.part.file.bytes is not None
+
+    def continued_by(self, part: Part) -> bool:
+        if isinstance(self.part, TextPart):
+            return isinstance(part, TextPart)
+        return (
+            self.spillable
+            and isinstance(part, FilePart)
+            and part.file.bytes is not None
+            and part.file.name == self.part.file.name
+            and part.file.mimeType == self.part.file.mimeType
+        )
+
+    def add(self, part: Part) -> int:
+        piece = part.text if isinstance(part, TextPart) else part.file.bytes
+        if self.spill is not None:
+            self.spill.write(base64.b64decode(piece))
+        else:
+            self.pieces.append(piece)
+        return len(piece)
+
+    def spill_to(self, directory: str | None) -> None:
+        self.spill = tempfile.NamedTemporaryFile(
+            dir=directory, prefix="a2a-artifact-", delete=False
+        )
+        for piece in self.pieces:
+            self.spill.write(base64.b64decode(piece))
+        self.pieces = []
+
+    def finish(self) -> Part:
+        if isinstance(self.part, TextPart):
+            return self.part.model_copy(update={"text": "".join(self.pieces)})
+        if self.spill is not None:
+            self.spill.close()
+            file = FileContent(
+                name=self.part.file.name,
+                mimeType=self.part.file.mimeType,
+                uri=Path(self.spill.name).as_uri(),
+            )
+        elif any(piece.endswith("=") for piece in self.pieces[:-1]):
+            # Padded pieces do not concatenate as base64.
+            data = b"".join(base64.b64decode(piece) for piece in self.pieces)
+            file = self.part.file.model_copy(update={"bytes": base64.b64encode(data).decode()})
+        else:
+            file = self.part.file.model_copy(update={"bytes": "".join(self.pieces)})
+        return self.part.model_copy(update={"file": file})
+
+    def discard(self) -> None:
+        if self.spill is not None:
+            self.spill.close()
+            os.remove(self.spill.name)
+
+
+@dataclass
+class _PartialArtifact:
+    first: Artifact
+    segments: list[_Segment] = field(default_factory=list)
+    size: int = 0
+    spilled: bool = False
+    updated_at: float = 0.0
+
+
+class ArtifactAssembler:
+    """Reassembles artifacts that agents stream in chunks.
+
+    An artifact update with `append` unset and `lastChunk=False` starts an
+    artifact; updates with the same task and index and `append=True` add to
+    it, and the one with `lastChunk=True` completes it. A text part that
+    continues the previous chunk's last text part is joined to it, and so is
+    a file part with the same name and type, so a text or file split across
+    chunks comes out as one part. Artifacts sent in a single update are
+    passed through.
+
+    Pieces are kept as they arrive and joined once, on completion. When an
+    artifact's content goes over `spill_threshold` bytes (None keeps
+    everything in memory), its file parts are written to temporary files in
+    `spill_directory` instead, and the completed artifact refers to them by
+    a file:// `uri`; deleting those files is up to the caller. Text stays in
+    memory.
+
+    Artifacts that receive no chunk for `timeout` seconds are discarded when
+    the next update arrives, or by `expire()`; so are append chunks whose
+    artifact was never started, or has expired.
+    """
+
+    def __init__(
+        self,
+        spill_threshold: int | None = DEFAULT_SPILL_THRESHOLD,
+        timeout: float = DEFAULT_PARTIAL_TIMEOUT,
+        spill_directory: str | None = None,
+    ):
+        self.spill_threshold = spill_threshold
+        self.timeout = timeout
+        self.spill_directory = spill_directory
+        self.partials: dict[tuple[str, int], _PartialArtifact] = {}
+        self.completed = 0
+        self.spilled = 0
+        self.expired = 0
+        self.orphaned = 0
+
+    def add(self, task_id: str, artifact: Artifact) -> Artifact | None:
+        """Adds an artifact update; returns the artifact it completes, if any."""
+        self.expire()
+        key = (task_id, artifact.index)
+        if not artifact.append:
+            if artifact.lastChunk is None or artifact.lastChunk:
+                return artifact
+            if key in self.partials:
+                logger.warning(f"Artifact {artifact.index} of task {task_id} restarted")
+                self._discard(key)
+            partial = self.partials[key] = _PartialArtifact(first=artifact)
+        else:
+            partial = self.partials.get(key)
+            if partial is None:
+                logger.warning(
+                    f"Dropping chunk of artifact {artifact.index} of task {task_id}: "
+                    "its first chunk is missing or has expired"
+                )
+                self.orphaned += 1
+                return None
+
+        self._add_parts(partial, artifact.parts)
+        partial.updated_at = time.monotonic()
+        if self.spill_threshold is not None and not partial.spilled and partial.size > self.spill_threshold:
+            self._spill(partial)
+        if artifact.lastChunk:
+            del self.partials[key]
+            self.completed += 1
+            return self._finish(partial, artifact)
+        return None
+
+    def expire(self, now: float | None = None) -> int:
+        """Discards artifacts that have not been added to for `timeout`
+        seconds; returns how many."""
+        now = time.monotonic() if now is None else now
+        stale = [
+            key for key, partial in self.partials.items()
+            if now - partial.updated_at > self.timeout
+        ]
+        for task_id, index in stale:
+            logger.warning(f"Artifact {index} of task {task_id} timed out before its last chunk")
+            self._discard((task_id, index))
+        self.expired += len(stale)
+        return len(stale)
+
+    def discard(self, task_id: str) -> int:
+        """Discards a task's unfinished artifacts; returns how many."""
+        keys = [key for key in self.partials if key[0] == task_id]
+        for key in keys:
+            self._discard(key)
+        return len(keys)
+
+    async def assemble(
+        self, responses: AsyncIterable[SendTaskStreamingResponse]
+    ) -> AsyncIterator[SendTaskStreamingResponse]:
+        """Passes through the responses of `A2AClient.send_task_streaming`,
+        with artifact chunks replaced by one update per completed artifact,
+        yielded as soon as its last chunk arrives. Artifacts the stream left
+        unfinished are discarded when it ends."""
+        task_ids = set()
+        try:
+            async for response in responses:
+                event = response.result
+                if not isinstance(event, TaskArtifactUpdateEvent):
+                    yield response
+                    continue
+                task_ids.add(event.id)
+                artifact = self.add(event.id, event.artifact)
+                if artifact is None:
+                    continue
+                if artifact is not event.artifact:
+                    event = event.model_copy(update={"artifact": artifact})
+                    response = response.model_copy(update={"result": event})
+                yield response
+        finally:
+            for task_id in task_ids:
+                self.discard(task_id)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "partial": len(self.partials),
+            "partial_bytes": sum(p.size for p in self.partials.values()),
+            "completed": self.completed,
+            "spilled": self.spilled,
+            "expired": self.expired,
+            "orphaned": self.orphaned,
+        }
+
+    def _add_parts(self, partial: _PartialArtifact, parts: list[Part]) -> None:
+        for i, part in enumerate(parts):
+            if i == 0 and partial.segments and partial.segments[-1].continued_by(part):
+                segment = partial.segments[-1]
+            else:
+                segment = _Segment(part)
+                partial.segments.append(segment)
+                if partial.spilled and segment.spillable:
+                    segment.spill_to(self.spill_directory)
+            if segment.joinable:
+                partial.size += segment.add(part)
+
+    def _spill(self, partial: _PartialArtifact) -> None:
+        for segment in partial.segments:
+            if segment.spillable:
+                segment.spill_to(self.spill_directory)
+        partial.spilled = True
+        self.spilled += 1
+
+    def _finish(self, partial: _PartialArtifact, last: Artifact) -> Artifact:
+        parts = [
+            segment.finish() if segment.joinable else segment.part
+            for segment in partial.segments
+        ]
+        metadata = partial.first.metadata
+        if last.metadata:
+            metadata = {**(metadata or {}), **last.metadata}
+        return partial.first.model_copy(
+            update={"parts": parts, "metadata": metadata, "append": None, "lastChunk": None}
+        )
+
+    def _discard(self, key: tuple[str, int]) -> None:
+        partial = self.partials.pop(key)
+        for segment in partial.segments:
+            segment.discard()
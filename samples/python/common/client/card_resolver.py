@@ -1,21 +1,294 @@
+from dataclasses import dataclass, replace
 import httpx
 from common.types import (
     AgentCard,
     A2AClientJSONError,
 )
+import asyncio
+import hashlib
 import json
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Lifetime of a card whose response carries no Cache-Control max-age.
+DEFAULT_CARD_TTL = 300
+
+MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)", re.IGNORECASE)
+
+
+def cache_lifetime(cache_control: str | None, default_ttl: float) -> float | None:
+    """Seconds a response may be reused for; None if it must not be stored."""
+    if not cache_control:
+        return default_ttl
+    directives = cache_control.lower()
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+    match = MAX_AGE.search(cache_control)
+    return int(match.group(1)) if match else default_ttl
+
+
+@dataclass
+class CachedAgentCard:
+    card: AgentCard
+    etag: str | None
+    last_modified: str | None
+    # Wall-clock time, so entries loaded from disk keep their expiry.
+    expires_at: float
+    # Set by Cache-Control: no-cache; the card must be revalidated before
+    # each use rather than served stale while it is refreshed.
+    must_revalidate: bool = False
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "card": self.card.model_dump(mode="json", exclude_none=True),
+                "etag": self.etag,
+                "last_modified": self.last_modified,
+                "expires_at": self.expires_at,
+                "must_revalidate": self.must_revalidate,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> "CachedAgentCard":
+        entry = json.loads(data)
+        return cls(
+            card=AgentCard.model_validate(entry["card"]),
+            etag=entry["etag"],
+            last_modified=entry["last_modified"],
+            expires_at=entry["expires_at"],
+            must_revalidate=entry.get("must_revalidate", False),
+        )
+
+
+class AgentCardCache:
+    """Agent cards by URL, kept in memory and optionally in `cache_dir`.
+
+    Entries expire as their response's Cache-Control allows (`default_ttl`
+    when it does not say) and are then revalidated with a conditional GET
+    using their ETag/Last-Modified. Cards persisted to `cache_dir` let a host
+    that restarts with many agents start from the stored cards right away.
+    """
+
+    def __init__(self, default_ttl: float = DEFAULT_CARD_TTL, cache_dir: str | None = None):
+        self.default_ttl = default_ttl
+        self.cache_dir = cache_dir
+        self.entries: dict[str, CachedAgentCard] = {}
+        self.refreshing: dict[str, asyncio.Task] = {}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def get(self, url: str) -> CachedAgentCard | None:
+        entry = self.entries.get(url)
+        if entry is not None or not self.cache_dir:
+            return entry
+        try:
+            with open(self._path(url)) as f:
+                entry = CachedAgentCard.from_json(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached agent card for {url}: {e}")
+            return None
+        return self.entries.setdefault(url, entry)
+
+    def put(self, url: str, entry: CachedAgentCard) -> None:
+        self.entries[url] = entry
+        if not self.cache_dir:
+            return
+        path = self._path(url)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(entry.to_json())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist agent card for {url}: {e}")
+
+    def discard(self, url: str) -> None:
+        self.entries.pop(url, None)
+        if self.cache_dir:
+            try:
+                os.remove(self._path(url))
+            except FileNotFoundError:
+                pass
+
+
+_default_cache: AgentCardCache | None = None
+
+
+def default_card_cache() -> AgentCardCache:
+    """The process-wide cache; persisted to A2A_AGENT_CARD_CACHE_DIR if set."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AgentCardCache(cache_dir=os.getenv("A2A_AGENT_CARD_CACHE_DIR"))
+    return _default_cache
 
 
 class A2ACardResolver:
-    def __init__(self, base_url, agent_card_path="/.well-known/agent.json"):
+    """Fetches an agent's card through an AgentCardCache.
+
+    A fresh cached card is returned without a request. A stale one is
+    returned as is while it is revalidated in the background when an event
+    loop is running, and revalidated before returning otherwise or when it
+    was served with `no-cache`. A stale card is still returned if it cannot
+    be revalidated.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        agent_card_path="/.well-known/agent.json",
+        cache: AgentCardCache | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.agent_card_path = agent_card_path.lstrip("/")
+        self.cache = cache if cache is not None else default_card_cache()
+        self.http_client = http_client
+
+    @property
+    def url(self) -> str:
+        return self.base_url + "/" + self.agent_card_path
 
     def get_agent_card(self) -> AgentCard:
-        with httpx.Client() as client:
-            response = client.get(self.base_url + "/" + self.agent_card_path)
-            response.raise_for_status()
-            try:
-                return AgentCard(**response.json())
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+        """Blocks on a cache miss; async code should use get_agent_card_async."""
+        entry = self.cache.get(self.url)
+        if entry is not None and self._usable(entry):
+            return entry.card
+
+        try:
+            with httpx.Client() as client:
+                response = client.get(self.url, headers=self._conditional_headers(entry))
+            return self._store(response, entry)
+        except httpx.HTTPError as e:
+            if entry is None:
+                raise
+            logger.warning(f"Could not revalidate agent card {self.url}, using the stale one: {e}")
+            return entry.card
+
+    async def get_agent_card_async(self) -> AgentCard:
+        entry = self.cache.get(self.url)
+        if entry is not None and self._usable(entry):
+            return entry.card
+        try:
+            return await self.refresh()
+        except httpx.HTTPError as e:
+            if entry is None:
+                raise
+            logger.warning(f"Could not revalidate agent card {self.url}, using the stale one: {e}")
+            return entry.card
+
+    async def refresh(self) -> AgentCard:
+        """Revalidates the cached card (or fetches it) regardless of its age."""
+        entry = self.cache.get(self.url)
+        headers = self._conditional_headers(entry)
+        if self.http_client is not None:
+            response = await self.http_client.get(self.url, headers=headers)
+        else:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(self.url, headers=headers)
+        return self._store(response, entry)
+
+    def _usable(self, entry: CachedAgentCard) -> bool:
+        """Whether `entry` may be returned without revalidating it first."""
+        return entry.fresh or (not entry.must_revalidate and self._refresh_in_background())
+
+    def _refresh_in_background(self) -> bool:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if self.url not in self.cache.refreshing:
+            task = loop.create_task(self._background_refresh())
+            self.cache.refreshing[self.url] = task
+        return True
+
+    async def _background_refresh(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Could not refresh agent card {self.url}: {e}")
+        finally:
+            self.cache.refreshing.pop(self.url, None)
+
+    @staticmethod
+    def _conditional_headers(entry: CachedAgentCard | None) -> dict[str, str]:
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def _store(self, response: httpx.Response, entry: CachedAgentCard | None) -> AgentCard:
+        lifetime = cache_lifetime(
+            response.headers.get("Cache-Control"), self.cache.default_ttl
+        )
+        if response.status_code == 304 and entry is not None:
+            if lifetime is not None:
+                self.cache.put(
+                    self.url,
+                    replace(
+                        entry,
+                        etag=response.headers.get("ETag", entry.etag),
+                        expires_at=time.time() + lifetime,
+                        must_revalidate=lifetime == 0,
+                    ),
+                )
+            return entry.card
+
+        response.raise_for_status()
+        try:
+            card = AgentCard(**response.json())
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
+
+        if lifetime is None:
+            self.cache.discard(self.url)
+        else:
+            self.cache.put(
+                self.url,
+                CachedAgentCard(
+                    card=card,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    expires_at=time.time() + lifetime,
+                    must_revalidate=lifetime == 0,
+                ),
+            )
+        return card
+
+
+async def get_agent_cards(
+    base_urls: list[str], cache: AgentCardCache | None = None
+) -> list[AgentCard]:
+    """Resolves the cards of several agents concurrently.
+
+    Agents whose card cannot be fetched are logged and left out, so one
+    agent being down does not fail the others.
+    """
+    results = await asyncio.gather(
+        *(A2ACardResolver(url, cache=cache).get_agent_card_async() for url in base_urls),
+        return_exceptions=True,
+    )
+    cards = []
+    for url, result in zip(base_urls, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Could not resolve the agent card of {url}: {result}")
+        else:
+            cards.append(result)
+    return cards
@@ -1,8 +1,13 @@
+from contextlib import aclosing
+from dataclasses import dataclass
 import httpx
-from httpx_sse import connect_sse
-from typing import Any, AsyncIterable
+from httpx_sse import aconnect_sse
+from typing import Any, AsyncGenerator, AsyncIterator, BinaryIO, Iterable
+from urllib.parse import urljoin
 from common.types import (
     AgentCard,
+    FileContent,
+    FilePart,
     GetTaskRequest,
     SendTaskRequest,
     SendTaskResponse,
@@ -14,57 +19,652 @@ from common.types import (
     SetTaskPushNotificationResponse,
     GetTaskPushNotificationRequest,
     GetTaskPushNotificationResponse,
+    A2AClientCircuitOpenError,
     A2AClientHTTPError,
     A2AClientJSONError,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
+    JSONRPCResponse,
+    TaskResubscriptionRequest,
+    TaskSendParams,
+    TaskIdParams,
+    TaskState,
+    TaskStatusUpdateEvent,
 )
+from common.client.resilience import CircuitState, ResiliencePolicy
+from common.utils.wire_format import (
+    WireFormat,
+    WireFormatDecodeError,
+    get_wire_format,
+    is_stream_content_type,
+    iter_frames,
+    wire_format_for_content_type,
+)
+import asyncio
+import base64
 import json
+import logging
+import mimetypes
+import os
+import time
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+# States after which a task sends no further events.
+FINAL_TASK_STATES = {
+    TaskState.COMPLETED,
+    TaskState.CANCELED,
+    TaskState.FAILED,
+    TaskState.INPUT_REQUIRED,
+}
+
+# A suggested `upload_threshold` for agents known to run an A2AServer with a
+# BlobStore: inline files above 1 MiB are uploaded instead.
+DEFAULT_UPLOAD_THRESHOLD = 1024 * 1024
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# How many trailing history messages a retried tasks/send looks through for
+# the message it sent.
+SENT_MESSAGE_LOOKBACK = 16
+
+# Response model for each non-streaming method, used to type batch results.
+RESPONSE_TYPES: dict[str, type[JSONRPCResponse]] = {
+    SendTaskRequest.model_fields["method"].default: SendTaskResponse,
+    GetTaskRequest.model_fields["method"].default: GetTaskResponse,
+    CancelTaskRequest.model_fields["method"].default: CancelTaskResponse,
+    SetTaskPushNotificationRequest.model_fields["method"].default: SetTaskPushNotificationResponse,
+    GetTaskPushNotificationRequest.model_fields["method"].default: GetTaskPushNotificationResponse,
+}
+
+
+class TaskEventStream:
+    """Async iterator over the events of a streamed task.
+
+    Returned by `A2AClient.send_task_streaming`. `reconnects` counts how often
+    the connection dropped and was resumed, `resyncs` how many of those
+    resumptions had to fall back to tasks/get because the server did not
+    number its events, and `last_event_id` is the SSE id of the last event
+    received.
+    """
+
+    def __init__(self):
+        self.reconnects = 0
+        self.resyncs = 0
+        self.last_event_id: int | None = None
+        self._events: AsyncGenerator[SendTaskStreamingResponse, None] | None = None
+
+    def __aiter__(self) -> "TaskEventStream":
+        return self
+
+    async def __anext__(self) -> SendTaskStreamingResponse:
+        return await self._events.__anext__()
+
+    async def aclose(self) -> None:
+        await self._events.aclose()
 
 
 class A2AClient:
-    def __init__(self, agent_card: AgentCard = None, url: str = None):
+    """JSON-RPC client for an A2A agent.
+
+    Requests share one pooled `httpx.AsyncClient`, so consecutive calls reuse
+    keep-alive connections. The pool is created on first use and released by
+    `close()` or by leaving an `async with A2AClient(...)` block. Pass
+    `http2=True` (requires the `httpx[http2]` extra) to negotiate HTTP/2, or
+    `http_client` to share a client that the caller keeps ownership of.
+    `max_concurrent_requests` caps how many `send_many`/`gather_tasks`
+    requests are in flight to this agent at once. `resilience` opts into
+    retries, hedged tasks/get and a circuit breaker (see ResiliencePolicy).
+    A dropped task stream is resumed up to `max_stream_reconnects` times.
+    With `upload_threshold` set, files sent inline that are larger than that
+    many bytes are uploaded to the agent's blob endpoint and sent by uri.
+    The endpoint is not part of the A2A spec, so this is off by default and
+    should only be enabled for agents known to have it; agents that answer
+    404 or 405 keep receiving files inline.
+    `wire_format="msgpack"` or `"cbor"` sends requests, and asks for
+    responses, in that binary format instead of JSON; agents that answer
+    415 are talked to in JSON from then on.
+    """
+
+    def __init__(
+        self,
+        agent_card: AgentCard = None,
+        url: str = None,
+        http_client: httpx.AsyncClient | None = None,
+        http2: bool = False,
+        limits: httpx.Limits | None = None,
+        timeout: float | None = 30,
+        max_concurrent_requests: int = 16,
+        resilience: ResiliencePolicy | None = None,
+        max_stream_reconnects: int = 3,
+        upload_threshold: int | None = None,
+        wire_format: str | None = None,
+    ):
         if agent_card:
             self.url = agent_card.url
         elif url:
             self.url = url
         else:
             raise ValueError("Must provide either agent_card or url")
+        self.http2 = http2
+        self.limits = limits if limits is not None else httpx.Limits(
+            max_connections=100, max_keepalive_connections=20, keepalive_expiry=30
+        )
+        # Image generation could take time, hence the generous default.
+        self.timeout = timeout
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
+        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self.resilience = resilience
+        self.circuit_breaker = resilience.new_circuit_breaker() if resilience else None
+        self.retried_requests = 0
+        self.hedged_requests = 0
+        self.max_stream_reconnects = max_stream_reconnects
+        self.stream_reconnects = 0
+        self.upload_threshold = upload_threshold
+        self.blob_url = urljoin(self.url, "/blobs")
+        self.blob_uploads_supported = True
+        self.uploaded_files = 0
+        self.wire_format: WireFormat | None = (
+            get_wire_format(wire_format) if wire_format else None
+        )
+
+    @property
+    def circuit_state(self) -> CircuitState:
+        if self.circuit_breaker is None:
+            return CircuitState.CLOSED
+        return self.circuit_breaker.state
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                http2=self.http2, limits=self.limits, timeout=self.timeout
+            )
+            self._owns_http_client = True
+        return self._http_client
+
+    async def close(self) -> None:
+        if self._http_client is not None and self._owns_http_client:
+            await self._http_client.aclose()
+        self._http_client = None
+
+    async def __aenter__(self) -> "A2AClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
 
     async def send_task(self, payload: dict[str, Any]) -> SendTaskResponse:
         request = SendTaskRequest(params=payload)
+        await self._upload_large_files(request)
         return SendTaskResponse(**await self._send_request(request))
 
-    async def send_task_streaming(
-        self, payload: dict[str, Any]
-    ) -> AsyncIterable[SendTaskStreamingResponse]:
-        request = SendTaskStreamingRequest(params=payload)
-        with httpx.Client(timeout=None) as client:
-            with connect_sse(
-                client, "POST", self.url, json=request.model_dump()
-            ) as event_source:
-                try:
-                    for sse in event_source.iter_sse():
-                        yield SendTaskStreamingResponse(**json.loads(sse.data))
-                except json.JSONDecodeError as e:
-                    raise A2AClientJSONError(str(e)) from e
-                except httpx.RequestError as e:
+    def send_many(
+        self,
+        payloads: Iterable[TaskSendParams | dict[str, Any]],
+        max_concurrency: int | None = None,
+    ) -> AsyncIterator["TaskResult"]:
+        """Sends every task concurrently; see `gather_tasks`."""
+        return gather_tasks(
+            ((self, payload) for payload in payloads), max_concurrency=max_concurrency
+        )
+
+    def send_task_streaming(self, payload: dict[str, Any]) -> TaskEventStream:
+        """Streams the task's events over the pooled client.
+
+        If the connection drops before the final event, the stream is resumed
+        with tasks/resubscribe. When the server numbers its events the
+        request carries a Last-Event-ID and the server replays what was
+        missed; otherwise the current task status is fetched with tasks/get
+        and yielded as a status update first. Artifacts produced while
+        disconnected are then only available from `get_task`.
+
+        The response is closed when the stream is closed, e.g. by
+        `contextlib.aclosing` or when the consuming task is cancelled, so a
+        consumer that stops early does not keep the connection busy.
+        """
+        stream = TaskEventStream()
+        stream._events = self._stream_task(SendTaskStreamingRequest(params=payload), stream)
+        return stream
+
+    async def _stream_task(
+        self, request: SendTaskStreamingRequest, stream: TaskEventStream
+    ) -> AsyncGenerator[SendTaskStreamingResponse, None]:
+        await self._upload_large_files(request)
+        task_id = request.params.id
+        current_request: SendTaskStreamingRequest | TaskResubscriptionRequest = request
+        # Until a response arrives the server may never have seen the task,
+        # so there is nothing to resume.
+        received = False
+        while True:
+            try:
+                async with aclosing(
+                    self._stream_events(current_request, stream.last_event_id)
+                ) as events:
+                    async for event_id, response in events:
+                        received = True
+                        if (
+                            response.error is not None
+                            and current_request is not request
+                        ):
+                            # The server cannot resume this stream.
+                            yield await self._resync(task_id, request.id, stream)
+                            return
+                        if event_id is not None:
+                            stream.last_event_id = event_id
+                        yield response
+                        if self._is_final(response):
+                            return
+                return
+            except httpx.TransportError as e:
+                if stream.reconnects >= self.max_stream_reconnects or not (
+                    received or isinstance(e, httpx.ConnectError)
+                ):
+                    # Without a response, only a send that never connected
+                    # is known not to have reached the server, and is retried.
                     raise A2AClientHTTPError(400, str(e)) from e
+                stream.reconnects += 1
+                self.stream_reconnects += 1
+                logger.warning(
+                    f"Stream for task {task_id} dropped ({e!r}); reconnecting"
+                )
+                await asyncio.sleep(min(2.0, 0.1 * 2 ** (stream.reconnects - 1)))
+
+            if not received:
+                continue
+            if stream.last_event_id is None:
+                resync = await self._resync(task_id, request.id, stream)
+                yield resync
+                if self._is_final(resync):
+                    return
+            current_request = TaskResubscriptionRequest(
+                id=request.id, params=TaskIdParams(id=task_id)
+            )
+
+    async def upload_file(
+        self,
+        source: bytes | str | os.PathLike | BinaryIO,
+        mime_type: str | None = None,
+        name: str | None = None,
+    ) -> FileContent:
+        """Uploads a file to the agent's blob endpoint and returns a
+        FileContent that refers to it by uri.
 
-    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
+        `source` is a path, a file opened in binary mode or bytes. Files are
+        streamed in chunks rather than read into memory.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                return await self.upload_file(
+                    f,
+                    mime_type or mimetypes.guess_type(os.fspath(source))[0],
+                    name or os.path.basename(source),
+                )
+
+        content = source if isinstance(source, bytes) else self._read_chunks(source)
+        headers = {"Content-Type": mime_type} if mime_type else {}
+        try:
+            response = await self.http_client.post(
+                self.blob_url, content=content, headers=headers
+            )
+            response.raise_for_status()
+            uri = response.json()["uri"]
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except (json.JSONDecodeError, KeyError) as e:
+            raise A2AClientJSONError(str(e)) from e
+        self.uploaded_files += 1
+        return FileContent(name=name, mimeType=mime_type, uri=uri)
+
+    @staticmethod
+    async def _read_chunks(f: BinaryIO) -> AsyncIterator[bytes]:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+    async def _upload_large_files(
+        self, request: SendTaskRequest | SendTaskStreamingRequest
+    ) -> None:
+        """Uploads the message's large inline files and points the request at
+        a copy of the message that refers to them by uri; the caller's
+        params are left as they were."""
+        if self.upload_threshold is None or not self.blob_uploads_supported:
+            return
+        params = request.params
+        parts = list(params.message.parts)
+        uploaded = False
+        for i, part in enumerate(parts):
+            if not isinstance(part, FilePart) or part.file.bytes is None:
+                continue
+            # Decoded size of the base64 string.
+            if len(part.file.bytes) * 3 // 4 <= self.upload_threshold:
+                continue
             try:
-                # Image generation could take time, adding timeout
-                response = await client.post(
-                    self.url, json=request.model_dump(), timeout=30
+                file = await self.upload_file(
+                    base64.b64decode(part.file.bytes), part.file.mimeType, part.file.name
                 )
-                response.raise_for_status()
-                return response.json()
+            except A2AClientHTTPError as e:
+                if e.status_code not in (404, 405):
+                    raise
+                logger.info(f"{self.blob_url} does not accept uploads; sending files inline")
+                self.blob_uploads_supported = False
+                break
+            parts[i] = part.model_copy(update={"file": file})
+            uploaded = True
+        if uploaded:
+            message = params.message.model_copy(update={"parts": parts})
+            request.params = params.model_copy(update={"message": message})
+
+    async def _stream_events(
+        self,
+        request: SendTaskStreamingRequest | TaskResubscriptionRequest,
+        last_event_id: int | None,
+    ) -> AsyncGenerator[tuple[int | None, SendTaskStreamingResponse], None]:
+        """Streams events, recording the stream's outcome with the circuit
+        breaker: success once an event arrives, failure if it cannot be
+        opened or breaks."""
+        probe = self._check_circuit()
+        received = False
+        try:
+            async with aclosing(self._receive_events(request, last_event_id)) as events:
+                async for event in events:
+                    if not received:
+                        received = True
+                        self._record_outcome(None)
+                    yield event
+        except Exception as e:
+            self._record_outcome(e)
+            raise
+        finally:
+            if probe:
+                # An abandoned probe has no outcome; let another through.
+                self.circuit_breaker.release_probe()
+
+    async def _receive_events(
+        self,
+        request: SendTaskStreamingRequest | TaskResubscriptionRequest,
+        last_event_id: int | None,
+    ) -> AsyncGenerator[tuple[int | None, SendTaskStreamingResponse], None]:
+        headers = {}
+        if isinstance(request, TaskResubscriptionRequest) and last_event_id is not None:
+            headers["Last-Event-ID"] = str(last_event_id)
+        if self.wire_format is not None:
+            async with aclosing(self._stream_frames(request, headers)) as events:
+                async for event in events:
+                    yield event
+            if self.wire_format is not None:
+                return
+        async with aconnect_sse(
+            self.http_client,
+            "POST",
+            self.url,
+            json=request.model_dump(),
+            headers=headers,
+            # Events may be minutes apart; only connecting is time-limited.
+            timeout=httpx.Timeout(self.timeout, read=None),
+        ) as event_source:
+            response = event_source.response
+            try:
+                if not response.headers.get("content-type", "").startswith(
+                    "text/event-stream"
+                ):
+                    # Errors come back as a plain JSON-RPC response.
+                    await response.aread()
+                    response.raise_for_status()
+                    yield None, SendTaskStreamingResponse(**response.json())
+                    return
+
+                async for sse in event_source.aiter_sse():
+                    event_id = int(sse.id) if sse.id.isdigit() else None
+                    yield event_id, SendTaskStreamingResponse(**json.loads(sse.data))
             except httpx.HTTPStatusError as e:
                 raise A2AClientHTTPError(e.response.status_code, str(e)) from e
             except json.JSONDecodeError as e:
                 raise A2AClientJSONError(str(e)) from e
 
+    async def _stream_frames(
+        self,
+        request: SendTaskStreamingRequest | TaskResubscriptionRequest,
+        headers: dict[str, str],
+    ) -> AsyncGenerator[tuple[int | None, SendTaskStreamingResponse], None]:
+        """Streams events in the binary wire format; returns without events
+        (having switched to JSON) if the agent does not support it."""
+        wire_format = self.wire_format
+        async with self.http_client.stream(
+            "POST",
+            self.url,
+            content=wire_format.dump(request),
+            headers={**headers, **self._wire_format_headers(wire_format)},
+            timeout=httpx.Timeout(self.timeout, read=None),
+        ) as response:
+            if self._unsupported_wire_format(response):
+                return
+            try:
+                content_type = response.headers.get("content-type")
+                if not is_stream_content_type(content_type):
+                    # Errors come back as a plain JSON-RPC response.
+                    await response.aread()
+                    response.raise_for_status()
+                    yield None, SendTaskStreamingResponse(**self._decode_response(response))
+                    return
+
+                buffer = bytearray()
+                async for chunk in response.aiter_bytes():
+                    buffer += chunk
+                    for frame in iter_frames(buffer):
+                        event = wire_format.decode(frame)
+                        yield event.get("id"), SendTaskStreamingResponse(**event["data"])
+            except httpx.HTTPStatusError as e:
+                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+            except (json.JSONDecodeError, WireFormatDecodeError) as e:
+                raise A2AClientJSONError(str(e)) from e
+
+    @staticmethod
+    def _wire_format_headers(wire_format: WireFormat) -> dict[str, str]:
+        return {"Content-Type": wire_format.media_type, "Accept": wire_format.media_type}
+
+    def _unsupported_wire_format(self, response: httpx.Response) -> bool:
+        if response.status_code != 415:
+            return False
+        logger.info(f"{self.url} does not accept {self.wire_format.name}; using JSON")
+        self.wire_format = None
+        return True
+
+    @staticmethod
+    def _decode_response(response: httpx.Response) -> Any:
+        wire_format = wire_format_for_content_type(response.headers.get("content-type"))
+        if wire_format is None:
+            return response.json()
+        return wire_format.decode(response.content)
+
+    async def _resync(
+        self, task_id: str, request_id: Any, stream: TaskEventStream
+    ) -> SendTaskStreamingResponse:
+        stream.resyncs += 1
+        try:
+            response = await self.get_task({"id": task_id})
+        except httpx.TransportError as e:
+            raise A2AClientHTTPError(400, str(e)) from e
+        if response.error is not None:
+            return SendTaskStreamingResponse(id=request_id, error=response.error)
+        task = response.result
+        return SendTaskStreamingResponse(
+            id=request_id,
+            result=TaskStatusUpdateEvent(
+                id=task.id,
+                status=task.status,
+                final=task.status.state in FINAL_TASK_STATES,
+                metadata=task.metadata,
+            ),
+        )
+
+    @staticmethod
+    def _is_final(response: SendTaskStreamingResponse) -> bool:
+        return response.error is not None or (
+            isinstance(response.result, TaskStatusUpdateEvent) and response.result.final
+        )
+
+    async def batch(self, requests: list[JSONRPCRequest]) -> list[JSONRPCResponse]:
+        """Sends several requests in one JSON-RPC batch.
+
+        Responses are returned in the order of `requests`, typed after each
+        request's method. Streaming methods cannot be batched.
+        """
+        for request in requests:
+            if isinstance(request, (SendTaskStreamingRequest, TaskResubscriptionRequest)):
+                raise ValueError(f"Streaming method {request.method} cannot be batched")
+
+        body = await self._send_request(requests)
+        if not isinstance(body, list):
+            # The server rejected the batch as a whole.
+            raise A2AClientJSONError(f"Expected a batch response, got {body}")
+
+        responses_by_id = {response.get("id"): response for response in body}
+        results = []
+        for request in requests:
+            response = responses_by_id.get(request.id)
+            if response is None:
+                raise A2AClientJSONError(f"No response for request {request.id}")
+            response_type = RESPONSE_TYPES.get(request.method, JSONRPCResponse)
+            results.append(response_type(**response))
+        return results
+
+    async def _send_request(
+        self, request: JSONRPCRequest | list[JSONRPCRequest]
+    ) -> Any:
+        if self.resilience is None or isinstance(request, list):
+            return await self._post(request)
+
+        if isinstance(request, SendTaskRequest):
+            # Marks a copy of the message, so that a retry can tell whether
+            # the agent already has it; the caller's message may be sent again.
+            params = request.params
+            message = params.message.model_copy(
+                update={"metadata": {"messageId": uuid4().hex, **(params.message.metadata or {})}}
+            )
+            request = request.model_copy(
+                update={"params": params.model_copy(update={"message": message})}
+            )
+
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = self._check_circuit()
+            try:
+                if isinstance(request, GetTaskRequest) and self.resilience.hedge_after is not None:
+                    body = await self._post_hedged(request)
+                else:
+                    body = await self._post(request)
+            except Exception as e:
+                self._record_outcome(e)
+                if not self.resilience.is_retryable(e) or attempt >= self.resilience.max_attempts:
+                    raise
+                if isinstance(request, SendTaskRequest) and not isinstance(e, httpx.ConnectError):
+                    # The agent may have received the message; look for it
+                    # in the task rather than sending it a second time.
+                    body = await self._find_sent_task(request)
+                    if body is not None:
+                        return body
+                self.retried_requests += 1
+                await asyncio.sleep(self.resilience.backoff(attempt))
+                continue
+            finally:
+                if probe:
+                    # A cancelled probe has no outcome; let another through.
+                    self.circuit_breaker.release_probe()
+            self._record_outcome(None)
+            return body
+
+    def _check_circuit(self) -> bool:
+        """Raises if the circuit is open; returns whether this request is
+        the probe of a half-open circuit."""
+        if self.circuit_breaker is None:
+            return False
+        probe = self.circuit_breaker.state == CircuitState.HALF_OPEN
+        if not self.circuit_breaker.allow():
+            raise A2AClientCircuitOpenError(self.url)
+        return probe
+
+    def _record_outcome(self, error: Exception | None) -> None:
+        if self.circuit_breaker is None:
+            return
+        if error is not None and self.resilience.is_failure(error):
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    async def _find_sent_task(self, request: SendTaskRequest) -> dict[str, Any] | None:
+        """Returns the task the message was sent to if the agent has it.
+
+        Task ids are reused across the turns of a conversation, so the task
+        existing is not enough: the message must be in its recent history.
+        """
+        message_id = request.params.message.metadata["messageId"]
+        try:
+            body = await self._post(
+                GetTaskRequest(
+                    params={"id": request.params.id, "historyLength": SENT_MESSAGE_LOOKBACK}
+                )
+            )
+        except Exception:
+            return None
+        task = body.get("result")
+        if task is None:
+            return None
+        if not any(
+            (message.get("metadata") or {}).get("messageId") == message_id
+            for message in task.get("history") or []
+        ):
+            return None
+        return {"jsonrpc": "2.0", "id": request.id, "result": task}
+
+    async def _post_hedged(self, request: GetTaskRequest) -> Any:
+        attempts = [asyncio.ensure_future(self._post(request))]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=self.resilience.hedge_after)
+            if not done:
+                self.hedged_requests += 1
+                attempts.append(asyncio.ensure_future(self._post(request)))
+            pending = set(attempts)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+                if not pending:
+                    raise attempt.exception()
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def _post(self, request: JSONRPCRequest | list[JSONRPCRequest]) -> Any:
+        try:
+            response = None
+            wire_format = self.wire_format
+            if wire_format is not None:
+                response = await self.http_client.post(
+                    self.url,
+                    content=wire_format.dump(request),
+                    headers=self._wire_format_headers(wire_format),
+                )
+                if self._unsupported_wire_format(response):
+                    response = None
+            if response is None:
+                if isinstance(request, list):
+                    payload = [r.model_dump() for r in request]
+                else:
+                    payload = request.model_dump()
+                response = await self.http_client.post(self.url, json=payload)
+            response.raise_for_status()
+            return self._decode_response(response)
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except (json.JSONDecodeError, WireFormatDecodeError) as e:
+            raise A2AClientJSONError(str(e)) from e
+
     async def get_task(self, payload: dict[str, Any]) -> GetTaskResponse:
         request = GetTaskRequest(params=payload)
         return GetTaskResponse(**await self._send_request(request))
@@ -84,3 +684,87 @@ class A2AClient:
     ) -> GetTaskPushNotificationResponse:
         request = GetTaskPushNotificationRequest(params=payload)
         return GetTaskPushNotificationResponse(**await self._send_request(request))
+
+
+@dataclass
+class TaskResult:
+    """Outcome of one request sent by `gather_tasks`."""
+
+    index: int
+    client: A2AClient
+    params: TaskSendParams | dict[str, Any]
+    response: SendTaskResponse | None
+    error: Exception | None
+    # Seconds spent waiting for a concurrency slot, then on the request.
+    queued: float
+    latency: float
+
+
+async def gather_tasks(
+    requests: Iterable[tuple[A2AClient, TaskSendParams | dict[str, Any]]],
+    max_concurrency: int | None = 64,
+) -> AsyncIterator[TaskResult]:
+    """Sends tasks to one or more agents concurrently and yields each result
+    as soon as it arrives.
+
+    At most `max_concurrency` requests are in flight overall (None for no
+    limit) and at most `max_concurrent_requests` per A2AClient. A failing
+    request yields a TaskResult with `error` set instead of stopping the
+    others; `index` is the request's position in `requests`. Requests still
+    pending when the caller stops iterating are cancelled.
+    """
+    global_semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def acquire_slots(client: A2AClient) -> None:
+        # Takes a slot of the agent's and one of the global limit together,
+        # never holding one while waiting for the other, so that a slot is
+        # not kept idle from requests that could use it.
+        if global_semaphore is None:
+            await client.semaphore.acquire()
+            return
+        while True:
+            await client.semaphore.acquire()
+            if not global_semaphore.locked():
+                await global_semaphore.acquire()
+                return
+            client.semaphore.release()
+            await global_semaphore.acquire()
+            if not client.semaphore.locked():
+                await client.semaphore.acquire()
+                return
+            global_semaphore.release()
+
+    async def send(index: int, client: A2AClient, params) -> TaskResult:
+        enqueued_at = time.perf_counter()
+        await acquire_slots(client)
+        try:
+            started_at = time.perf_counter()
+            response, error = None, None
+            try:
+                response = await client.send_task(params)
+            except Exception as e:
+                error = e
+            return TaskResult(
+                index=index,
+                client=client,
+                params=params,
+                response=response,
+                error=error,
+                queued=started_at - enqueued_at,
+                latency=time.perf_counter() - started_at,
+            )
+        finally:
+            client.semaphore.release()
+            if global_semaphore is not None:
+                global_semaphore.release()
+
+    pending = [
+        asyncio.create_task(send(index, client, params))
+        for index, (client, params) in enumerate(requests)
+    ]
+    try:
+        for next_result in asyncio.as_completed(pending):
+            yield await next_result
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from enum import Enum
+from common.types import A2AClientHTTPError
+import httpx
+import random
+import time
+
+
+class CircuitState(str, Enum):
+    # Requests flow normally.
+    CLOSED = "closed"
+    # The agent is failing; requests fail fast without being sent.
+    OPEN = "open"
+    # The reset timeout has passed; one probe request is let through.
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-agent circuit breaker.
+
+    Opens after `failure_threshold` consecutive failures. Once open, requests
+    are refused until `reset_timeout` seconds have passed, after which a
+    single probe is allowed: its success closes the circuit, its failure
+    opens it again. A probe abandoned without an outcome (e.g. cancelled)
+    must be given back with `release_probe` so that another can be sent.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self.opened_at is None:
+            return CircuitState.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        self.probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+@dataclass
+class ResiliencePolicy:
+    """Opt-in retry, hedging and circuit-breaking settings for A2AClient.
+
+    Transport errors (including timeouts) and `retry_statuses` responses are
+    retried up to `max_attempts` times with exponential backoff. A tasks/send
+    whose outcome is unknown is only re-sent after a tasks/get shows the agent
+    never received it. With `hedge_after` set, a tasks/get that has not
+    answered within that many seconds is sent a second time and the first
+    answer wins. `failure_threshold=None` disables the circuit breaker.
+    """
+
+    max_attempts: int = 3
+    initial_backoff: float = 0.2
+    max_backoff: float = 5.0
+    retry_statuses: frozenset[int] = frozenset({429, 502, 503, 504})
+    hedge_after: float | None = None
+    failure_threshold: int | None = 5
+    reset_timeout: float = 30.0
+
+    def new_circuit_breaker(self) -> CircuitBreaker | None:
+        if self.failure_threshold is None:
+            return None
+        return CircuitBreaker(self.failure_threshold, self.reset_timeout)
+
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, httpx.TransportError):
+            return True
+        return isinstance(error, A2AClientHTTPError) and error.status_code in self.retry_statuses
+
+    def is_failure(self, error: Exception) -> bool:
+        """Whether `error` says the agent is unhealthy, as opposed to the
+        agent rejecting this particular request."""
+        if isinstance(error, httpx.TransportError):
+            return True
+        return isinstance(error, A2AClientHTTPError) and (
+            error.status_code >= 500 or error.status_code in self.retry_statuses
+        )
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.initial_backoff * 2 ** (attempt - 1))
+        return random.uniform(delay / 2, delay)
@@ -1,4 +1,6 @@
 from .server import A2AServer
+from .artifact_streamer import ArtifactStreamer
+from .blob_store import BlobStore
 from .task_manager import TaskManager, InMemoryTaskManager
 
-__all__ = ["A2AServer", "TaskManager", "InMemoryTaskManager"]
+__all__ = ["A2AServer", "ArtifactStreamer", "BlobStore", "TaskManager", "InMemoryTaskManager"]
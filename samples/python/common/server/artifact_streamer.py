@@ -0,0 +1,236 @@
+from typing import TYPE_CHECKING, Any, AsyncIterable, BinaryIO, Iterator
+from common.types import (
+    Artifact,
+    FileContent,
+    FilePart,
+    Part,
+    TaskArtifactUpdateEvent,
+    TextPart,
+)
+import base64
+import io
+
+if TYPE_CHECKING:
+    from common.server.task_manager import InMemoryTaskManager
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def merge_artifact_chunk(artifacts: list[Artifact], chunk: Artifact) -> None:
+    """Adds an artifact update to a task's stored artifacts.
+
+    A chunk with `append` set adds its parts to the latest stored artifact
+    with the same index; any other chunk is stored as a new artifact, as
+    before. While an artifact is streamed its parts are kept one per chunk,
+    so storing a chunk never copies what came before it; when the appended
+    chunk with `lastChunk` arrives, adjacent text parts, and adjacent inline
+    file parts of the same file, are joined into one (see `join_parts`).
+    Stored artifacts own their parts list, so the chunk itself, which may
+    still be queued for SSE subscribers, is never changed.
+    """
+    if chunk.append:
+        for stored in reversed(artifacts):
+            if stored.index == chunk.index:
+                stored.parts.extend(chunk.parts)
+                stored.lastChunk = chunk.lastChunk
+                if chunk.metadata:
+                    stored.metadata = {**(stored.metadata or {}), **chunk.metadata}
+                if chunk.lastChunk:
+                    stored.parts = join_parts(stored.parts)
+                return
+    artifacts.append(chunk.model_copy(update={"parts": list(chunk.parts)}))
+
+
+def join_parts(parts: list[Part]) -> list[Part]:
+    """Joins the pieces of a streamed artifact: runs of text parts into one
+    text part, and runs of file parts with inline bytes and the same name
+    and mime type into one file part. Other parts are kept as they are."""
+    joined: list[Part] = []
+    run: list[Part] = []
+
+    def flush():
+        if len(run) == 1:
+            joined.append(run[0])
+        elif run and isinstance(run[0], TextPart):
+            joined.append(run[0].model_copy(update={"text": "".join(p.text for p in run)}))
+        elif run:
+            # Decoded and encoded again, as a piece's base64 may be padded.
+            data = b"".join(base64.b64decode(p.file.bytes) for p in run)
+            file = run[0].file.model_copy(update={"bytes": base64.b64encode(data).decode()})
+            joined.append(run[0].model_copy(update={"file": file}))
+        run.clear()
+
+    for part in parts:
+        if not (run and _continues(run[-1], part)):
+            flush()
+        run.append(part)
+    flush()
+    return joined
+
+
+def _continues(previous: Part, part: Part) -> bool:
+    if isinstance(previous, TextPart) and isinstance(part, TextPart):
+        return True
+    return (
+        isinstance(previous, FilePart)
+        and isinstance(part, FilePart)
+        and previous.file.bytes is not None
+        and part.file.bytes is not None
+        and (previous.file.name, previous.file.mimeType) == (part.file.name, part.file.mimeType)
+    )
+
+
+class ArtifactStreamer:
+    """Streams a task's large artifacts to its subscribers in size-bounded
+    chunks, as they are produced, rather than as one event at the end.
+
+    Every artifact gets its own index, starting after those the task already
+    has. Its first chunk has `append` unset and the following ones have
+    `append=True`; the last one has `lastChunk=True`. Each chunk is stored
+    with `update_store`, which adds its part to the artifact stored so far
+    and joins the parts into one with the last chunk, and sent to SSE
+    subscribers as a TaskArtifactUpdateEvent.
+
+    Each chunk carries one part. Text is split into parts of at most
+    `chunk_size` characters, which concatenate into the whole text. A file
+    is split into parts of the same name holding at most `chunk_size` bytes
+    each, rounded down to a multiple of 3, so that their base64 content also
+    concatenates into the base64 of the whole file.
+    """
+
+    def __init__(
+        self,
+        task_manager: "InMemoryTaskManager",
+        task_id: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        if chunk_size < 3:
+            raise ValueError("chunk_size must be at least 3")
+        self.task_manager = task_manager
+        self.task_id = task_id
+        self.chunk_size = chunk_size
+        self.next_index: int | None = None
+        self.chunks_sent = 0
+
+    async def claim_index(self) -> int:
+        if self.next_index is None:
+            task = await self.task_manager.task_store.get_task(self.task_id)
+            if task is None:
+                raise ValueError(f"Task {self.task_id} not found")
+            self.next_index = max((a.index + 1 for a in task.artifacts or []), default=0)
+        index = self.next_index
+        self.next_index += 1
+        return index
+
+    async def send_text(
+        self,
+        text: str | AsyncIterable[str],
+        name: str | None = None,
+        description: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> int:
+        """Streams text, whole or as it is generated; returns the artifact's
+        index. Text generated piecemeal is sent piece by piece (split when a
+        piece is too large) and closed with a last chunk without parts."""
+        index = await self.claim_index()
+        header = {"name": name, "description": description, "metadata": metadata}
+        if isinstance(text, str):
+            for chunk in self.text_chunks(text, index, **header):
+                await self._send(chunk)
+            return index
+
+        first = True
+        async for piece in text:
+            for start in range(0, len(piece), self.chunk_size):
+                await self._send(
+                    self._chunk([TextPart(text=piece[start:start + self.chunk_size])],
+                                index, first, False, header)
+                )
+                first = False
+        await self._send(self._chunk([], index, first, True, header))
+        return index
+
+    async def send_file(
+        self,
+        data: bytes | BinaryIO,
+        name: str | None = None,
+        mime_type: str | None = None,
+        description: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> int:
+        """Streams a file's content, read from `data` one chunk at a time when
+        it is a binary file object; returns the artifact's index."""
+        index = await self.claim_index()
+        for chunk in self.file_chunks(
+            data, index, name=name, mime_type=mime_type, description=description, metadata=metadata
+        ):
+            await self._send(chunk)
+        return index
+
+    def text_chunks(
+        self,
+        text: str,
+        index: int,
+        name: str | None = None,
+        description: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Iterator[Artifact]:
+        header = {"name": name, "description": description, "metadata": metadata}
+        starts = range(0, max(len(text), 1), self.chunk_size)
+        for start in starts:
+            yield self._chunk(
+                [TextPart(text=text[start:start + self.chunk_size])],
+                index,
+                start == 0,
+                start == starts[-1],
+                header,
+            )
+
+    def file_chunks(
+        self,
+        data: bytes | BinaryIO,
+        index: int,
+        name: str | None = None,
+        mime_type: str | None = None,
+        description: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Iterator[Artifact]:
+        header = {"name": name, "description": description, "metadata": metadata}
+        size = self.chunk_size - self.chunk_size % 3
+        source = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+        block = source.read(size)
+        first = True
+        while True:
+            # Read ahead to know whether this block is the last one.
+            following = source.read(size) if len(block) == size else b""
+            file = FileContent(
+                name=name, mimeType=mime_type, bytes=base64.b64encode(block).decode()
+            )
+            yield self._chunk([FilePart(file=file)], index, first, not following, header)
+            if not following:
+                return
+            block, first = following, False
+
+    def _chunk(
+        self,
+        parts: list[Part],
+        index: int,
+        first: bool,
+        last: bool,
+        header: dict[str, Any],
+    ) -> Artifact:
+        # Name, description and metadata travel with the first chunk only.
+        return Artifact(
+            parts=parts,
+            index=index,
+            append=None if first else True,
+            lastChunk=last,
+            **(header if first else {}),
+        )
+
+    async def _send(self, chunk: Artifact) -> None:
+        await self.task_manager.update_store(self.task_id, None, [chunk])
+        await self.task_manager.enqueue_events_for_sse(
+            self.task_id, TaskArtifactUpdateEvent(id=self.task_id, artifact=chunk)
+        )
+        self.chunks_sent += 1
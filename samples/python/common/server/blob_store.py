@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from typing import AsyncIterable, BinaryIO
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+
+BLOB_ID = re.compile(r"[0-9a-f]{32}")
+
+
+class BlobTooLargeError(ValueError):
+    pass
+
+
+class BlobStoreFullError(RuntimeError):
+    pass
+
+
+@dataclass
+class Blob:
+    id: str
+    path: str
+    size: int
+    mime_type: str | None = None
+    created_at: float = 0.0
+
+
+class BlobStore:
+    """Binary files uploaded out of band, so that FileParts can carry a `uri`
+    instead of base64 `bytes` inside the JSON-RPC request.
+
+    Uploads are written to `directory` (a fresh temporary directory by
+    default) chunk by chunk as they arrive, so a blob is never held in
+    memory. Blobs larger than `max_blob_size` bytes are refused, and so are
+    uploads once the stored blobs add up to `max_total_size` bytes. Blobs
+    are deleted `ttl` seconds after they were uploaded (None keeps them
+    until `close`), when the next upload arrives or `expire` is called.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        max_blob_size: int = 100 * 2**20,
+        max_total_size: int = 2**30,
+        ttl: float | None = 3600,
+    ):
+        self.directory = directory or tempfile.mkdtemp(prefix="a2a-blobs-")
+        self._owns_directory = directory is None
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_blob_size = max_blob_size
+        self.max_total_size = max_total_size
+        self.ttl = ttl
+        # In upload order, so the oldest blobs come first.
+        self.blobs: dict[str, Blob] = {}
+        # Bytes on disk, including uploads still in progress.
+        self.total_size = 0
+        self.expired = 0
+
+    def check_space(self, blob_size: int, added: int | None = None) -> None:
+        """Raises unless a blob may grow to `blob_size` bytes by adding
+        `added` (all of `blob_size` by default) to the store."""
+        if blob_size > self.max_blob_size:
+            raise BlobTooLargeError(
+                f"Blob exceeds the maximum size of {self.max_blob_size} bytes"
+            )
+        if self.total_size + (blob_size if added is None else added) > self.max_total_size:
+            raise BlobStoreFullError(
+                f"Blob store is full ({self.max_total_size} bytes)"
+            )
+
+    async def put(self, chunks: AsyncIterable[bytes], mime_type: str | None = None) -> Blob:
+        self.expire()
+        blob_id = uuid.uuid4().hex
+        path = os.path.join(self.directory, blob_id)
+        size = 0
+        try:
+            with open(path, "wb") as f:
+                async for chunk in chunks:
+                    # Counted before the write, so concurrent uploads cannot
+                    # overshoot the total together.
+                    self.check_space(size + len(chunk), len(chunk))
+                    self.total_size += len(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+        except BaseException:
+            self.total_size -= size
+            os.remove(path)
+            raise
+
+        blob = self.blobs[blob_id] = Blob(blob_id, path, size, mime_type, time.monotonic())
+        return blob
+
+    def get(self, blob_id: str) -> Blob | None:
+        blob = self.blobs.get(blob_id) if BLOB_ID.fullmatch(blob_id) else None
+        if blob is not None and self._is_expired(blob, time.monotonic()):
+            return None
+        return blob
+
+    def expire(self, now: float | None = None) -> int:
+        """Deletes the blobs older than `ttl`; returns how many."""
+        now = time.monotonic() if now is None else now
+        expired = []
+        for blob in self.blobs.values():
+            if not self._is_expired(blob, now):
+                break
+            expired.append(blob.id)
+        for blob_id in expired:
+            self.delete(blob_id)
+        self.expired += len(expired)
+        return len(expired)
+
+    def _is_expired(self, blob: Blob, now: float) -> bool:
+        return self.ttl is not None and now - blob.created_at >= self.ttl
+
+    def open(self, blob_id: str) -> BinaryIO:
+        blob = self.get(blob_id)
+        if blob is None:
+            raise KeyError(blob_id)
+        return open(blob.path, "rb")
+
+    def read_bytes(self, blob_id: str) -> bytes:
+        with self.open(blob_id) as f:
+            return f.read()
+
+    def delete(self, blob_id: str) -> None:
+        blob = self.blobs.pop(blob_id, None)
+        if blob is not None:
+            self.total_size -= blob.size
+            try:
+                os.remove(blob.path)
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        for blob_id in list(self.blobs):
+            self.delete(blob_id)
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
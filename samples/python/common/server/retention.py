@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from common.types import Task, TaskState
+from common.server.task_store import TERMINAL_TASK_STATES
+import os
+import time
+
+# States in which an agent is still working on the task; such tasks are
+# never evicted.
+ACTIVE_TASK_STATES = {TaskState.SUBMITTED, TaskState.WORKING}
+
+
+class TaskRetention:
+    """Decides which tasks an InMemoryTaskManager may forget.
+
+    Tasks are evicted `terminal_task_ttl` seconds after reaching a terminal
+    state, and once more than `max_tasks` are tracked the least recently used
+    tasks that are not being worked on are evicted first. Both limits are off
+    when None.
+    """
+
+    def __init__(
+        self,
+        terminal_task_ttl: float | None = None,
+        max_tasks: int | None = None,
+        remember_evicted: int = 10_000,
+    ):
+        self.terminal_task_ttl = terminal_task_ttl
+        self.max_tasks = max_tasks
+        self.remember_evicted = remember_evicted
+        # Task id -> last seen state, least recently used first.
+        self.task_states: OrderedDict[str, TaskState] = OrderedDict()
+        self.finished_at: dict[str, float] = {}
+        self.evicted_task_ids: OrderedDict[str, None] = OrderedDict()
+        self.evictions: dict[str, int] = {"ttl": 0, "capacity": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.terminal_task_ttl is not None or self.max_tasks is not None
+
+    def touch(self, task: Task) -> None:
+        if not self.enabled:
+            # Nothing is ever evicted, so there is nothing to track.
+            return
+        state = task.status.state
+        self.evicted_task_ids.pop(task.id, None)
+        self.task_states[task.id] = state
+        self.task_states.move_to_end(task.id)
+        if state in TERMINAL_TASK_STATES:
+            self.finished_at.setdefault(task.id, time.monotonic())
+        else:
+            self.finished_at.pop(task.id, None)
+
+    def expired(self) -> list[str]:
+        if self.terminal_task_ttl is None:
+            return []
+        cutoff = time.monotonic() - self.terminal_task_ttl
+        return [task_id for task_id, at in self.finished_at.items() if at <= cutoff]
+
+    def over_capacity(self) -> list[str]:
+        if self.max_tasks is None:
+            return []
+        excess = len(self.task_states) - self.max_tasks
+        victims = []
+        for task_id, state in self.task_states.items():
+            if len(victims) >= excess:
+                break
+            if state not in ACTIVE_TASK_STATES:
+                victims.append(task_id)
+        return victims
+
+    def forget(self, task_id: str, reason: str) -> None:
+        if self.task_states.pop(task_id, None) is None:
+            return
+        self.finished_at.pop(task_id, None)
+        self.evictions[reason] = self.evictions.get(reason, 0) + 1
+        self.evicted_task_ids[task_id] = None
+        while len(self.evicted_task_ids) > self.remember_evicted:
+            self.evicted_task_ids.popitem(last=False)
+
+    def was_evicted(self, task_id: str) -> bool:
+        return task_id in self.evicted_task_ids
+
+
+def task_retention_from_env() -> TaskRetention:
+    """Reads A2A_TERMINAL_TASK_TTL (seconds) and A2A_MAX_TASKS; limits that
+    are unset stay off."""
+    ttl = os.getenv("A2A_TERMINAL_TASK_TTL")
+    max_tasks = os.getenv("A2A_MAX_TASKS")
+    return TaskRetention(
+        terminal_task_ttl=float(ttl) if ttl else None,
+        max_tasks=int(max_tasks) if max_tasks else None,
+    )
@@ -1,5 +1,5 @@
 from starlette.applications import Starlette
-from starlette.responses import JSONResponse
+from starlette.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 from starlette.requests import Request
 from common.types import (
@@ -16,16 +16,59 @@ from common.types import (
     AgentCard,
     TaskResubscriptionRequest,
     SendTaskStreamingRequest,
+    JSONRPCRequest,
 )
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
+import asyncio
+import contextlib
+import hashlib
 import json
+import re
 from typing import AsyncIterable, Any
-from common.server.task_manager import TaskManager
+from common.server.blob_store import BlobStore, BlobStoreFullError, BlobTooLargeError
+from common.server.task_manager import TaskManager, LAST_EVENT_ID_KEY
+from common.utils.wire_format import (
+    BINARY_CONTEXT,
+    WireFormat,
+    WireFormatDecodeError,
+    negotiate_wire_format,
+    wire_format_for_content_type,
+)
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+STREAMING_REQUESTS = (SendTaskStreamingRequest, TaskResubscriptionRequest)
+
+BATCH_PREFIX = re.compile(rb"\s*\[")
+
+
+class ModelResponse(Response):
+    """JSON response rendered straight from pydantic models, without building
+    an intermediate dict for the stdlib json encoder, or in `wire_format`
+    when the client negotiated a binary one."""
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: BaseModel | list[BaseModel],
+        status_code: int = 200,
+        wire_format: WireFormat | None = None,
+    ):
+        self.wire_format = wire_format
+        if wire_format is not None:
+            self.media_type = wire_format.media_type
+        super().__init__(content, status_code)
+
+    def render(self, content: BaseModel | list[BaseModel]) -> bytes:
+        if self.wire_format is not None:
+            return self.wire_format.dump(content, exclude_none=True)
+        if isinstance(content, list):
+            return b"[" + b",".join(self.render(item) for item in content) + b"]"
+        return content.model_dump_json(exclude_none=True).encode()
+
 
 class A2AServer:
     def __init__(
@@ -35,17 +78,40 @@ class A2AServer:
         endpoint="/",
         agent_card: AgentCard = None,
         task_manager: TaskManager = None,
+        agent_card_max_age: int = 300,
+        blob_store: BlobStore | None = None,
     ):
         self.host = host
         self.port = port
         self.endpoint = endpoint
         self.task_manager = task_manager
         self.agent_card = agent_card
-        self.app = Starlette()
+        # How long clients may cache the agent card before revalidating it.
+        self.agent_card_max_age = agent_card_max_age
+        # Accepts file uploads so FileParts can refer to them by uri.
+        self.blob_store = blob_store
+        self.app = Starlette(lifespan=self._lifespan)
         self.app.add_route(self.endpoint, self._process_request, methods=["POST"])
         self.app.add_route(
             "/.well-known/agent.json", self._get_agent_card, methods=["GET"]
         )
+        if blob_store is not None:
+            self.app.add_route("/blobs", self._upload_blob, methods=["POST"])
+            self.app.add_route(
+                "/blobs/{blob_id}", self._get_blob, methods=["GET"], name="blob"
+            )
+
+    @contextlib.asynccontextmanager
+    async def _lifespan(self, app: Starlette):
+        if self.task_manager is not None:
+            await self.task_manager.start()
+        try:
+            yield
+        finally:
+            if self.task_manager is not None:
+                await self.task_manager.close()
+            if self.blob_store is not None:
+                self.blob_store.close()
 
     def start(self):
         if self.agent_card is None:
@@ -58,43 +124,153 @@ class A2AServer:
 
         uvicorn.run(self.app, host=self.host, port=self.port)
 
-    def _get_agent_card(self, request: Request) -> JSONResponse:
-        return JSONResponse(self.agent_card.model_dump(exclude_none=True))
+    def _get_agent_card(self, request: Request) -> Response:
+        body = self.agent_card.model_dump_json(exclude_none=True).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"max-age={self.agent_card_max_age}",
+        }
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    async def _upload_blob(self, request: Request) -> Response:
+        content_length = request.headers.get("Content-Length")
+        if content_length is not None and not content_length.isdigit():
+            return Response(status_code=400)
+        try:
+            if content_length:
+                self.blob_store.expire()
+                self.blob_store.check_space(int(content_length))
+            blob = await self.blob_store.put(
+                request.stream(), request.headers.get("Content-Type")
+            )
+        except BlobTooLargeError:
+            return Response(status_code=413)
+        except BlobStoreFullError:
+            return Response(status_code=507)
+        uri = str(request.url_for("blob", blob_id=blob.id))
+        return JSONResponse({"uri": uri, "size": blob.size}, status_code=201)
+
+    def _get_blob(self, request: Request) -> Response:
+        blob = self.blob_store.get(request.path_params["blob_id"])
+        if blob is None:
+            return Response(status_code=404)
+        return FileResponse(blob.path, media_type=blob.mime_type)
 
     async def _process_request(self, request: Request):
         try:
-            body = await request.json()
-            json_rpc_request = A2ARequest.validate_python(body)
-
-            if isinstance(json_rpc_request, GetTaskRequest):
-                result = await self.task_manager.on_get_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskRequest):
-                result = await self.task_manager.on_send_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SendTaskStreamingRequest):
-                result = await self.task_manager.on_send_task_subscribe(
-                    json_rpc_request
-                )
-            elif isinstance(json_rpc_request, CancelTaskRequest):
-                result = await self.task_manager.on_cancel_task(json_rpc_request)
-            elif isinstance(json_rpc_request, SetTaskPushNotificationRequest):
-                result = await self.task_manager.on_set_task_push_notification(json_rpc_request)
-            elif isinstance(json_rpc_request, GetTaskPushNotificationRequest):
-                result = await self.task_manager.on_get_task_push_notification(json_rpc_request)
-            elif isinstance(json_rpc_request, TaskResubscriptionRequest):
-                result = await self.task_manager.on_resubscribe_to_task(
-                    json_rpc_request
-                )
+            request_format = wire_format_for_content_type(request.headers.get("Content-Type"))
+        except ValueError:
+            return Response(status_code=415)
+        # Answer in the format asked for, or else in the request's format.
+        accept = request.headers.get("Accept")
+        response_format = negotiate_wire_format(accept) if accept else request_format
+
+        try:
+            body = await request.body()
+            if request_format is not None:
+                data = request_format.decode(body)
+                if isinstance(data, list):
+                    return await self._process_batch(data, response_format)
+                json_rpc_request = A2ARequest.validate_python(data)
+            elif BATCH_PREFIX.match(body):
+                return await self._process_batch(json.loads(body), response_format)
             else:
-                logger.warning(f"Unexpected request type: {type(json_rpc_request)}")
-                raise ValueError(f"Unexpected request type: {type(request)}")
+                # Validate the raw bytes directly; no intermediate dict is built.
+                json_rpc_request = A2ARequest.validate_json(body)
+            if isinstance(json_rpc_request, TaskResubscriptionRequest):
+                self._apply_last_event_id(json_rpc_request, request)
+            result = await self._dispatch(json_rpc_request)
+            return self._create_response(result, response_format)
+
+        except Exception as e:
+            return self._handle_exception(e, response_format)
+
+    def _apply_last_event_id(
+        self, json_rpc_request: TaskResubscriptionRequest, request: Request
+    ):
+        last_event_id = request.headers.get("Last-Event-ID")
+        if last_event_id is None:
+            return
+        params = json_rpc_request.params
+        # The header is what the SSE reconnection sets, so it wins over any
+        # id in the body.
+        params.metadata = {**(params.metadata or {}), LAST_EVENT_ID_KEY: last_event_id}
+
+    async def _dispatch(self, json_rpc_request: JSONRPCRequest) -> Any:
+        if isinstance(json_rpc_request, GetTaskRequest):
+            return await self.task_manager.on_get_task(json_rpc_request)
+        elif isinstance(json_rpc_request, SendTaskRequest):
+            return await self.task_manager.on_send_task(json_rpc_request)
+        elif isinstance(json_rpc_request, SendTaskStreamingRequest):
+            return await self.task_manager.on_send_task_subscribe(json_rpc_request)
+        elif isinstance(json_rpc_request, CancelTaskRequest):
+            return await self.task_manager.on_cancel_task(json_rpc_request)
+        elif isinstance(json_rpc_request, SetTaskPushNotificationRequest):
+            return await self.task_manager.on_set_task_push_notification(json_rpc_request)
+        elif isinstance(json_rpc_request, GetTaskPushNotificationRequest):
+            return await self.task_manager.on_get_task_push_notification(json_rpc_request)
+        elif isinstance(json_rpc_request, TaskResubscriptionRequest):
+            return await self.task_manager.on_resubscribe_to_task(json_rpc_request)
+        else:
+            logger.warning(f"Unexpected request type: {type(json_rpc_request)}")
+            raise ValueError(f"Unexpected request type: {type(json_rpc_request)}")
+
+    async def _process_batch(
+        self, body: list[Any], wire_format: WireFormat | None = None
+    ) -> ModelResponse:
+        """Handles a JSON-RPC 2.0 batch: entries are dispatched concurrently and
+        answered together in a single array response."""
+        if not body:
+            response = JSONRPCResponse(
+                id=None, error=InvalidRequestError(message="Batch request is empty")
+            )
+            return ModelResponse(response, status_code=400, wire_format=wire_format)
 
-            return self._create_response(result)
+        responses = await asyncio.gather(
+            *(self._process_batch_entry(entry) for entry in body)
+        )
+        return ModelResponse(list(responses), wire_format=wire_format)
+
+    async def _process_batch_entry(self, entry: Any) -> JSONRPCResponse:
+        request_id = entry.get("id") if isinstance(entry, dict) else None
+        if not isinstance(request_id, (int, str)):
+            request_id = None
+
+        try:
+            json_rpc_request = A2ARequest.validate_python(entry)
+            if isinstance(json_rpc_request, STREAMING_REQUESTS):
+                return JSONRPCResponse(
+                    id=request_id,
+                    error=InvalidRequestError(
+                        message=f"Streaming method {json_rpc_request.method} is not allowed in a batch request"
+                    ),
+                )
 
+            result = await self._dispatch(json_rpc_request)
+            if not isinstance(result, JSONRPCResponse):
+                logger.error(f"Unexpected result type: {type(result)}")
+                return JSONRPCResponse(id=request_id, error=InternalError())
+            return result
+        except ValidationError as e:
+            return JSONRPCResponse(
+                id=request_id, error=InvalidRequestError(data=json.loads(e.json()))
+            )
         except Exception as e:
-            return self._handle_exception(e)
+            logger.error(f"Unhandled exception in batch entry: {e}")
+            return JSONRPCResponse(id=request_id, error=InternalError())
 
-    def _handle_exception(self, e: Exception) -> JSONResponse:
-        if isinstance(e, json.decoder.JSONDecodeError):
+    def _handle_exception(
+        self, e: Exception, wire_format: WireFormat | None = None
+    ) -> ModelResponse:
+        if isinstance(e, (json.decoder.JSONDecodeError, WireFormatDecodeError)):
+            json_rpc_error = JSONParseError()
+        elif isinstance(e, ValidationError) and any(
+            error["type"] == "json_invalid" for error in e.errors()
+        ):
             json_rpc_error = JSONParseError()
         elif isinstance(e, ValidationError):
             json_rpc_error = InvalidRequestError(data=json.loads(e.json()))
@@ -103,18 +279,39 @@ class A2AServer:
             json_rpc_error = InternalError()
 
         response = JSONRPCResponse(id=None, error=json_rpc_error)
-        return JSONResponse(response.model_dump(exclude_none=True), status_code=400)
+        return ModelResponse(response, status_code=400, wire_format=wire_format)
+
+    def _create_response(
+        self, result: Any, wire_format: WireFormat | None = None
+    ) -> ModelResponse | EventSourceResponse | StreamingResponse:
+        if isinstance(result, AsyncIterable) and wire_format is not None:
+
+            async def frame_generator(result) -> AsyncIterable[bytes]:
+                async for item in result:
+                    yield wire_format.frame(
+                        {
+                            "id": getattr(item, "event_id", None),
+                            "data": item.model_dump(
+                                context=BINARY_CONTEXT, exclude_none=True
+                            ),
+                        }
+                    )
 
-    def _create_response(self, result: Any) -> JSONResponse | EventSourceResponse:
-        if isinstance(result, AsyncIterable):
+            return StreamingResponse(
+                frame_generator(result), media_type=wire_format.stream_media_type
+            )
+        elif isinstance(result, AsyncIterable):
 
             async def event_generator(result) -> AsyncIterable[dict[str, str]]:
                 async for item in result:
-                    yield {"data": item.model_dump_json(exclude_none=True)}
+                    event = {"data": item.model_dump_json(exclude_none=True)}
+                    if getattr(item, "event_id", None) is not None:
+                        event["id"] = str(item.event_id)
+                    yield event
 
             return EventSourceResponse(event_generator(result))
         elif isinstance(result, JSONRPCResponse):
-            return JSONResponse(result.model_dump(exclude_none=True))
+            return ModelResponse(result, wire_format=wire_format)
         else:
             logger.error(f"Unexpected result type: {type(result)}")
             raise ValueError(f"Unexpected result type: {type(result)}")
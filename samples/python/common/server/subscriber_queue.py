@@ -0,0 +1,88 @@
+from enum import Enum
+from typing import Any, NamedTuple
+from common.types import TaskState, TaskStatusUpdateEvent
+import asyncio
+
+
+class OverflowPolicy(str, Enum):
+    """What a full SSE subscriber queue does with a new event."""
+
+    # Wait until the subscriber catches up.
+    BLOCK = "block"
+    # Drop the oldest queued intermediate WORKING update to make room.
+    DROP_OLDEST = "drop_oldest"
+    # Replace a queued intermediate status update with the newer one.
+    COALESCE = "coalesce"
+
+
+class SequencedEvent(NamedTuple):
+    """An SSE event tagged with its position in the task's event stream."""
+
+    seq: int
+    event: Any
+
+
+def is_intermediate_status(event: Any) -> bool:
+    return isinstance(event, TaskStatusUpdateEvent) and not event.final
+
+
+class SubscriberQueue(asyncio.Queue):
+    """Per-subscriber SSE event queue with a bound and an overflow policy.
+
+    Final status updates, artifacts and errors are never dropped or coalesced;
+    when the policy cannot free a slot for them the producer waits as with
+    OverflowPolicy.BLOCK.
+    """
+
+    def __init__(
+        self, maxsize: int = 0, overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK
+    ):
+        super().__init__(maxsize=maxsize)
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+
+    async def put(self, item: SequencedEvent) -> None:
+        if self.closed:
+            return
+
+        if self.full():
+            if self.overflow_policy == OverflowPolicy.DROP_OLDEST and self._drop_oldest_working():
+                self.dropped += 1
+            elif self.overflow_policy == OverflowPolicy.COALESCE and self._coalesce(item):
+                self.coalesced += 1
+                return
+
+        await super().put(item)
+
+    def close(self) -> None:
+        """Discards queued events and releases producers blocked on this queue.
+
+        Called once the subscriber is gone so a BLOCK policy cannot stall the
+        producer forever.
+        """
+        self.closed = True
+        self._queue.clear()
+        while self._putters:
+            putter = self._putters.popleft()
+            if not putter.done():
+                putter.set_result(None)
+
+    def _drop_oldest_working(self) -> bool:
+        for i, (_, event) in enumerate(self._queue):
+            if is_intermediate_status(event) and event.status.state == TaskState.WORKING:
+                del self._queue[i]
+                self.task_done()
+                return True
+        return False
+
+    def _coalesce(self, item: SequencedEvent) -> bool:
+        if (
+            is_intermediate_status(item.event)
+            and self._queue
+            and is_intermediate_status(self._queue[-1].event)
+        ):
+            self._queue[-1] = item
+            return True
+        return False
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Union, AsyncIterable, List
+from typing import Union, AsyncIterable, List, Any
 from common.types import Task
 from common.types import (
     JSONRPCResponse,
@@ -31,12 +31,30 @@ from common.types import (
     TaskPushNotificationConfig,
     InternalError,
 )
-from common.server.utils import new_not_implemented_error
+from common.server.artifact_streamer import merge_artifact_chunk
+from common.server.task_store import TERMINAL_TASK_STATES, TaskStore, task_store_from_env
+from common.server.subscriber_queue import OverflowPolicy, SequencedEvent, SubscriberQueue
+from common.server.retention import TaskRetention, task_retention_from_env
+from common.utils.push_notification_dispatcher import PushNotificationDispatcher
+from collections import deque
 import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Key under TaskIdParams.metadata where A2AServer puts the Last-Event-ID
+# header of a tasks/resubscribe request.
+LAST_EVENT_ID_KEY = "lastEventId"
+
+
+def get_last_event_id(task_id_params: TaskIdParams) -> int | None:
+    if not task_id_params.metadata:
+        return None
+    try:
+        return int(task_id_params.metadata[LAST_EVENT_ID_KEY])
+    except (KeyError, TypeError, ValueError):
+        return None
+
 class TaskManager(ABC):
     @abstractmethod
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
@@ -74,27 +92,131 @@ class TaskManager(ABC):
     ) -> Union[AsyncIterable[SendTaskResponse], JSONRPCResponse]:
         pass
 
+    async def start(self) -> None:
+        """Called by A2AServer once the event loop is running."""
+        pass
+
+    async def close(self) -> None:
+        """Called by A2AServer on shutdown."""
+        pass
+
 
 class InMemoryTaskManager(TaskManager):
-    def __init__(self):
-        self.tasks: dict[str, Task] = {}
-        self.push_notification_infos: dict[str, PushNotificationConfig] = {}
-        self.lock = asyncio.Lock()
-        self.task_sse_subscribers: dict[str, List[asyncio.Queue]] = {}
+    def __init__(
+        self,
+        task_store: TaskStore | None = None,
+        lock_stripes: int = 64,
+        sse_queue_size: int = 1024,
+        sse_overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        replay_buffer_size: int = 256,
+        replay_grace_period: float = 60,
+        task_retention: TaskRetention | None = None,
+        sweep_interval: float = 60,
+        notification_dispatcher: PushNotificationDispatcher | None = None,
+    ):
+        self.task_store = task_store if task_store is not None else task_store_from_env()
+        # Writers for the same task serialize on one of a fixed set of locks
+        # chosen by task id, so a busy task only delays tasks sharing its stripe.
+        # Reads take no lock. Writers mutate the stored Task in place on the
+        # event loop and never await in the middle of a change, so a reader
+        # holding the same object sees each update whole. A task read from
+        # SQLite is a new object parsed from a committed row, and save_task
+        # keeps the task in memory until its row is committed.
+        self.task_locks = [asyncio.Lock() for _ in range(max(1, lock_stripes))]
+        self.task_sse_subscribers: dict[str, List[SubscriberQueue]] = {}
         self.subscriber_lock = asyncio.Lock()
+        # Per-subscriber bound (<=0 is unlimited) and what to do when it is hit.
+        self.sse_queue_size = sse_queue_size
+        self.sse_overflow_policy = sse_overflow_policy
+        self.sse_events_dropped = 0
+        self.sse_events_coalesced = 0
+        # The most recent events of every streamed task, replayed to clients
+        # that resubscribe with a Last-Event-ID. A task's buffer is dropped
+        # `replay_grace_period` seconds after its final event, unless the task
+        # streams again in the meantime.
+        self.replay_buffer_size = replay_buffer_size
+        self.replay_grace_period = replay_grace_period
+        self.task_event_buffers: dict[str, deque[SequencedEvent]] = {}
+        self.buffer_drops: dict[str, asyncio.TimerHandle] = {}
+        self.task_retention = task_retention if task_retention is not None else task_retention_from_env()
+        self.sweep_interval = sweep_interval
+        self.sweeper: asyncio.Task | None = None
+        self.notification_dispatcher = notification_dispatcher
+
+    async def start(self) -> None:
+        if self.task_retention.enabled and self.sweeper is None:
+            self.sweeper = asyncio.create_task(self.run_sweeper())
+        if self.notification_dispatcher is not None:
+            self.notification_dispatcher.start()
+
+    async def close(self) -> None:
+        for handle in self.buffer_drops.values():
+            handle.cancel()
+        self.buffer_drops.clear()
+        if self.sweeper is not None:
+            self.sweeper.cancel()
+            self.sweeper = None
+        if self.notification_dispatcher is not None:
+            await self.notification_dispatcher.close()
+        await self.task_store.close()
+
+    async def run_sweeper(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep_expired_tasks()
+            except Exception as e:
+                logger.error(f"Error while sweeping expired tasks: {e}")
+
+    async def sweep_expired_tasks(self) -> int:
+        """Evicts tasks past their retention limits; returns how many."""
+        evicted = 0
+        for task_id in self.task_retention.expired():
+            await self.evict_task(task_id, "ttl")
+            evicted += 1
+        for task_id in self.task_retention.over_capacity():
+            await self.evict_task(task_id, "capacity")
+            evicted += 1
+        return evicted
+
+    async def evict_task(self, task_id: str, reason: str) -> None:
+        logger.info(f"Evicting task {task_id} ({reason})")
+        async with self.task_lock(task_id):
+            await self.task_store.delete_task(task_id)
+        async with self.subscriber_lock:
+            self._drop_event_buffer(task_id)
+            if not self.task_sse_subscribers.get(task_id):
+                self.task_sse_subscribers.pop(task_id, None)
+        self.task_retention.forget(task_id, reason)
+
+    def task_lock(self, task_id: str) -> asyncio.Lock:
+        return self.task_locks[hash(task_id) % len(self.task_locks)]
+
+    @property
+    def tasks(self) -> dict[str, Task]:
+        return self.task_store.tasks
+
+    @property
+    def push_notification_infos(self) -> dict[str, PushNotificationConfig]:
+        return self.task_store.push_notification_infos
 
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
         logger.info(f"Getting task {request.params.id}")
         task_query_params: TaskQueryParams = request.params
 
-        async with self.lock:
-            task = self.tasks.get(task_query_params.id)
-            if task is None:
-                return GetTaskResponse(id=request.id, error=TaskNotFoundError())
+        task = await self.task_store.get_task(task_query_params.id)
+        if task is None:
+            if self.task_retention.was_evicted(task_query_params.id):
+                return GetTaskResponse(
+                    id=request.id,
+                    error=TaskNotFoundError(
+                        message="Task was evicted after exceeding the server's retention limits"
+                    ),
+                )
+            return GetTaskResponse(id=request.id, error=TaskNotFoundError())
 
-            task_result = self.append_task_history(
-                task, task_query_params.historyLength
-            )
+        self.task_retention.touch(task)
+        task_result = self.append_task_history(task, task_query_params.historyLength)
 
         return GetTaskResponse(id=request.id, result=task_result)
 
@@ -102,10 +224,9 @@ class InMemoryTaskManager(TaskManager):
         logger.info(f"Cancelling task {request.params.id}")
         task_id_params: TaskIdParams = request.params
 
-        async with self.lock:
-            task = self.tasks.get(task_id_params.id)
-            if task is None:
-                return CancelTaskResponse(id=request.id, error=TaskNotFoundError())
+        task = await self.task_store.get_task(task_id_params.id)
+        if task is None:
+            return CancelTaskResponse(id=request.id, error=TaskNotFoundError())
 
         return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
 
@@ -120,28 +241,28 @@ class InMemoryTaskManager(TaskManager):
         pass
 
     async def set_push_notification_info(self, task_id: str, notification_config: PushNotificationConfig):
-        async with self.lock:
-            task = self.tasks.get(task_id)
+        async with self.task_lock(task_id):
+            task = await self.task_store.get_task(task_id)
             if task is None:
                 raise ValueError(f"Task not found for {task_id}")
 
-            self.push_notification_infos[task_id] = notification_config
+            await self.task_store.set_push_notification_info(task_id, notification_config)
 
         return
     
     async def get_push_notification_info(self, task_id: str) -> PushNotificationConfig:
-        async with self.lock:
-            task = self.tasks.get(task_id)
-            if task is None:
-                raise ValueError(f"Task not found for {task_id}")
+        task = await self.task_store.get_task(task_id)
+        if task is None:
+            raise ValueError(f"Task not found for {task_id}")
 
-            return self.push_notification_infos[task_id]
-            
-        return
+        notification_config = await self.task_store.get_push_notification_info(task_id)
+        if notification_config is None:
+            raise ValueError(f"Push notification info not found for {task_id}")
+
+        return notification_config
     
     async def has_push_notification_info(self, task_id: str) -> bool:
-        async with self.lock:
-            return task_id in self.push_notification_infos
+        return await self.task_store.get_push_notification_info(task_id) is not None
             
 
     async def on_set_task_push_notification(
@@ -184,8 +305,8 @@ class InMemoryTaskManager(TaskManager):
 
     async def upsert_task(self, task_send_params: TaskSendParams) -> Task:
         logger.info(f"Upserting task {task_send_params.id}")
-        async with self.lock:
-            task = self.tasks.get(task_send_params.id)
+        async with self.task_lock(task_send_params.id):
+            task = await self.task_store.get_task(task_send_params.id)
             if task is None:
                 task = Task(
                     id=task_send_params.id,
@@ -194,84 +315,214 @@ class InMemoryTaskManager(TaskManager):
                     status=TaskStatus(state=TaskState.SUBMITTED),
                     history=[task_send_params.message],
                 )
-                self.tasks[task_send_params.id] = task
             else:
                 task.history.append(task_send_params.message)
 
-            return task
+            await self.task_store.save_task(task)
+            self.task_retention.touch(task)
+
+        for task_id in self.task_retention.over_capacity():
+            await self.evict_task(task_id, "capacity")
+        return task
 
     async def on_resubscribe_to_task(
         self, request: TaskResubscriptionRequest
     ) -> Union[AsyncIterable[SendTaskStreamingResponse], JSONRPCResponse]:
-        return new_not_implemented_error(request.id)
+        task_id_params: TaskIdParams = request.params
+        last_event_id = get_last_event_id(task_id_params)
+        task = await self.task_store.get_task(task_id_params.id)
+        if task is not None and task.status.state in TERMINAL_TASK_STATES:
+            # Nothing more will be sent for a finished task, so unless the
+            # client missed buffered events, it only gets the final status.
+            async with self.subscriber_lock:
+                missed = last_event_id is not None and any(
+                    item.seq > last_event_id
+                    for item in self.task_event_buffers.get(task_id_params.id, ())
+                )
+            if not missed:
+                return self._final_status_stream(request.id, task)
+        try:
+            sse_event_queue = await self.setup_sse_consumer(
+                task_id_params.id, True, last_event_id
+            )
+        except ValueError:
+            return JSONRPCResponse(id=request.id, error=TaskNotFoundError())
+        except Exception as e:
+            logger.error(f"Error while reconnecting to SSE stream: {e}")
+            return JSONRPCResponse(
+                id=request.id,
+                error=InternalError(
+                    message=f"An error occurred while reconnecting to stream: {e}"
+                ),
+            )
+
+        return self.dequeue_events_for_sse(request.id, task_id_params.id, sse_event_queue)
+
+    async def _final_status_stream(
+        self, request_id, task: Task
+    ) -> AsyncIterable[SendTaskStreamingResponse]:
+        yield SendTaskStreamingResponse(
+            id=request_id,
+            result=TaskStatusUpdateEvent(id=task.id, status=task.status, final=True),
+        )
 
     async def update_store(
-        self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
+        self, task_id: str, status: TaskStatus | None, artifacts: list[Artifact]
     ) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError:
+        """Applies a status update and new artifacts to a stored task. A None
+        status leaves the task's status as it is; artifact chunks with
+        `append` set are merged into the artifact they continue."""
+        async with self.task_lock(task_id):
+            task = await self.task_store.get_task(task_id)
+            if task is None:
                 logger.error(f"Task {task_id} not found for updating the task")
                 raise ValueError(f"Task {task_id} not found")
 
-            task.status = status
-
-            if status.message is not None:
-                task.history.append(status.message)
+            if status is not None:
+                task.status = status
+                if status.message is not None:
+                    task.history.append(status.message)
 
             if artifacts is not None:
                 if task.artifacts is None:
                     task.artifacts = []
-                task.artifacts.extend(artifacts)
-
+                for artifact in artifacts:
+                    merge_artifact_chunk(task.artifacts, artifact)
+
+            # A chunk in the middle of a streamed artifact is kept on the task
+            # in memory and persisted with the artifact's last chunk, so a
+            # store that serializes the whole task does not do so per chunk.
+            mid_stream = (
+                status is None
+                and artifacts
+                and all(artifact.lastChunk is False for artifact in artifacts)
+                and self.task_store.tasks.get(task_id) is task
+            )
+            if not mid_stream:
+                await self.task_store.save_task(task)
+            self.task_retention.touch(task)
             return task
 
     def append_task_history(self, task: Task, historyLength: int | None):
-        new_task = task.model_copy()
-        if historyLength is not None and historyLength > 0:
-            new_task.history = new_task.history[-historyLength:]
-        else:
-            new_task.history = []
-
-        return new_task        
-
-    async def setup_sse_consumer(self, task_id: str, is_resubscribe: bool = False):
+        # The window is applied when the response is serialized, so neither
+        # the task's fields nor its history list are copied here.
+        return task.with_history_window(historyLength)
+
+    async def setup_sse_consumer(
+        self, task_id: str, is_resubscribe: bool = False, last_event_id: int | None = None
+    ):
+        """Registers a new SSE subscriber for a task.
+
+        When `last_event_id` is given, buffered events that came after it are
+        queued first, so a reconnecting client sees exactly what it missed.
+        """
         async with self.subscriber_lock:
             if task_id not in self.task_sse_subscribers:
-                if is_resubscribe:
+                if is_resubscribe and task_id not in self.task_event_buffers:
                     raise ValueError("Task not found for resubscription")
-                else:
-                    self.task_sse_subscribers[task_id] = []
+                self.task_sse_subscribers[task_id] = []
+
+            sse_event_queue = SubscriberQueue(
+                maxsize=self.sse_queue_size, overflow_policy=self.sse_overflow_policy
+            )
+            if last_event_id is not None:
+                missed = [
+                    item
+                    for item in self.task_event_buffers.get(task_id, ())
+                    if item.seq > last_event_id
+                ]
+                if missed and missed[0].seq != last_event_id + 1:
+                    logger.warning(
+                        f"Events {last_event_id + 1}..{missed[0].seq - 1} of task {task_id} are no longer buffered"
+                    )
+                if sse_event_queue.maxsize > 0:
+                    missed = missed[-sse_event_queue.maxsize:]
+                for item in missed:
+                    sse_event_queue.put_nowait(item)
 
-            sse_event_queue = asyncio.Queue(maxsize=0) # <=0 is unlimited
             self.task_sse_subscribers[task_id].append(sse_event_queue)
             return sse_event_queue
 
     async def enqueue_events_for_sse(self, task_id, task_update_event):
         async with self.subscriber_lock:
+            buffer = self.task_event_buffers.get(task_id)
+            if buffer is None:
+                buffer = self.task_event_buffers[task_id] = deque(
+                    maxlen=max(1, self.replay_buffer_size)
+                )
+            item = SequencedEvent(buffer[-1].seq + 1 if buffer else 0, task_update_event)
+            buffer.append(item)
+            pending_drop = self.buffer_drops.pop(task_id, None)
+            if pending_drop is not None:
+                pending_drop.cancel()
+            if self._is_final_event(task_update_event):
+                self.buffer_drops[task_id] = asyncio.get_running_loop().call_later(
+                    self.replay_grace_period, self._drop_event_buffer, task_id
+                )
+
             if task_id not in self.task_sse_subscribers:
                 return
 
-            current_subscribers = self.task_sse_subscribers[task_id]
-            for subscriber in current_subscribers:
-                await subscriber.put(task_update_event)
+            current_subscribers = list(self.task_sse_subscribers[task_id])
+
+        # Put outside the lock: a full queue must only hold up its own task.
+        for subscriber in current_subscribers:
+            await subscriber.put(item)
+
+    def _drop_event_buffer(self, task_id: str) -> None:
+        pending_drop = self.buffer_drops.pop(task_id, None)
+        if pending_drop is not None:
+            pending_drop.cancel()
+        self.task_event_buffers.pop(task_id, None)
+
+    @staticmethod
+    def _is_final_event(event: Any) -> bool:
+        return isinstance(event, JSONRPCError) or (
+            isinstance(event, TaskStatusUpdateEvent) and event.final
+        )
 
     async def dequeue_events_for_sse(
         self, request_id, task_id, sse_event_queue: asyncio.Queue
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
         try:
             while True:                
-                event = await sse_event_queue.get()
+                seq, event = await sse_event_queue.get()
                 if isinstance(event, JSONRPCError):
-                    yield SendTaskStreamingResponse(id=request_id, error=event)
+                    yield SendTaskStreamingResponse(id=request_id, error=event, event_id=seq)
                     break
                                                 
-                yield SendTaskStreamingResponse(id=request_id, result=event)
+                yield SendTaskStreamingResponse(id=request_id, result=event, event_id=seq)
                 if isinstance(event, TaskStatusUpdateEvent) and event.final:
                     break
         finally:
             async with self.subscriber_lock:
-                if task_id in self.task_sse_subscribers:
-                    self.task_sse_subscribers[task_id].remove(sse_event_queue)
+                subscribers = self.task_sse_subscribers.get(task_id)
+                if subscribers is not None:
+                    subscribers.remove(sse_event_queue)
+                    if not subscribers:
+                        del self.task_sse_subscribers[task_id]
+            sse_event_queue.close()
+            self.sse_events_dropped += sse_event_queue.dropped
+            self.sse_events_coalesced += sse_event_queue.coalesced
+
+    def metrics(self) -> dict[str, Any]:
+        """Point-in-time counters for monitoring the task manager."""
+        live_queues = [q for queues in self.task_sse_subscribers.values() for q in queues]
+        return {
+            "sse_queue_depth": {
+                task_id: max((q.qsize() for q in queues), default=0)
+                for task_id, queues in self.task_sse_subscribers.items()
+            },
+            "sse_events_dropped": self.sse_events_dropped
+            + sum(q.dropped for q in live_queues),
+            "sse_events_coalesced": self.sse_events_coalesced
+            + sum(q.coalesced for q in live_queues),
+            "tasks_tracked": len(self.task_retention.task_states),
+            "tasks_evicted": dict(self.task_retention.evictions),
+            **(
+                self.notification_dispatcher.metrics()
+                if self.notification_dispatcher is not None
+                else {}
+            ),
+        }
 
@@ -0,0 +1,274 @@
+from abc import ABC, abstractmethod
+from common.types import Task, TaskState, PushNotificationConfig
+import asyncio
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_TASK_STATES = {TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED}
+
+
+class TaskStore(ABC):
+    """Storage backend used by InMemoryTaskManager.
+
+    Implementations keep the tasks that are still being worked on in the
+    `tasks` dict so task managers can mutate them in place; `save_task` must
+    be awaited after every mutation to make it visible to the backend.
+    """
+
+    tasks: dict[str, Task]
+    push_notification_infos: dict[str, PushNotificationConfig]
+
+    @abstractmethod
+    async def get_task(self, task_id: str) -> Task | None:
+        pass
+
+    @abstractmethod
+    async def save_task(self, task: Task) -> None:
+        pass
+
+    @abstractmethod
+    async def delete_task(self, task_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig | None:
+        pass
+
+    @abstractmethod
+    async def set_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryTaskStore(TaskStore):
+    def __init__(self):
+        self.tasks: dict[str, Task] = {}
+        self.push_notification_infos: dict[str, PushNotificationConfig] = {}
+
+    async def get_task(self, task_id: str) -> Task | None:
+        return self.tasks.get(task_id)
+
+    async def save_task(self, task: Task) -> None:
+        self.tasks[task.id] = task
+
+    async def delete_task(self, task_id: str) -> None:
+        self.tasks.pop(task_id, None)
+        self.push_notification_infos.pop(task_id, None)
+
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig | None:
+        return self.push_notification_infos.get(task_id)
+
+    async def set_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ) -> None:
+        self.push_notification_infos[task_id] = notification_config
+
+
+class SQLiteTaskStore(InMemoryTaskStore):
+    """Durable TaskStore backed by a SQLite database in WAL mode.
+
+    Only tasks that have not reached a terminal state are kept in memory;
+    finished tasks are read back from disk on demand. All writes go through
+    a single writer thread which drains everything queued since its last
+    commit and applies it in one transaction, so under load many `save_task`
+    calls share a single commit. Reads use one connection per thread, so
+    `path` must name a file: every connection to ":memory:" would open its
+    own empty database.
+    """
+
+    def __init__(self, path: str, max_batch_size: int = 512):
+        if not path or path == ":memory:" or path.startswith("file::memory:"):
+            raise ValueError(
+                "SQLiteTaskStore needs a database file; use InMemoryTaskStore to keep tasks in memory"
+            )
+        super().__init__()
+        self.path = path
+        self.max_batch_size = max_batch_size
+        self._local = threading.local()
+        self._read_conns: list[sqlite3.Connection] = []
+        self._read_conns_lock = threading.Lock()
+        self._writes: queue.SimpleQueue = queue.SimpleQueue()
+
+        self._writer_conn = self._connect()
+        self._writer_conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS push_notification_infos (
+                task_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            """
+        )
+        self._writer = threading.Thread(
+            target=self._run_writer, name="sqlite-task-store-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _read_conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            with self._read_conns_lock:
+                self._read_conns.append(conn)
+        return conn
+
+    def _fetch_data(self, sql: str, key: str) -> str | None:
+        row = self._read_conn().execute(sql, (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def _run_writer(self):
+        conn = self._writer_conn
+        stopping = False
+        while not stopping:
+            item = self._writes.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            error = None
+            try:
+                conn.execute("BEGIN")
+                for sql, params, _, _ in batch:
+                    conn.execute(sql, params)
+                conn.execute("COMMIT")
+            except Exception as e:
+                logger.error(f"Error while committing task store batch: {e}")
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                error = e
+
+            for _, _, loop, future in batch:
+                try:
+                    loop.call_soon_threadsafe(self._resolve, future, error)
+                except RuntimeError:
+                    # The loop that issued the write is gone; nobody is waiting.
+                    pass
+        conn.close()
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, error: Exception | None):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(None)
+
+    def _write(self, sql: str, params: tuple) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._writes.put((sql, params, loop, future))
+        return future
+
+    async def get_task(self, task_id: str) -> Task | None:
+        task = self.tasks.get(task_id)
+        if task is not None:
+            return task
+
+        data = await asyncio.to_thread(
+            self._fetch_data, "SELECT data FROM tasks WHERE id = ?", task_id
+        )
+        if data is None:
+            return None
+
+        task = Task.model_validate_json(data)
+        if task.status.state in TERMINAL_TASK_STATES:
+            return task
+        return self.tasks.setdefault(task_id, task)
+
+    async def save_task(self, task: Task) -> None:
+        self.tasks[task.id] = task
+        await self._write(
+            "INSERT OR REPLACE INTO tasks (id, data, updated_at) VALUES (?, ?, ?)",
+            (task.id, task.model_dump_json(exclude_none=True), time.time()),
+        )
+        if task.status.state in TERMINAL_TASK_STATES and self.tasks.get(task.id) is task:
+            # The committed row is now the source of truth for this task.
+            del self.tasks[task.id]
+
+    async def delete_task(self, task_id: str) -> None:
+        await super().delete_task(task_id)
+        await asyncio.gather(
+            self._write("DELETE FROM tasks WHERE id = ?", (task_id,)),
+            self._write(
+                "DELETE FROM push_notification_infos WHERE task_id = ?", (task_id,)
+            ),
+        )
+
+    async def get_push_notification_info(
+        self, task_id: str
+    ) -> PushNotificationConfig | None:
+        notification_config = self.push_notification_infos.get(task_id)
+        if notification_config is not None:
+            return notification_config
+
+        data = await asyncio.to_thread(
+            self._fetch_data,
+            "SELECT data FROM push_notification_infos WHERE task_id = ?",
+            task_id,
+        )
+        if data is None:
+            return None
+
+        notification_config = PushNotificationConfig.model_validate_json(data)
+        return self.push_notification_infos.setdefault(task_id, notification_config)
+
+    async def set_push_notification_info(
+        self, task_id: str, notification_config: PushNotificationConfig
+    ) -> None:
+        await super().set_push_notification_info(task_id, notification_config)
+        await self._write(
+            "INSERT OR REPLACE INTO push_notification_infos (task_id, data) VALUES (?, ?)",
+            (task_id, notification_config.model_dump_json(exclude_none=True)),
+        )
+
+    async def close(self) -> None:
+        self._writes.put(None)
+        await asyncio.to_thread(self._writer.join)
+        with self._read_conns_lock:
+            read_conns, self._read_conns = self._read_conns, []
+        for conn in read_conns:
+            conn.close()
+
+
+def task_store_from_env() -> TaskStore:
+    """Returns a SQLiteTaskStore when A2A_TASK_STORE_PATH is set, an
+    InMemoryTaskStore otherwise."""
+    path = os.getenv("A2A_TASK_STORE_PATH")
+    if path:
+        logger.info(f"Persisting tasks to {path}")
+        return SQLiteTaskStore(path)
+    return InMemoryTaskStore()
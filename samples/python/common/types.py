@@ -2,10 +2,13 @@ from typing import Union, Any
 from pydantic import BaseModel, Field, TypeAdapter
 from typing import Literal, List, Annotated, Optional
 from datetime import datetime
-from pydantic import model_validator, ConfigDict, field_serializer
+from pydantic import model_validator, ConfigDict, field_serializer, PrivateAttr
+from pydantic import SerializerFunctionWrapHandler
 from uuid import uuid4
 from enum import Enum
 from typing_extensions import Self
+from common.utils.wire_format import FileBytes
+import base64
 
 
 class TaskState(str, Enum):
@@ -40,6 +43,13 @@ class FileContent(BaseModel):
             )
         return self
 
+    @field_serializer("bytes")
+    def serialize_bytes(self, value: str | None, info):
+        # Binary wire formats send the content raw rather than as base64.
+        if value is not None and info.context and info.context.get("binary_file_bytes"):
+            return FileBytes(base64.b64decode(value))
+        return value
+
 
 class FilePart(BaseModel):
     type: Literal["file"] = "file"
@@ -55,6 +65,14 @@ class DataPart(BaseModel):
 
 Part = Annotated[Union[TextPart, FilePart, DataPart], Field(discriminator="type")]
 
+# Task managers build the events they stream with these same validating
+# constructors. pydantic-core validates a model in about the time it takes to
+# allocate it, so skipping validation for server-made events gains nothing
+# for the single-part chunks agents stream, and `model_construct` is slower
+# still (much slower for TaskStatus, whose timestamp has a default factory).
+# Passing parts as models rather than dicts is the cheaper way to build them.
+# See benchmarks/bench_types.py.
+
 
 class Message(BaseModel):
     role: Literal["user", "agent"]
@@ -89,6 +107,25 @@ class Task(BaseModel):
     artifacts: List[Artifact] | None = None
     history: List[Message] | None = None
     metadata: dict[str, Any] | None = None
+    # Number of trailing history messages to serialize; None means all.
+    _history_length: int | None = PrivateAttr(default=None)
+
+    @field_serializer("history", mode="wrap")
+    def serialize_history(
+        self, history: List[Message] | None, handler: SerializerFunctionWrapHandler
+    ):
+        if history is None or self._history_length is None:
+            return handler(history)
+        if self._history_length <= 0:
+            return handler([])
+        return handler(history[-self._history_length:])
+
+    def with_history_window(self, history_length: int | None) -> "Task":
+        """Returns a shallow copy of this task that serializes only its last
+        `history_length` messages. The history list itself is not copied."""
+        task = self.model_copy()
+        task._history_length = history_length if history_length is not None else 0
+        return task
 
 
 class TaskStatusUpdateEvent(BaseModel):
@@ -181,6 +218,9 @@ class SendTaskStreamingRequest(JSONRPCRequest):
 
 class SendTaskStreamingResponse(JSONRPCResponse):
     result: TaskStatusUpdateEvent | TaskArtifactUpdateEvent | None = None
+    # Position of the event in its task's stream. Carried in the SSE `id:`
+    # field rather than in the JSON-RPC payload.
+    event_id: int | None = Field(default=None, exclude=True)
 
 
 class GetTaskRequest(JSONRPCRequest):
@@ -359,6 +399,12 @@ class A2AClientJSONError(A2AClientError):
         super().__init__(f"JSON Error: {message}")
 
 
+class A2AClientCircuitOpenError(A2AClientError):
+    def __init__(self, url: str):
+        self.url = url
+        super().__init__(f"Circuit open for agent at {url}")
+
+
 class MissingAPIKeyError(Exception):
     """Exception for missing API key."""
 
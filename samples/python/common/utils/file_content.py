@@ -0,0 +1,52 @@
+from typing import TYPE_CHECKING, Collection
+from urllib.parse import urlparse
+from common.types import FileContent
+import base64
+import httpx
+
+if TYPE_CHECKING:
+    from common.server.blob_store import BlobStore
+
+DEFAULT_MAX_DOWNLOAD_SIZE = 100 * 2**20
+
+
+async def read_file_content(
+    file: FileContent,
+    blob_store: "BlobStore | None" = None,
+    allowed_hosts: Collection[str] = (),
+    max_size: int = DEFAULT_MAX_DOWNLOAD_SIZE,
+    timeout: float = 30,
+) -> bytes:
+    """Returns the content of a FilePart's file, whether sent inline as
+    base64 `bytes` or by `uri`.
+
+    A uri that names a blob of `blob_store` (the agent's own upload
+    endpoint) is read from disk. Any other uri is only downloaded, up to
+    `max_size` bytes and without following redirects, when its host[:port]
+    is in `allowed_hosts`; files come from untrusted callers, so by default
+    they are never fetched.
+    """
+    if file.bytes is not None:
+        return base64.b64decode(file.bytes)
+    if file.uri is None:
+        raise ValueError("File has neither bytes nor a uri")
+
+    url = urlparse(file.uri)
+    if blob_store is not None:
+        blob = blob_store.get(url.path.rsplit("/", 1)[-1])
+        if blob is not None:
+            return blob_store.read_bytes(blob.id)
+    if url.scheme not in ("http", "https") or url.netloc.lower() not in allowed_hosts:
+        raise ValueError(f"Unsupported file uri: {file.uri}")
+
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        async with client.stream("GET", file.uri) as response:
+            if response.is_redirect:
+                raise ValueError(f"{file.uri} redirects to {response.headers.get('Location')}")
+            response.raise_for_status()
+            content = bytearray()
+            async for chunk in response.aiter_bytes():
+                content += chunk
+                if len(content) > max_size:
+                    raise ValueError(f"{file.uri} is larger than {max_size} bytes")
+            return bytes(content)
@@ -1,19 +1,391 @@
 """In Memory Cache utility."""
 
+from abc import ABC, abstractmethod
+import asyncio
+from collections import OrderedDict
+import contextlib
+import heapq
+import sys
 import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
+# Called with the key, the value and the reason ("expired", "max_entries" or
+# "max_bytes") whenever the cache drops an entry on its own.
+EvictionCallback = Callable[[str, Any, str], None]
 
-class InMemoryCache:
+Eviction = Tuple[str, Any, str]
+
+DEFAULT_SWEEP_INTERVAL = 60.0
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Roughly estimates the memory held by a value, in bytes.
+
+    Strings and bytes count their length; containers, pydantic models and
+    other objects with a __dict__ count their contents, a few levels deep.
+    Anything else counts its sys.getsizeof.
+
+    Args:
+        value: The value to measure.
+
+    Returns:
+        The estimated size in bytes.
+    """
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return len(value)
+    if _depth >= 4:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+            for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(estimate_size(item, _depth + 1) for item in value)
+    if hasattr(value, "__dict__"):
+        return estimate_size(vars(value), _depth + 1)
+    return sys.getsizeof(value)
+
+
+class _Stripe:
+    """The entries of a cache whose keys hash to one lock.
+
+    Every method takes the stripe's lock and returns the entries it evicted,
+    for the cache to report once the lock is released.
+    """
+
+    def __init__(self, lock):
+        # Least recently used first.
+        self.data: "OrderedDict[str, Any]" = OrderedDict()
+        self.ttl: Dict[str, float] = {}
+        self.sizes: Dict[str, int] = {}
+        self.bytes = 0
+        # (expiry, key) of every TTL set; entries are checked against ttl
+        # when popped, so stale ones are skipped.
+        self.expiry_heap: List[Tuple[float, str]] = []
+        self.lock = lock
+        self.evictions: Dict[str, int] = {"expired": 0, "max_entries": 0, "max_bytes": 0}
+
+    def set(self, key, value, expires_at, size, max_entries, max_bytes) -> List[Eviction]:
+        with self.lock:
+            self._remove(key)
+            self.data[key] = value
+            if size is not None:
+                self.sizes[key] = size
+                self.bytes += size
+            if expires_at is not None:
+                self.ttl[key] = expires_at
+                heapq.heappush(self.expiry_heap, (expires_at, key))
+            return self._evict(max_entries, max_bytes)
+
+    def get(self, key, default, now) -> Tuple[Any, List[Eviction]]:
+        with self.lock:
+            if key in self.ttl and now > self.ttl[key]:
+                self.evictions["expired"] += 1
+                return default, [(key, self._remove(key), "expired")]
+            if key in self.data:
+                self.data.move_to_end(key)
+            return self.data.get(key, default), []
+
+    def delete(self, key) -> bool:
+        with self.lock:
+            if key in self.data:
+                self._remove(key)
+                return True
+            return False
+
+    def clear(self) -> None:
+        with self.lock:
+            self.data.clear()
+            self.ttl.clear()
+            self.sizes.clear()
+            self.bytes = 0
+            self.expiry_heap.clear()
+            self.evictions = dict.fromkeys(self.evictions, 0)
+
+    def sweep(self, now) -> List[Eviction]:
+        evicted = []
+        with self.lock:
+            while self.expiry_heap and self.expiry_heap[0][0] <= now:
+                expires_at, key = heapq.heappop(self.expiry_heap)
+                # Skip entries overwritten, deleted or given a new TTL since.
+                if self.ttl.get(key) == expires_at:
+                    evicted.append((key, self._remove(key), "expired"))
+            self.evictions["expired"] += len(evicted)
+        return evicted
+
+    def limit(self, max_entries, max_bytes) -> List[Eviction]:
+        with self.lock:
+            if max_bytes is not None:
+                # Entries set while there was no byte limit were not measured.
+                for key, value in self.data.items():
+                    if key not in self.sizes:
+                        self.sizes[key] = estimate_size(value)
+                        self.bytes += self.sizes[key]
+            return self._evict(max_entries, max_bytes)
+
+    def _remove(self, key) -> Any:
+        value = self.data.pop(key, None)
+        self.ttl.pop(key, None)
+        self.bytes -= self.sizes.pop(key, 0)
+        return value
+
+    def _evict(self, max_entries, max_bytes) -> List[Eviction]:
+        """Evict least recently used entries until the stripe is within its
+        limits. The lock must be held."""
+        evicted = []
+        while max_entries is not None and len(self.data) > max_entries:
+            key = next(iter(self.data))
+            evicted.append((key, self._remove(key), "max_entries"))
+            self.evictions["max_entries"] += 1
+        while max_bytes is not None and self.bytes > max_bytes:
+            key = next(iter(self.data))
+            evicted.append((key, self._remove(key), "max_bytes"))
+            self.evictions["max_bytes"] += 1
+        return evicted
+
+
+class _BaseCache(ABC):
+    """Limits, eviction listeners and metrics shared by the threaded and
+    asyncio caches, over one or more stripes of entries."""
+
+    def __init__(self, name: str, stripes: List[_Stripe]):
+        self.name = name
+        self._stripes = stripes
+        self.max_entries: Optional[int] = None
+        self.max_bytes: Optional[int] = None
+        self.default_ttl: Optional[float] = None
+        self.sweep_interval = DEFAULT_SWEEP_INTERVAL
+        self._eviction_callbacks: List[EvictionCallback] = []
+
+    def configure(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+        sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+    ) -> None:
+        """Set the cache's limits. Entries over a new limit are evicted now.
+
+        With several lock stripes, each stripe holds an equal share of the
+        limits and evicts its own least recently used entries.
+
+        Args:
+            max_entries: Maximum number of entries. None for no limit.
+            max_bytes: Maximum estimated size of all values. None for no limit.
+            default_ttl: Time to live in seconds of entries set without one.
+                None means they do not expire.
+            sweep_interval: Seconds between sweeps for expired entries.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+        max_entries, max_bytes = self._stripe_limits()
+        for stripe in self._stripes:
+            self._notify(stripe.limit(max_entries, max_bytes))
+        if default_ttl is not None:
+            self._start_sweeper()
+
+    def add_eviction_listener(self, callback: EvictionCallback) -> None:
+        """Register a function called as callback(key, value, reason) for
+        every entry the cache evicts, after the entry is gone."""
+        self._eviction_callbacks.append(callback)
+
+    def remove_eviction_listener(self, callback: EvictionCallback) -> None:
+        self._eviction_callbacks.remove(callback)
+
+    def metrics(self) -> Dict[str, Any]:
+        evictions = {"expired": 0, "max_entries": 0, "max_bytes": 0}
+        for stripe in self._stripes:
+            for reason, count in stripe.evictions.items():
+                evictions[reason] += count
+        return {
+            "entries": len(self),
+            "bytes": sum(stripe.bytes for stripe in self._stripes),
+            "with_ttl": sum(len(stripe.ttl) for stripe in self._stripes),
+            "evictions": evictions,
+        }
+
+    def __len__(self) -> int:
+        return sum(len(stripe.data) for stripe in self._stripes)
+
+    @property
+    def _cache_data(self) -> Dict[str, Any]:
+        """A snapshot of every entry."""
+        return {k: v for stripe in self._stripes for k, v in list(stripe.data.items())}
+
+    @property
+    def _ttl(self) -> Dict[str, float]:
+        """A snapshot of every entry's expiry time, on the monotonic clock."""
+        return {k: v for stripe in self._stripes for k, v in list(stripe.ttl.items())}
+
+    def _stripe(self, key: str) -> _Stripe:
+        if len(self._stripes) == 1:
+            return self._stripes[0]
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def _stripe_limits(self) -> Tuple[Optional[int], Optional[int]]:
+        count = len(self._stripes)
+        return tuple(
+            None if limit is None else -(-limit // count)
+            for limit in (self.max_entries, self.max_bytes)
+        )
+
+    def _set(self, key, value, ttl, size) -> List[Eviction]:
+        if size is None and self.max_bytes is not None:
+            size = estimate_size(value)
+        if ttl is None:
+            ttl = self.default_ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        evicted = self._stripe(key).set(key, value, expires_at, size, *self._stripe_limits())
+        if expires_at is not None:
+            self._start_sweeper()
+        return evicted
+
+    def _sweep(self) -> List[Eviction]:
+        now = time.monotonic()
+        evicted = []
+        for stripe in self._stripes:
+            evicted.extend(stripe.sweep(now))
+        return evicted
+
+    def _notify(self, evicted: List[Eviction]) -> None:
+        # Called without any stripe lock, so that callbacks may use the cache.
+        for key, value, reason in evicted:
+            for callback in list(self._eviction_callbacks):
+                callback(key, value, reason)
+
+    @abstractmethod
+    def _start_sweeper(self) -> None:
+        pass
+
+
+class CacheNamespace(_BaseCache):
+    """A thread-safe cache with its own keys, limits and listeners.
+
+    Get one by name with `InMemoryCache.namespace`. Keys are spread over
+    `lock_stripes` locks by hash, so threads using different keys mostly do
+    not wait for each other; the default of one lock keeps a single
+    least recently used order over all entries.
+
+    The cache is unbounded unless `configure` sets a maximum number of
+    entries or of bytes (as estimated by `estimate_size`, or given to
+    `set`); when either is exceeded, the least recently used entries are
+    evicted. Expired entries are removed when they are read, and by a
+    background thread that sweeps them periodically once a TTL is in use.
+    Eviction listeners are told about every entry the cache drops on its
+    own, on the thread that caused the eviction or on the sweeper thread.
+    """
+
+    def __init__(self, name: str, lock_stripes: int = 1):
+        super().__init__(name, [_Stripe(threading.Lock()) for _ in range(max(1, lock_stripes))])
+        self._sweeper: Optional[threading.Thread] = None
+        self._sweeper_lock = threading.Lock()
+        self._stop_sweeper = threading.Event()
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        size: Optional[int] = None,
+    ) -> None:
+        """Set a key-value pair.
+
+        Args:
+            key: The key for the data.
+            value: The data to store.
+            ttl: Time to live in seconds. If None, the configured default_ttl
+                applies, and without one data will not expire.
+            size: Size of the value in bytes, counted against max_bytes.
+                Estimated with estimate_size when not given.
+        """
+        self._notify(self._set(key, value, ttl, size))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get the value associated with a key.
+
+        Args:
+            key: The key for the data within the session.
+            default: The value to return if the session or key is not found.
+
+        Returns:
+            The cached value, or the default value if not found.
+        """
+        value, evicted = self._stripe(key).get(key, default, time.monotonic())
+        self._notify(evicted)
+        return value
+
+    def delete(self, key: str) -> None:
+        """Delete a specific key-value pair from a cache.
+
+        Args:
+            key: The key to delete.
+
+        Returns:
+            True if the key was found and deleted, False otherwise.
+        """
+        return self._stripe(key).delete(key)
+
+    def clear(self) -> bool:
+        """Remove all data.
+
+        Returns:
+            True if the data was cleared, False otherwise.
+        """
+        for stripe in self._stripes:
+            stripe.clear()
+        return True
+
+    def sweep(self) -> int:
+        """Remove the entries whose TTL has passed.
+
+        Returns:
+            The number of entries removed.
+        """
+        evicted = self._sweep()
+        self._notify(evicted)
+        return len(evicted)
+
+    def stop_sweeper(self) -> None:
+        """Stop the background sweeper; it restarts when a TTL is next set."""
+        with self._sweeper_lock:
+            self._stop_sweeper.set()
+            sweeper, self._sweeper = self._sweeper, None
+        if sweeper is not None and sweeper is not threading.current_thread():
+            sweeper.join()
+
+    def _start_sweeper(self) -> None:
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        with self._sweeper_lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._stop_sweeper.clear()
+            self._sweeper = threading.Thread(
+                target=self._run_sweeper, name=f"cache-{self.name}-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def _run_sweeper(self) -> None:
+        while not self._stop_sweeper.wait(self.sweep_interval):
+            self.sweep()
+
+
+class InMemoryCache(CacheNamespace):
     """A thread-safe Singleton class to manage cache data.
 
     Ensures only one instance of the cache exists across the application.
+    It is the "default" namespace; code that should not share its keys,
+    limits or lock can use its own with `InMemoryCache.namespace(name)`.
     """
 
     _instance: Optional["InMemoryCache"] = None
     _lock: threading.Lock = threading.Lock()
     _initialized: bool = False
+    _namespaces: Dict[str, CacheNamespace] = {}
 
     def __new__(cls):
         """Override __new__ to control instance creation (Singleton pattern).
@@ -38,72 +410,128 @@ class InMemoryCache:
         if not self._initialized:
             with self._lock:
                 if not self._initialized:
-                    # print("Initializing SessionCache storage")
-                    self._cache_data: Dict[str, Dict[str, Any]] = {}
-                    self._ttl: Dict[str, float] = {}
-                    self._data_lock: threading.Lock = threading.Lock()
+                    super().__init__("default")
                     self._initialized = True
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Set a key-value pair.
+    @classmethod
+    def namespace(cls, name: str, lock_stripes: int = 1) -> CacheNamespace:
+        """Get the cache namespace with the given name, creating it if needed.
 
         Args:
-            key: The key for the data.
-            value: The data to store.
-            ttl: Time to live in seconds. If None, data will not expire.
+            name: The namespace's name; "default" is the InMemoryCache itself.
+            lock_stripes: Number of locks its keys are spread over, if it is
+                created by this call.
+
+        Returns:
+            The process-wide CacheNamespace of that name.
         """
-        with self._data_lock:
-            self._cache_data[key] = value
+        if name == "default":
+            return cls()
+        with cls._lock:
+            if name not in cls._namespaces:
+                cls._namespaces[name] = CacheNamespace(name, lock_stripes)
+            return cls._namespaces[name]
 
-            if ttl is not None:
-                self._ttl[key] = time.time() + ttl
-            else:
-                if key in self._ttl:
-                    del self._ttl[key]
 
-    def get(self, key: str, default: Any = None) -> Any:
-        """Get the value associated with a key.
+class AsyncCache(_BaseCache):
+    """A cache for code running on one asyncio event loop.
 
-        Args:
-            key: The key for the data within the session.
-            default: The value to return if the session or key is not found.
+    It has the limits, TTLs and eviction listeners of InMemoryCache, but
+    takes no thread lock, so it never blocks the loop, and its expired
+    entries are swept by a task on the loop. `get_or_set` lets coroutines
+    that miss the same key wait for a single load. Instances are
+    independent, and must not be shared between threads or loops.
+    """
 
-        Returns:
-            The cached value, or the default value if not found.
-        """
-        with self._data_lock:
-            if key in self._ttl and time.time() > self._ttl[key]:
-                del self._cache_data[key]
-                del self._ttl[key]
-                return default
-            return self._cache_data.get(key, default)
+    def __init__(self, name: str = "async"):
+        super().__init__(name, [_Stripe(contextlib.nullcontext())])
+        self._sweeper: Optional[asyncio.Task] = None
+        self._loading: Dict[str, asyncio.Future] = {}
 
-    def delete(self, key: str) -> None:
-        """Delete a specific key-value pair from a cache.
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        size: Optional[int] = None,
+    ) -> None:
+        """Set a key-value pair, as InMemoryCache.set does."""
+        self._notify(self._set(key, value, ttl, size))
 
-        Args:
-            key: The key to delete.
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Get the value associated with a key, or default."""
+        value, evicted = self._stripes[0].get(key, default, time.monotonic())
+        self._notify(evicted)
+        return value
 
-        Returns:
-            True if the key was found and deleted, False otherwise.
+    async def get_or_set(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """Get the value of a key, or store and return the value of `load()`.
+
+        Coroutines that miss while a load of the same key is under way wait
+        for its result instead of loading again. If the load fails they all
+        get its exception, and nothing is stored.
         """
+        missing = object()
+        value = await self.get(key, missing)
+        if value is not missing:
+            return value
+        if key in self._loading:
+            return await asyncio.shield(self._loading[key])
+        future = self._loading[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await load()
+            await self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here, so it is not logged when nobody was waiting.
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._loading[key]
 
-        with self._data_lock:
-            if key in self._cache_data:
-                del self._cache_data[key]
-                if key in self._ttl:
-                    del self._ttl[key]
-                return True
-            return False
+    async def delete(self, key: str) -> bool:
+        """Delete a key; returns whether it was found."""
+        return self._stripes[0].delete(key)
 
-    def clear(self) -> bool:
-        """Remove all data.
+    async def clear(self) -> bool:
+        """Remove all data."""
+        self._stripes[0].clear()
+        return True
 
-        Returns:
-            True if the data was cleared, False otherwise.
-        """
-        with self._data_lock:
-            self._cache_data.clear()
-            self._ttl.clear()
-            return True
-        return False
+    async def sweep(self) -> int:
+        """Remove the entries whose TTL has passed; returns how many."""
+        evicted = self._sweep()
+        self._notify(evicted)
+        return len(evicted)
+
+    async def close(self) -> None:
+        """Stop the sweeper task; it restarts when a TTL is next set."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+
+    def _start_sweeper(self) -> None:
+        if self._sweeper is not None and not self._sweeper.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Configured outside the loop; the first set with a TTL starts it.
+            return
+        self._sweeper = loop.create_task(self._run_sweeper())
+
+    async def _run_sweeper(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            await self.sweep()
@@ -4,6 +4,7 @@ from starlette.responses import JSONResponse
 from starlette.requests import Request
 from typing import Any
 
+import asyncio
 import jwt
 import time
 import json
@@ -11,30 +12,42 @@ import hashlib
 import httpx
 import logging
 
-from jwt import PyJWK, PyJWKClient
+from jwt import PyJWK
+from jwt.utils import base64url_decode
 
 logger = logging.getLogger(__name__)
 AUTH_HEADER_PREFIX = 'Bearer '
 
-class PushNotificationAuth:
-    def _calculate_request_body_sha256(self, data: dict[str, Any]):
-        """Calculates the SHA256 hash of a request body.
+# JWS algorithm -> jwcrypto key generation parameters.
+SIGNING_ALGORITHMS = {
+    "RS256": {"kty": "RSA", "size": 2048},
+    "ES256": {"kty": "EC", "crv": "P-256"},
+    "EdDSA": {"kty": "OKP", "crv": "Ed25519"},
+}
 
-        This logic needs to be same for both the agent who signs the payload and the client verifier.
-        """
-        body_str = json.dumps(
+class PushNotificationAuth:
+    @staticmethod
+    def _serialize_request_body(data: dict[str, Any]) -> bytes:
+        return json.dumps(
             data,
             ensure_ascii=False,
             allow_nan=False,
             indent=None,
             separators=(",", ":"),
-        )
-        return hashlib.sha256(body_str.encode()).hexdigest()
+        ).encode()
+
+    def _calculate_request_body_sha256(self, data: dict[str, Any]):
+        """Calculates the SHA256 hash of a request body.
+
+        This logic needs to be same for both the agent who signs the payload and the client verifier.
+        """
+        return hashlib.sha256(self._serialize_request_body(data)).hexdigest()
 
 class PushNotificationSenderAuth(PushNotificationAuth):
     def __init__(self):
         self.public_keys = []
         self.private_key_jwk: PyJWK = None
+        self.algorithm = "RS256"
 
     @staticmethod
     async def verify_push_notification_url(url: str) -> bool:
@@ -55,10 +68,18 @@ class PushNotificationSenderAuth(PushNotificationAuth):
 
         return False
 
-    def generate_jwk(self):
-        key = jwk.JWK.generate(kty='RSA', size=2048, kid=str(uuid.uuid4()), use="sig")
+    def generate_jwk(self, algorithm: str = "RS256"):
+        """Generates the signing key. ES256 and EdDSA signatures are much
+        cheaper to produce than RS256 ones."""
+        if algorithm not in SIGNING_ALGORITHMS:
+            raise ValueError(f"Unsupported signing algorithm {algorithm}")
+
+        key = jwk.JWK.generate(
+            kid=str(uuid.uuid4()), use="sig", alg=algorithm, **SIGNING_ALGORITHMS[algorithm]
+        )
         self.public_keys.append(key.export_public(as_dict=True))
         self.private_key_jwk = PyJWK.from_json(key.export_private())
+        self.algorithm = algorithm
     
     def handle_jwks_endpoint(self, _request: Request):
         """Allow clients to fetch public keys.
@@ -67,8 +88,8 @@ class PushNotificationSenderAuth(PushNotificationAuth):
             "keys": self.public_keys
         })
     
-    def _generate_jwt(self, data: dict[str, Any]):
-        """JWT is generated by signing both the request payload SHA digest and time of token generation.
+    def _generate_jwt(self, body: bytes):
+        """JWT is generated by signing both the request body SHA digest and time of token generation.
 
         Payload is signed with private key and it ensures the integrity of payload for client.
         Including iat prevents from replay attack.
@@ -77,20 +98,34 @@ class PushNotificationSenderAuth(PushNotificationAuth):
         iat = int(time.time())
 
         return jwt.encode(
-            {"iat": iat, "request_body_sha256": self._calculate_request_body_sha256(data)},
+            {"iat": iat, "request_body_sha256": hashlib.sha256(body).hexdigest()},
             key=self.private_key_jwk,
             headers={"kid": self.private_key_jwk.key_id},
-            algorithm="RS256"
+            algorithm=self.algorithm
         )
 
-    async def send_push_notification(self, url: str, data: dict[str, Any]):
-        jwt_token = self._generate_jwt(data)
-        headers = {'Authorization': f"Bearer {jwt_token}"}
+    def encode_body(self, data: dict[str, Any] | bytes) -> bytes:
+        """Returns the exact bytes to sign and send. Callers that already have
+        the payload serialized (e.g. from `model_dump_json`) pass it as bytes
+        so it is not serialized a second time."""
+        if isinstance(data, bytes):
+            return data
+        return self._serialize_request_body(data)
+
+    def get_auth_headers(self, body: bytes) -> dict[str, str]:
+        return {
+            'Authorization': f"Bearer {self._generate_jwt(body)}",
+            'Content-Type': 'application/json',
+        }
+
+    async def send_push_notification(self, url: str, data: dict[str, Any] | bytes):
+        body = self.encode_body(data)
+        headers = self.get_auth_headers(body)
         async with httpx.AsyncClient(timeout=10) as client: 
             try:
                 response = await client.post(
                     url,
-                    json=data,
+                    content=body,
                     headers=headers
                 )
                 response.raise_for_status()
@@ -99,37 +134,129 @@ class PushNotificationSenderAuth(PushNotificationAuth):
                 logger.warning(f"Error during sending push-notification for URL {url}: {e}")
 
 class PushNotificationReceiverAuth(PushNotificationAuth):
-    def __init__(self):
+    """Verifies push notifications against the sender's JWKS.
+
+    Signing keys are decoded once and kept by kid. A token signed with an
+    unknown kid (e.g. after the sender rotated its key) re-fetches the JWKS,
+    at most once every `min_refresh_interval` seconds so that tokens with
+    made-up kids cannot make the receiver hammer the sender.
+    """
+
+    def __init__(
+        self,
+        min_refresh_interval: float = 30.0,
+        max_token_age: float = 60 * 5,
+        http_client: httpx.AsyncClient | None = None,
+    ):
         self.public_keys_jwks = []
-        self.jwks_client = None
+        self.http_client = http_client
+        self.jwks_url: str | None = None
+        self.signing_keys: dict[str, PyJWK] = {}
+        self.min_refresh_interval = min_refresh_interval
+        self.max_token_age = max_token_age
+        self.last_refresh: float | None = None
+        self.jwks_refreshes = 0
+        self._refresh_lock = asyncio.Lock()
 
     async def load_jwks(self, jwks_url: str):
-        self.jwks_client = PyJWKClient(jwks_url)
-    
-    async def verify_push_notification(self, request: Request) -> bool:
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith(AUTH_HEADER_PREFIX):
-            print("Invalid authorization header")
-            return False
-        
-        token = auth_header[len(AUTH_HEADER_PREFIX):]
-        signing_key = self.jwks_client.get_signing_key_from_jwt(token)
+        """Keys are fetched when the first notification arrives."""
+        self.jwks_url = jwks_url
+
+    def add_signing_keys(self, keys: list[dict[str, Any]]):
+        for key in keys:
+            try:
+                signing_key = PyJWK(key)
+            except jwt.PyJWKError as e:
+                logger.warning(f"Ignoring unusable signing key {key.get('kid')}: {e}")
+                continue
+            if signing_key.key_id and signing_key.key_id not in self.signing_keys:
+                self.public_keys_jwks.append(key)
+                self.signing_keys[signing_key.key_id] = signing_key
+
+    async def _refresh_jwks(self):
+        if self.http_client is not None:
+            response = await self.http_client.get(self.jwks_url)
+        else:
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.get(self.jwks_url)
+        response.raise_for_status()
+        self.last_refresh = time.monotonic()
+        self.jwks_refreshes += 1
+        self.add_signing_keys(response.json().get("keys", []))
+
+    async def _get_signing_key(self, kid: str | None) -> PyJWK:
+        signing_key = self.signing_keys.get(kid)
+        if signing_key is not None:
+            return signing_key
+
+        async with self._refresh_lock:
+            # Another notification may have refreshed the keys meanwhile.
+            if kid not in self.signing_keys and self.jwks_url and (
+                self.last_refresh is None
+                or time.monotonic() - self.last_refresh >= self.min_refresh_interval
+            ):
+                await self._refresh_jwks()
+        if kid not in self.signing_keys:
+            raise ValueError(f"Unknown signing key {kid}")
+        return self.signing_keys[kid]
+
+    @staticmethod
+    def _token_kid(token: str) -> str | None:
+        """The kid from the token header, read without a full parse as
+        jwt.decode will parse (and validate) the token anyway."""
+        try:
+            header = json.loads(base64url_decode(token.split(".", 1)[0]))
+        except ValueError as e:
+            raise jwt.DecodeError("Invalid header") from e
+        return header.get("kid") if isinstance(header, dict) else None
+
+    async def verify_push_notification_body(
+        self, body: bytes, authorization: str | None
+    ) -> dict[str, Any]:
+        """Verifies a notification from its raw body and Authorization header
+        and returns the parsed payload. Raises ValueError (or a jwt error) if
+        it is not authentic."""
+        if not authorization or not authorization.startswith(AUTH_HEADER_PREFIX):
+            raise ValueError("Invalid authorization header")
+
+        token = authorization[len(AUTH_HEADER_PREFIX):]
+        signing_key = await self._get_signing_key(self._token_kid(token))
 
         decode_token = jwt.decode(
             token,
             signing_key,
             options={"require": ["iat", "request_body_sha256"]},
-            algorithms=["RS256"],
+            algorithms=[signing_key.algorithm_name],
         )
 
-        actual_body_sha256 = self._calculate_request_body_sha256(await request.json())
-        if actual_body_sha256 != decode_token["request_body_sha256"]:
+        if time.time() - decode_token["iat"] > self.max_token_age:
+            # Do not allow old push-notifications. This is to prevent replay attack.
+            raise ValueError("Token is expired")
+
+        # Senders sign the bytes they send; older senders signed a compact
+        # re-serialization of the payload, which is accepted as well.
+        data = json.loads(body)
+        if (
+            hashlib.sha256(body).hexdigest() != decode_token["request_body_sha256"]
+            and self._calculate_request_body_sha256(data) != decode_token["request_body_sha256"]
+        ):
             # Payload signature does not match the digest in signed token.
             raise ValueError("Invalid request body")
-        
-        if time.time() - decode_token["iat"] > 60 * 5:
-            # Do not allow push-notifications older than 5 minutes.
-            # This is to prevent replay attack.
-            raise ValueError("Token is expired")
-        
+
+        return data
+
+    async def read_push_notification(self, request: Request) -> dict[str, Any]:
+        """Verifies the notification in `request` and returns its payload, so
+        that handlers do not parse the body a second time."""
+        return await self.verify_push_notification_body(
+            await request.body(), request.headers.get("Authorization")
+        )
+
+    async def verify_push_notification(self, request: Request) -> bool:
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith(AUTH_HEADER_PREFIX):
+            print("Invalid authorization header")
+            return False
+
+        await self.read_push_notification(request)
         return True
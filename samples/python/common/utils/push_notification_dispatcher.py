@@ -0,0 +1,215 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+from common.utils.push_notification_auth import PushNotificationSenderAuth
+import asyncio
+import httpx
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PushNotification:
+    task_id: str
+    url: str
+    body: bytes
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+    headers: dict[str, str] | None = None
+    signed_at: float = 0.0
+
+
+class PushNotificationDispatcher:
+    """Delivers push notifications in the background.
+
+    `enqueue` never waits on the network: notifications are queued (at most
+    `max_queue_size` across all tasks; further ones are dropped and counted)
+    and sent by `workers` background tasks. Notifications for the same task
+    are delivered one at a time in the order they were enqueued, while
+    different tasks are delivered concurrently. Every destination origin gets
+    its own keep-alive connection pool. Transport errors, 429 and 5xx
+    responses are retried with exponential backoff and jitter up to
+    `max_attempts` times; other failures are not retried. Retries reuse the
+    notification's signature while it is younger than `resign_after` seconds,
+    well inside the 5 minutes receivers accept.
+    """
+
+    def __init__(
+        self,
+        sender_auth: PushNotificationSenderAuth,
+        max_queue_size: int = 10_000,
+        workers: int = 16,
+        max_attempts: int = 5,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 10.0,
+        max_connections_per_destination: int = 10,
+        latency_samples: int = 1024,
+        resign_after: float = 60.0,
+    ):
+        self.sender_auth = sender_auth
+        self.max_queue_size = max_queue_size
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.resign_after = resign_after
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_destination,
+            max_keepalive_connections=max_connections_per_destination,
+        )
+        # Task id -> notifications waiting to be sent, oldest first. A task id
+        # is in `ready` or being delivered exactly when its deque is non-empty.
+        self.pending: dict[str, deque[PushNotification]] = {}
+        self.pending_count = 0
+        self.ready: asyncio.Queue[str] = asyncio.Queue()
+        self.clients: dict[tuple[str, str], httpx.AsyncClient] = {}
+        self.worker_tasks: list[asyncio.Task] = []
+        self.closed = False
+        self.delivered = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+        self.latencies: deque[float] = deque(maxlen=latency_samples)
+
+    def start(self) -> None:
+        if self.worker_tasks:
+            return
+        self.worker_tasks = [
+            asyncio.create_task(self._run_worker()) for _ in range(self.workers)
+        ]
+
+    async def close(self, drain_timeout: float = 5.0) -> None:
+        """Stops accepting notifications, waits up to `drain_timeout` seconds
+        for queued ones to be delivered and closes all connections."""
+        self.closed = True
+        if self.worker_tasks and self.pending:
+            try:
+                await asyncio.wait_for(self.ready.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Dropping {self.pending_count} undelivered push notifications on shutdown"
+                )
+        for worker in self.worker_tasks:
+            worker.cancel()
+        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        self.worker_tasks = []
+        await asyncio.gather(*(client.aclose() for client in self.clients.values()))
+        self.clients.clear()
+
+    def enqueue(self, task_id: str, url: str, data: dict[str, Any] | bytes) -> bool:
+        """Queues a notification; returns False if it was dropped.
+
+        `data` is serialized right away, so later changes to the task do not
+        leak into it; pass the output of `model_dump_json` to skip that step.
+        """
+        if self.closed or self.pending_count >= self.max_queue_size:
+            self.dropped += 1
+            logger.warning(f"Dropping push notification for task {task_id}")
+            return False
+
+        self.start()
+        self.pending_count += 1
+        notification = PushNotification(task_id, url, self.sender_auth.encode_body(data))
+        queue = self.pending.get(task_id)
+        if queue is None:
+            self.pending[task_id] = deque([notification])
+            self.ready.put_nowait(task_id)
+        else:
+            queue.append(notification)
+        return True
+
+    async def _run_worker(self):
+        while True:
+            task_id = await self.ready.get()
+            try:
+                queue = self.pending[task_id]
+                await self._deliver(queue[0])
+                queue.popleft()
+                self.pending_count -= 1
+                if queue:
+                    self.ready.put_nowait(task_id)
+                else:
+                    del self.pending[task_id]
+            finally:
+                self.ready.task_done()
+
+    async def _deliver(self, notification: PushNotification) -> None:
+        while True:
+            notification.attempts += 1
+            try:
+                response = await self._client(notification.url).post(
+                    notification.url,
+                    content=notification.body,
+                    headers=self._sign(notification),
+                )
+                if response.status_code != 429 and response.status_code < 500:
+                    response.raise_for_status()
+                    self.delivered += 1
+                    self.latencies.append(time.monotonic() - notification.enqueued_at)
+                    return
+                error = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                error = repr(e)
+            except Exception as e:
+                self.failed += 1
+                logger.warning(
+                    f"Error during sending push-notification for URL {notification.url}: {e}"
+                )
+                return
+
+            if notification.attempts >= self.max_attempts:
+                self.failed += 1
+                logger.warning(
+                    f"Giving up on push-notification for URL {notification.url} "
+                    f"after {notification.attempts} attempts: {error}"
+                )
+                return
+
+            self.retried += 1
+            backoff = min(
+                self.max_backoff, self.initial_backoff * 2 ** (notification.attempts - 1)
+            )
+            await asyncio.sleep(random.uniform(backoff / 2, backoff))
+
+    def _sign(self, notification: PushNotification) -> dict[str, str]:
+        now = time.monotonic()
+        if notification.headers is None or now - notification.signed_at > self.resign_after:
+            notification.headers = self.sender_auth.get_auth_headers(notification.body)
+            notification.signed_at = now
+        return notification.headers
+
+    def _client(self, url: str) -> httpx.AsyncClient:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        client = self.clients.get(key)
+        if client is None:
+            client = self.clients[key] = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits
+            )
+        return client
+
+    def metrics(self) -> dict[str, Any]:
+        """Point-in-time delivery counters; latencies are from enqueue to a
+        successful response, over the most recent deliveries."""
+        latencies = sorted(self.latencies)
+
+        def percentile(pct: float) -> float | None:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(pct / 100 * len(latencies)))]
+
+        return {
+            "push_notifications_pending": self.pending_count,
+            "push_notifications_delivered": self.delivered,
+            "push_notifications_failed": self.failed,
+            "push_notifications_retried": self.retried,
+            "push_notifications_dropped": self.dropped,
+            "push_notification_latency_p50": percentile(50),
+            "push_notification_latency_p99": percentile(99),
+        }
@@ -0,0 +1,238 @@
+"""Binary encodings of A2A JSON-RPC messages, negotiated through the
+Content-Type and Accept headers.
+
+JSON stays the default. MessagePack (`msgpack`) and CBOR (`cbor2`) are
+optional dependencies: a format is only offered when its package is
+installed. Both carry the content of file parts as raw bytes instead of
+base64 text; decoding turns it back into the base64 string that
+`FileContent.bytes` holds, so decoded messages validate like JSON ones.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any
+import base64
+import struct
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Serialization context under which FileContent dumps its bytes as FileBytes.
+BINARY_CONTEXT = {"binary_file_bytes": True}
+
+# MessagePack extension type of file bytes.
+FILE_BYTES_EXT_TYPE = 1
+# CBOR tag 22: "expected conversion to base64 encoding" (RFC 8949).
+FILE_BYTES_CBOR_TAG = 22
+
+# Streamed messages are each prefixed with their length, and the response's
+# content type carries this parameter.
+FRAME_HEADER = struct.Struct(">I")
+STREAM_PARAMETER = "stream=length-prefixed"
+
+
+class WireFormatDecodeError(ValueError):
+    pass
+
+
+class FileBytes:
+    """Raw file content, for binary formats to encode natively."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+class WireFormat(ABC):
+    name: str
+    media_type: str
+    # Other media types the format is known by.
+    aliases: tuple[str, ...] = ()
+
+    @property
+    def stream_media_type(self) -> str:
+        """Content type of a stream of length-prefixed messages."""
+        return f"{self.media_type}; {STREAM_PARAMETER}"
+
+    @abstractmethod
+    def encode(self, data: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def _decode(self, body: bytes) -> Any:
+        pass
+
+    def decode(self, body: bytes) -> Any:
+        try:
+            return self._decode(body)
+        except Exception as e:
+            raise WireFormatDecodeError(f"Invalid {self.name} body: {e}") from e
+
+    def dump(self, model: BaseModel | list[BaseModel], **kwargs) -> bytes:
+        if isinstance(model, list):
+            return self.encode([m.model_dump(context=BINARY_CONTEXT, **kwargs) for m in model])
+        return self.encode(model.model_dump(context=BINARY_CONTEXT, **kwargs))
+
+    def frame(self, data: Any) -> bytes:
+        body = self.encode(data)
+        return FRAME_HEADER.pack(len(body)) + body
+
+
+class MessagePackFormat(WireFormat):
+    name = "msgpack"
+    media_type = "application/msgpack"
+    aliases = ("application/x-msgpack", "application/vnd.msgpack")
+
+    def __init__(self):
+        import msgpack
+
+        self._packer = msgpack.Packer(default=self._default)
+        self._unpackb = msgpack.unpackb
+        self._ext_type = msgpack.ExtType
+
+    def _default(self, obj: Any) -> Any:
+        if isinstance(obj, FileBytes):
+            return self._ext_type(FILE_BYTES_EXT_TYPE, obj.data)
+        return to_jsonable_python(obj)
+
+    @staticmethod
+    def _ext_hook(code: int, data: bytes) -> Any:
+        if code == FILE_BYTES_EXT_TYPE:
+            return base64.b64encode(data).decode()
+        raise ValueError(f"Unknown MessagePack extension type {code}")
+
+    def encode(self, data: Any) -> bytes:
+        return self._packer.pack(data)
+
+    def _decode(self, body: bytes) -> Any:
+        return self._unpackb(body, ext_hook=self._ext_hook)
+
+
+class CBORFormat(WireFormat):
+    name = "cbor"
+    media_type = "application/cbor"
+
+    def __init__(self):
+        import cbor2
+
+        self._dumps = cbor2.dumps
+        self._loads = cbor2.loads
+        self._tag = cbor2.CBORTag
+
+    def _default(self, encoder, obj: Any) -> None:
+        if isinstance(obj, FileBytes):
+            encoder.encode(self._tag(FILE_BYTES_CBOR_TAG, obj.data))
+        else:
+            encoder.encode(to_jsonable_python(obj))
+
+    @staticmethod
+    def _decode_file_bytes(value: bytes, immutable: bool) -> str:
+        return base64.b64encode(value).decode()
+
+    def encode(self, data: Any) -> bytes:
+        return self._dumps(data, default=self._default)
+
+    def _decode(self, body: bytes) -> Any:
+        return self._loads(
+            body, semantic_decoders={FILE_BYTES_CBOR_TAG: self._decode_file_bytes}
+        )
+
+
+WIRE_FORMATS: dict[str, type[WireFormat]] = {
+    MessagePackFormat.name: MessagePackFormat,
+    CBORFormat.name: CBORFormat,
+}
+
+_available: dict[str, WireFormat] | None = None
+
+
+def available_wire_formats() -> dict[str, WireFormat]:
+    """Binary formats whose packages are installed, by media type."""
+    global _available
+    if _available is None:
+        _available = {}
+        for format_type in WIRE_FORMATS.values():
+            try:
+                wire_format = format_type()
+            except ImportError:
+                continue
+            for media_type in (format_type.media_type, *format_type.aliases):
+                _available[media_type] = wire_format
+    return _available
+
+
+def get_wire_format(name: str) -> WireFormat:
+    """The format called `name` ("msgpack" or "cbor")."""
+    if name not in WIRE_FORMATS:
+        raise ValueError(f"Unknown wire format {name}; expected one of {list(WIRE_FORMATS)}")
+    try:
+        return WIRE_FORMATS[name]()
+    except ImportError as e:
+        raise ImportError(f"The {name} wire format requires the {e.name} package") from e
+
+
+def _media_type(header_value: str) -> str:
+    return header_value.split(";", 1)[0].strip().lower()
+
+
+def is_stream_content_type(content_type: str | None) -> bool:
+    return bool(content_type) and STREAM_PARAMETER in content_type.replace(" ", "")
+
+
+def iter_frames(buffer: bytearray):
+    """Removes and yields the complete frames at the start of `buffer`."""
+    while len(buffer) >= FRAME_HEADER.size:
+        (size,) = FRAME_HEADER.unpack_from(buffer)
+        end = FRAME_HEADER.size + size
+        if len(buffer) < end:
+            return
+        frame = bytes(buffer[FRAME_HEADER.size:end])
+        del buffer[:end]
+        yield frame
+
+
+def wire_format_for_content_type(content_type: str | None) -> WireFormat | None:
+    """The binary format a body is in; None for JSON, which is assumed for
+    any other media type. Raises ValueError for a binary format whose
+    package is not installed."""
+    if not content_type:
+        return None
+    media_type = _media_type(content_type)
+    wire_format = available_wire_formats().get(media_type)
+    if wire_format is None and any(
+        media_type in (format_type.media_type, *format_type.aliases)
+        for format_type in WIRE_FORMATS.values()
+    ):
+        raise ValueError(f"Unsupported media type {media_type}")
+    return wire_format
+
+
+def negotiate_wire_format(accept: str | None) -> WireFormat | None:
+    """The binary format to answer in, as preferred by the Accept header;
+    None for JSON. Media types are taken in the order listed unless
+    q-values say otherwise."""
+    if not accept:
+        return None
+    candidates = []
+    for index, entry in enumerate(accept.split(",")):
+        media_type, *params = entry.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        candidates.append((-quality, index, media_type.strip().lower()))
+    for quality, _, media_type in sorted(candidates):
+        if quality == 0:
+            break
+        if media_type == JSON_MEDIA_TYPE:
+            return None
+        wire_format = available_wire_formats().get(media_type)
+        if wire_format is not None:
+            return wire_format
+    return None
@@ -6,7 +6,7 @@ import urllib
 from uuid import uuid4
 
 from common.client import A2AClient, A2ACardResolver
-from common.types import TaskState, Task, TextPart, FilePart, FileContent
+from common.types import TaskState, Task, TextPart, FilePart, FileContent, A2AClientHTTPError
 from common.utils.push_notification_auth import PushNotificationReceiverAuth
 
 
@@ -16,9 +16,15 @@ from common.utils.push_notification_auth import PushNotificationReceiverAuth
 @click.option("--history", default=False)
 @click.option("--use_push_notifications", default=False)
 @click.option("--push_notification_receiver", default="http://localhost:5000")
-async def cli(agent, session, history, use_push_notifications: bool, push_notification_receiver: str):
+@click.option(
+    "--upload_threshold",
+    type=int,
+    default=None,
+    help="Upload attached files larger than this many bytes to the agent's /blobs endpoint",
+)
+async def cli(agent, session, history, use_push_notifications: bool, push_notification_receiver: str, upload_threshold: int | None):
     card_resolver = A2ACardResolver(agent)
-    card = card_resolver.get_agent_card()
+    card = await card_resolver.get_agent_card_async()
 
     print("======= Agent Card ========")
     print(card.model_dump_json(exclude_none=True))
@@ -39,7 +45,7 @@ async def cli(agent, session, history, use_push_notifications: bool, push_notifi
         )
         push_notification_listener.start()
         
-    client = A2AClient(agent_card=card)
+    client = A2AClient(agent_card=card, upload_threshold=upload_threshold)
     if session == 0:
         sessionId = uuid4().hex
     else:
@@ -58,6 +64,27 @@ async def cli(agent, session, history, use_push_notifications: bool, push_notifi
             task_response = await client.get_task({"id": taskId, "historyLength": 10})
             print(task_response.model_dump_json(include={"result": {"history": True}}))
 
+    await client.close()
+
+async def attach_file(client: A2AClient, file_path: str) -> dict:
+    """Streams large files to the agent's blob endpoint; small ones, and
+    any file for agents without the endpoint, are sent inline."""
+    if (
+        client.upload_threshold is not None
+        and client.blob_uploads_supported
+        and os.path.getsize(file_path) > client.upload_threshold
+    ):
+        try:
+            file_content = await client.upload_file(file_path)
+            return file_content.model_dump(exclude_none=True)
+        except A2AClientHTTPError as e:
+            print(f"Could not upload {file_path} ({e}), sending it inline")
+            client.blob_uploads_supported = False
+
+    with open(file_path, "rb") as f:
+        file_content = base64.b64encode(f.read()).decode('utf-8')
+    return {"name": os.path.basename(file_path), "bytes": file_content}
+
 async def completeTask(client: A2AClient, streaming, use_push_notifications: bool, notification_receiver_host: str, notification_receiver_port: int, taskId, sessionId):
     prompt = click.prompt(
         "\nWhat do you want to send to the agent? (:q or quit to exit)"
@@ -81,17 +108,10 @@ async def completeTask(client: A2AClient, streaming, use_push_notifications: boo
         show_default=False,
     )
     if file_path and file_path.strip() != "":
-        with open(file_path, "rb") as f:
-            file_content = base64.b64encode(f.read()).decode('utf-8')
-            file_name = os.path.basename(file_path)
-        
         message["parts"].append(
             {
                 "type": "file",
-                "file": {
-                    "name": file_name,
-                    "bytes": file_content,
-                }
+                "file": await attach_file(client, file_path),
             }
         )
  
@@ -115,6 +135,8 @@ async def completeTask(client: A2AClient, streaming, use_push_notifications: boo
         response_stream = client.send_task_streaming(payload)
         async for result in response_stream:
             print(f"stream event => {result.model_dump_json(exclude_none=True)}")
+        if response_stream.reconnects:
+            print(f"stream reconnected {response_stream.reconnects} time(s)")
         taskResult = await client.get_task({"id": taskId})
     else:
         taskResult = await client.send_task(payload)
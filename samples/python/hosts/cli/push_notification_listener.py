@@ -1,5 +1,8 @@
 import asyncio
 import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable
 
 from common.utils.push_notification_auth import PushNotificationReceiverAuth
 
@@ -7,66 +10,205 @@ from starlette.applications import Starlette
 from starlette.requests import Request
 from starlette.responses import Response
 
+import logging
 import traceback
 
+logger = logging.getLogger(__name__)
+
+NotificationConsumer = Callable[[list[dict[str, Any]]], Awaitable[None]]
+
+
+async def print_notifications(notifications: list[dict[str, Any]]):
+    for data in notifications:
+        print(f"\npush notification received => \n{data}\n")
+
+
 class PushNotificationListener():
-    def __init__(self, host, port, notification_receiver_auth: PushNotificationReceiverAuth):
+    """Receives push notifications and hands them to `consumer` in batches.
+
+    Each notification is verified, then dropped if a notification with the
+    same (task id, status timestamp) was already accepted, and queued. At
+    most `max_queue_size` notifications are queued; further ones are
+    answered with 503 so the sender retries them later. A background task
+    passes queued notifications to `consumer` in batches of up to
+    `batch_size`, waiting at most `batch_interval` seconds to fill a batch.
+
+    `serve()` runs the server in the caller's event loop; `start()` runs it
+    on a private thread, as the CLI does while it is blocked on user input.
+    """
+
+    def __init__(
+        self,
+        host,
+        port,
+        notification_receiver_auth: PushNotificationReceiverAuth,
+        consumer: NotificationConsumer = print_notifications,
+        max_queue_size: int = 10_000,
+        batch_size: int = 100,
+        batch_interval: float = 0.05,
+        dedupe_window: int = 100_000,
+        latency_samples: int = 1024,
+    ):
         self.host = host
         self.port = port
         self.notification_receiver_auth = notification_receiver_auth
-        self.loop = asyncio.new_event_loop()
-        self.thread = threading.Thread(
-            target=lambda loop: loop.run_forever(), args=(self.loop,)
+        self.consumer = consumer
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.dedupe_window = dedupe_window
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(max_queue_size)
+        # (task id, status timestamp) of the most recently accepted notifications.
+        self.seen: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self.verify_latencies: deque[float] = deque(maxlen=latency_samples)
+        self.received = 0
+        self.accepted = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.batches = 0
+        self.started_at: float | None = None
+        self.server = None
+        self.loop = None
+
+        self.app = Starlette()
+        self.app.add_route(
+            "/notify", self.handle_notification, methods=["POST"]
+        )
+        self.app.add_route(
+            "/notify", self.handle_validation_check, methods=["GET"]
         )
-        self.thread.daemon = True
-        self.thread.start()
 
     def start(self):
         try:
             # Need to start server in separate thread as current thread
             # will be blocked when it is waiting on user prompt.
-            asyncio.run_coroutine_threadsafe(
-                self.start_server(),
-                self.loop,
+            self.loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=lambda loop: loop.run_forever(), args=(self.loop,)
             )
+            thread.daemon = True
+            thread.start()
+            asyncio.run_coroutine_threadsafe(self.serve(), self.loop)
             print("======= push notification listener started =======")
         except Exception as e:
             print(e)
 
-    async def start_server(self):
+    async def serve(self):
         import uvicorn
 
-        self.app = Starlette()
-        self.app.add_route(
-            "/notify", self.handle_notification, methods=["POST"]
-        )
-        self.app.add_route(
-            "/notify", self.handle_validation_check, methods=["GET"]
-        )
-        
         config = uvicorn.Config(self.app, host=self.host, port = self.port, log_level="critical")
         self.server = uvicorn.Server(config)
-        await self.server.serve()
-    
+        worker = asyncio.create_task(self.deliver_batches())
+        try:
+            await self.server.serve()
+        finally:
+            await self.queue.join()
+            worker.cancel()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.should_exit = True
+
     async def handle_validation_check(self, request: Request):
         validation_token = request.query_params.get("validationToken")
         print(f"\npush notification verification received => \n{validation_token}\n")
 
         if not validation_token:
             return Response(status_code=400)
-            
+
         return Response(content=validation_token, status_code=200)
-    
+
     async def handle_notification(self, request: Request):
-        data = await request.json()
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        self.received += 1
+
+        start = time.perf_counter()
         try:
-            if not await self.notification_receiver_auth.verify_push_notification(request):
-                print("push notification verification failed")
-                return
+            data = await self.notification_receiver_auth.read_push_notification(request)
         except Exception as e:
-            print(f"error verifying push notification: {e}")
-            print(traceback.format_exc())
-            return
-            
-        print(f"\npush notification received => \n{data}\n")
+            self.rejected += 1
+            logger.warning(f"error verifying push notification: {e}")
+            logger.debug(traceback.format_exc())
+            return Response(status_code=401)
+        self.verify_latencies.append(time.perf_counter() - start)
+
+        key = self._dedupe_key(data)
+        if key is not None and key in self.seen:
+            self.duplicates += 1
+            return Response(status_code=200)
+
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return Response(status_code=503, headers={"Retry-After": "1"})
+
+        self.accepted += 1
+        if key is not None:
+            self.seen[key] = None
+            if len(self.seen) > self.dedupe_window:
+                self.seen.popitem(last=False)
         return Response(status_code=200)
+
+    @staticmethod
+    def _dedupe_key(data: dict[str, Any]) -> tuple[str, str] | None:
+        status = data.get("status")
+        timestamp = status.get("timestamp") if isinstance(status, dict) else None
+        if "id" not in data or timestamp is None:
+            # Nothing to tell a redelivery from a new update.
+            return None
+        return data["id"], timestamp
+
+    async def deliver_batches(self):
+        while True:
+            batch = [await self.queue.get()]
+            deadline = time.monotonic() + self.batch_interval
+            while len(batch) < self.batch_size:
+                if self.queue.empty():
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self.queue.get_nowait())
+
+            try:
+                await self.consumer(batch)
+                self.delivered += len(batch)
+                self.batches += 1
+            except Exception as e:
+                logger.error(f"push notification consumer failed on {len(batch)} notifications: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def metrics(self) -> dict[str, Any]:
+        """Point-in-time ingestion counters. The ingest rate is accepted
+        notifications per second since the first one arrived; verify
+        latencies are over the most recent notifications."""
+        latencies = sorted(self.verify_latencies)
+
+        def percentile(pct: float) -> float | None:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(pct / 100 * len(latencies)))]
+
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0
+        return {
+            "push_notifications_received": self.received,
+            "push_notifications_accepted": self.accepted,
+            "push_notifications_duplicate": self.duplicates,
+            "push_notifications_rejected": self.rejected,
+            "push_notifications_dropped": self.dropped,
+            "push_notifications_queued": self.queue.qsize(),
+            "push_notifications_delivered": self.delivered,
+            "push_notification_batches": self.batches,
+            "push_notification_ingest_rate": self.accepted / elapsed if elapsed else None,
+            "push_notification_verify_latency_p50": percentile(50),
+            "push_notification_verify_latency_p99": percentile(99),
+        }
@@ -3,11 +3,11 @@ import asyncio
 import functools
 import json
 import uuid
+from urllib.parse import urlparse
 import threading
 from typing import List, Optional, Callable
 
 from google.genai import types
-import base64
 
 from google.adk import Agent
 from google.adk.agents.invocation_context import InvocationContext
@@ -18,7 +18,7 @@ from .remote_agent_connection import (
     RemoteAgentConnections,
     TaskUpdateCallback
 )
-from common.client import A2ACardResolver
+from common.client import CircuitState, ResiliencePolicy, get_agent_cards
 from common.types import (
     AgentCard,
     Message,
@@ -30,6 +30,7 @@ from common.types import (
     Part,
     TaskStatusUpdateEvent,
 )
+from common.utils.file_content import read_file_content
 
 
 class HostAgent:
@@ -42,24 +43,35 @@ class HostAgent:
   def __init__(
       self,
       remote_agent_addresses: List[str],
-      task_callback: TaskUpdateCallback | None = None
+      task_callback: TaskUpdateCallback | None = None,
+      resilience: ResiliencePolicy | None = None,
   ):
     self.task_callback = task_callback
+    self.resilience = resilience
     self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
     self.cards: dict[str, AgentCard] = {}
-    for address in remote_agent_addresses:
-      card_resolver = A2ACardResolver(address)
-      card = card_resolver.get_agent_card()
-      remote_connection = RemoteAgentConnections(card)
-      self.remote_agent_connections[card.name] = remote_connection
-      self.cards[card.name] = card
-    agent_info = []
-    for ra in self.list_remote_agents():
-      agent_info.append(json.dumps(ra))
-    self.agents = '\n'.join(agent_info)
+    self.agents = ''
+    if remote_agent_addresses:
+      # Without a running loop (e.g. agent.py at import time); async code
+      # should use `create` instead.
+      for card in asyncio.run(get_agent_cards(remote_agent_addresses)):
+        self.register_agent_card(card)
+
+  @classmethod
+  async def create(
+      cls,
+      remote_agent_addresses: List[str],
+      task_callback: TaskUpdateCallback | None = None,
+      resilience: ResiliencePolicy | None = None,
+  ) -> "HostAgent":
+    """Creates a host agent, resolving the agents' cards concurrently."""
+    host = cls([], task_callback, resilience)
+    for card in await get_agent_cards(remote_agent_addresses):
+      host.register_agent_card(card)
+    return host
 
   def register_agent_card(self, card: AgentCard):
-    remote_connection = RemoteAgentConnections(card)
+    remote_connection = RemoteAgentConnections(card, self.resilience)
     self.remote_agent_connections[card.name] = remote_connection
     self.cards[card.name] = card
     agent_info = []
@@ -105,7 +117,7 @@ Focus on the most recent parts of the conversation primarily.
 If there is an active agent, send the request to that agent with the update task tool.
 
 Agents:
-{self.agents}
+{self._describe_agents()}
 
 Current agent: {current_agent['active_agent']}
 """
@@ -133,11 +145,24 @@ Current agent: {current_agent['active_agent']}
 
     remote_agent_info = []
     for card in self.cards.values():
+      # Agents whose circuit breaker is open are left out until it recovers.
+      if not self.remote_agent_connections[card.name].is_available():
+        continue
       remote_agent_info.append(
           {"name": card.name, "description": card.description}
       )
     return remote_agent_info
 
+  def get_circuit_states(self) -> dict[str, CircuitState]:
+    """Circuit breaker state of every remote agent, by agent name."""
+    return {
+        name: connection.circuit_state
+        for name, connection in self.remote_agent_connections.items()
+    }
+
+  def _describe_agents(self) -> str:
+    return '\n'.join(json.dumps(ra) for ra in self.list_remote_agents())
+
   async def send_task(
       self,
       agent_name: str,
@@ -211,19 +236,19 @@ Current agent: {current_agent['active_agent']}
     response = []
     if task.status.message:
       # Assume the information is in the task message.
-      response.extend(convert_parts(task.status.message.parts, tool_context))
+      response.extend(await convert_parts(task.status.message.parts, tool_context, card))
     if task.artifacts:
       for artifact in task.artifacts:
-        response.extend(convert_parts(artifact.parts, tool_context))
+        response.extend(await convert_parts(artifact.parts, tool_context, card))
     return response
 
-def convert_parts(parts: list[Part], tool_context: ToolContext):
+async def convert_parts(parts: list[Part], tool_context: ToolContext, card: AgentCard):
   rval = []
   for p in parts:
-    rval.append(convert_part(p, tool_context))
+    rval.append(await convert_part(p, tool_context, card))
   return rval
 
-def convert_part(part: Part, tool_context: ToolContext):
+async def convert_part(part: Part, tool_context: ToolContext, card: AgentCard):
   if part.type == "text":
     return part.text
   elif part.type == "data":
@@ -232,7 +257,11 @@ def convert_part(part: Part, tool_context: ToolContext):
     # Repackage A2A FilePart to google.genai Blob
     # Currently not considering plain text as files    
     file_id = part.file.name
-    file_bytes = base64.b64decode(part.file.bytes)    
+    # Files sent by uri are on the remote agent's server, which the model
+    # cannot reach, so they are downloaded and passed inline too. Only that
+    # agent's own server is trusted to serve them.
+    agent_host = urlparse(card.url).netloc.lower()
+    file_bytes = await read_file_content(part.file, allowed_hosts={agent_host})
     file_part = types.Part(
       inline_data=types.Blob(
         mime_type=part.file.mimeType,
@@ -1,3 +1,4 @@
+from contextlib import aclosing
 from typing import Callable
 import uuid
 from common.types import (
@@ -9,7 +10,7 @@ from common.types import (
     TaskStatus,
     TaskState,
 )
-from common.client import A2AClient
+from common.client import A2AClient, CircuitState, ResiliencePolicy
 
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
@@ -17,8 +18,12 @@ TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 class RemoteAgentConnections:
   """A class to hold the connections to the remote agents."""
 
-  def __init__(self, agent_card: AgentCard):
-    self.agent_client = A2AClient(agent_card)
+  def __init__(
+      self,
+      agent_card: AgentCard,
+      resilience: ResiliencePolicy | None = None,
+  ):
+    self.agent_client = A2AClient(agent_card, resilience=resilience)
     self.card = agent_card
 
     self.conversation_name = None
@@ -28,6 +33,14 @@ class RemoteAgentConnections:
   def get_agent(self) -> AgentCard:
     return self.card
 
+  @property
+  def circuit_state(self) -> CircuitState:
+    return self.agent_client.circuit_state
+
+  def is_available(self) -> bool:
+    """False while the agent's circuit breaker is open."""
+    return self.circuit_state != CircuitState.OPEN
+
   async def send_task(
       self,
       request: TaskSendParams,
@@ -45,24 +58,29 @@ class RemoteAgentConnections:
             ),
             history=[request.message],
         ), self.card)
-      async for response in self.agent_client.send_task_streaming(request.model_dump()):
-        merge_metadata(response.result, request)
-        # For task status updates, we need to propagate metadata and provide
-        # a unique message id.
-        if (hasattr(response.result, 'status') and
-            hasattr(response.result.status, 'message') and
-            response.result.status.message):
-          merge_metadata(response.result.status.message, request.message)
-          m = response.result.status.message
-          if not m.metadata:
-            m.metadata = {}
-          if 'message_id' in m.metadata:
-            m.metadata['last_message_id'] = m.metadata['message_id']
-          m.metadata['message_id'] = str(uuid.uuid4())
-        if task_callback:
-          task = task_callback(response.result, self.card)
-        if hasattr(response.result, 'final') and response.result.final:
-          break
+      # Close the stream as soon as we stop reading so its connection goes
+      # back to the pool.
+      async with aclosing(
+          self.agent_client.send_task_streaming(request.model_dump())
+      ) as responses:
+        async for response in responses:
+          merge_metadata(response.result, request)
+          # For task status updates, we need to propagate metadata and provide
+          # a unique message id.
+          if (hasattr(response.result, 'status') and
+              hasattr(response.result.status, 'message') and
+              response.result.status.message):
+            merge_metadata(response.result.status.message, request.message)
+            m = response.result.status.message
+            if not m.metadata:
+              m.metadata = {}
+            if 'message_id' in m.metadata:
+              m.metadata['last_message_id'] = m.metadata['message_id']
+            m.metadata['message_id'] = str(uuid.uuid4())
+          if task_callback:
+            task = task_callback(response.result, self.card)
+          if hasattr(response.result, 'final') and response.result.final:
+            break
       return task
     else: # Non-streaming
       response = await self.agent_client.send_task(request.model_dump())
@@ -0,0 +1,132 @@
+import base64
+import os
+import tempfile
+import time
+import unittest
+from urllib.parse import urlparse
+from common.client import ArtifactAssembler
+from common.server import ArtifactStreamer
+from common.types import (
+    Artifact,
+    DataPart,
+    SendTaskStreamingResponse,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+
+def chunked(text: str = "", data: bytes = b"", chunk_size: int = 4, index: int = 0) -> list[Artifact]:
+    streamer = ArtifactStreamer(task_manager=None, task_id="task", chunk_size=chunk_size)
+    if data:
+        return list(streamer.file_chunks(data, index, name="out.bin", mime_type="image/png"))
+    return list(streamer.text_chunks(text, index, name="answer", metadata={"lang": "en"}))
+
+
+class TestArtifactAssembler(unittest.TestCase):
+    def setUp(self):
+        self.spill_directory = tempfile.TemporaryDirectory()
+        self.assembler = ArtifactAssembler(
+            spill_threshold=None, spill_directory=self.spill_directory.name
+        )
+
+    def tearDown(self):
+        self.spill_directory.cleanup()
+
+    def test_text_chunks_come_out_as_one_part(self):
+        chunks = chunked("hello world")
+        results = [self.assembler.add("task", chunk) for chunk in chunks]
+
+        self.assertEqual(results[:-1], [None, None])
+        artifact = results[-1]
+        self.assertEqual(artifact.parts, [TextPart(text="hello world")])
+        self.assertEqual((artifact.name, artifact.metadata), ("answer", {"lang": "en"}))
+        self.assertIsNone(artifact.lastChunk)
+        self.assertEqual(self.assembler.partials, {})
+        self.assertEqual(self.assembler.completed, 1)
+
+    def test_file_chunks_come_out_as_one_file(self):
+        data = os.urandom(1000)
+        chunks = chunked(data=data, chunk_size=99)
+        artifact = [self.assembler.add("task", chunk) for chunk in chunks][-1]
+
+        [part] = artifact.parts
+        self.assertEqual(base64.b64decode(part.file.bytes), data)
+        self.assertEqual((part.file.name, part.file.mimeType), ("out.bin", "image/png"))
+
+    def test_large_files_spill_to_disk(self):
+        self.assembler.spill_threshold = 300
+        data = os.urandom(1000)
+        chunks = chunked(data=data, chunk_size=99)
+        for chunk in chunks[:-1]:
+            self.assertIsNone(self.assembler.add("task", chunk))
+        self.assertEqual(self.assembler.spilled, 1)
+        self.assertEqual(len(os.listdir(self.spill_directory.name)), 1)
+
+        [part] = self.assembler.add("task", chunks[-1]).parts
+        self.assertIsNone(part.file.bytes)
+        with open(urlparse(part.file.uri).path, "rb") as f:
+            self.assertEqual(f.read(), data)
+
+    def test_whole_artifacts_and_other_parts_pass_through(self):
+        whole = Artifact(parts=[TextPart(text="all at once")])
+        self.assertIs(self.assembler.add("task", whole), whole)
+
+        self.assembler.add(
+            "task", Artifact(parts=[DataPart(data={"a": 1}), TextPart(text="x")], lastChunk=False)
+        )
+        artifact = self.assembler.add(
+            "task", Artifact(parts=[TextPart(text="y")], append=True, lastChunk=True)
+        )
+        self.assertEqual(artifact.parts, [DataPart(data={"a": 1}), TextPart(text="xy")])
+
+    def test_stale_and_orphaned_chunks_are_dropped(self):
+        self.assembler.spill_threshold = 1
+        self.assembler.timeout = 10
+        chunks = chunked(data=os.urandom(100), chunk_size=30)
+        self.assembler.add("task", chunks[0])
+        self.assembler.add("task", chunks[1])
+        self.assertEqual(len(os.listdir(self.spill_directory.name)), 1)
+
+        self.assertEqual(self.assembler.expire(time.monotonic() + 5), 0)
+        self.assertEqual(self.assembler.expire(time.monotonic() + 11), 1)
+        # Spilled content is removed with the artifact.
+        self.assertEqual(os.listdir(self.spill_directory.name), [])
+
+        self.assertIsNone(self.assembler.add("task", chunks[2]))
+        self.assertEqual(self.assembler.orphaned, 1)
+        self.assertEqual(self.assembler.partials, {})
+
+
+class TestAssembleStream(unittest.IsolatedAsyncioTestCase):
+    async def test_yields_completed_artifacts_in_stream_order(self):
+        def respond(event):
+            return SendTaskStreamingResponse(id=1, result=event)
+
+        working = TaskStatusUpdateEvent(id="task", status=TaskStatus(state=TaskState.WORKING))
+        completed = TaskStatusUpdateEvent(
+            id="task", status=TaskStatus(state=TaskState.COMPLETED), final=True
+        )
+        first, second = chunked("abcdefgh", index=0), chunked("unfinished", index=1)
+        responses = [
+            respond(working),
+            respond(TaskArtifactUpdateEvent(id="task", artifact=first[0])),
+            respond(TaskArtifactUpdateEvent(id="task", artifact=second[0])),
+            respond(TaskArtifactUpdateEvent(id="task", artifact=first[1])),
+            respond(completed),
+        ]
+
+        async def stream():
+            for response in responses:
+                yield response
+
+        assembler = ArtifactAssembler()
+        results = [response.result async for response in assembler.assemble(stream())]
+
+        self.assertEqual(results[0], working)
+        self.assertEqual(results[1].artifact.parts, [TextPart(text="abcdefgh")])
+        self.assertEqual(results[2], completed)
+        # The artifact the stream never finished is dropped with it.
+        self.assertEqual(assembler.partials, {})
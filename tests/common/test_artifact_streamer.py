@@ -0,0 +1,184 @@
+import base64
+import io
+import os
+import unittest
+from common.server import ArtifactStreamer, InMemoryTaskManager
+from common.server.artifact_streamer import join_parts, merge_artifact_chunk
+from common.server.task_store import InMemoryTaskStore
+from common.types import (
+    Artifact,
+    FileContent,
+    FilePart,
+    Message,
+    TaskArtifactUpdateEvent,
+    TaskSendParams,
+    TextPart,
+)
+
+
+class StreamingTaskManager(InMemoryTaskManager):
+    def __init__(self):
+        super().__init__(task_store=InMemoryTaskStore())
+
+    async def on_send_task(self, request):
+        pass
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+def file_part(data: bytes, name: str = "out.bin") -> FilePart:
+    return FilePart(file=FileContent(name=name, bytes=base64.b64encode(data).decode()))
+
+
+class TestArtifactStreamer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.task_manager = StreamingTaskManager()
+        await self.task_manager.upsert_task(
+            TaskSendParams(id="task", message=Message(role="user", parts=[TextPart(text="go")]))
+        )
+        self.queue = await self.task_manager.setup_sse_consumer("task")
+
+    def sent_chunks(self) -> list[Artifact]:
+        chunks = []
+        while not self.queue.empty():
+            event = self.queue.get_nowait().event
+            self.assertIsInstance(event, TaskArtifactUpdateEvent)
+            chunks.append(event.artifact)
+        return chunks
+
+    async def stored_artifacts(self) -> list[Artifact]:
+        return (await self.task_manager.task_store.get_task("task")).artifacts
+
+    async def test_text_is_sent_in_bounded_chunks_and_stored_once(self):
+        streamer = ArtifactStreamer(self.task_manager, "task", chunk_size=4)
+        index = await streamer.send_text("hello world", name="answer")
+
+        chunks = self.sent_chunks()
+        self.assertEqual([c.parts[0].text for c in chunks], ["hell", "o wo", "rld"])
+        self.assertEqual([c.append for c in chunks], [None, True, True])
+        self.assertEqual([c.lastChunk for c in chunks], [False, False, True])
+        self.assertEqual({c.index for c in chunks}, {index})
+        self.assertEqual([c.name for c in chunks], ["answer", None, None])
+        self.assertEqual(streamer.chunks_sent, 3)
+
+        [stored] = await self.stored_artifacts()
+        self.assertEqual(stored.name, "answer")
+        self.assertEqual(stored.parts, [TextPart(text="hello world")])
+        self.assertTrue(stored.lastChunk)
+        # The queued events are left as they were sent.
+        self.assertEqual(chunks[0].parts[0].text, "hell")
+
+    async def test_file_chunks_concatenate_into_the_file(self):
+        data = os.urandom(1000)
+        streamer = ArtifactStreamer(self.task_manager, "task", chunk_size=100)
+        await streamer.send_file(io.BytesIO(data), name="out.bin", mime_type="application/octet-stream")
+
+        chunks = self.sent_chunks()
+        self.assertEqual(len(chunks), 11)
+        self.assertTrue(all(len(base64.b64decode(c.parts[0].file.bytes)) <= 99 for c in chunks))
+        self.assertEqual([c.lastChunk for c in chunks].count(True), 1)
+        self.assertTrue(chunks[-1].lastChunk)
+
+        # The base64 of the chunks concatenates into that of the whole file.
+        self.assertEqual(base64.b64decode("".join(c.parts[0].file.bytes for c in chunks)), data)
+
+        [stored] = await self.stored_artifacts()
+        [part] = stored.parts
+        self.assertEqual(base64.b64decode(part.file.bytes), data)
+        self.assertEqual(part.file.name, "out.bin")
+
+    async def test_generated_text_is_sent_as_it_comes(self):
+        async def tokens():
+            for token in ("The ", "answer ", "is 42"):
+                yield token
+
+        streamer = ArtifactStreamer(self.task_manager, "task", chunk_size=5)
+        await streamer.send_text(tokens())
+
+        chunks = self.sent_chunks()
+        self.assertEqual(
+            [[p.text for p in c.parts] for c in chunks],
+            [["The "], ["answe"], ["r "], ["is 42"], []],
+        )
+        self.assertEqual([c.lastChunk for c in chunks], [False] * 4 + [True])
+        [stored] = await self.stored_artifacts()
+        self.assertEqual(stored.parts, [TextPart(text="The answer is 42")])
+        self.assertTrue(stored.lastChunk)
+
+    async def test_chunks_are_persisted_with_the_last_one(self):
+        saved = []
+        save_task = self.task_manager.task_store.save_task
+
+        async def record_save(task):
+            saved.append(len(task.artifacts or []))
+            await save_task(task)
+
+        self.task_manager.task_store.save_task = record_save
+        await ArtifactStreamer(self.task_manager, "task", chunk_size=4).send_text("hello world")
+
+        self.assertEqual(saved, [1])
+
+    async def test_indexes_follow_existing_artifacts(self):
+        await self.task_manager.update_store(
+            "task", None, [Artifact(parts=[TextPart(text="earlier")], index=0)]
+        )
+        streamer = ArtifactStreamer(self.task_manager, "task")
+        self.assertEqual(await streamer.send_text("first"), 1)
+        self.assertEqual(await streamer.send_file(b"second", name="b.bin"), 2)
+
+        stored = await self.stored_artifacts()
+        self.assertEqual([a.index for a in stored], [0, 1, 2])
+        self.assertEqual(base64.b64decode(stored[2].parts[0].file.bytes), b"second")
+
+
+class TestMergeArtifactChunk(unittest.TestCase):
+    def test_artifacts_without_append_are_kept_apart(self):
+        artifacts = []
+        merge_artifact_chunk(artifacts, Artifact(parts=[TextPart(text="a")]))
+        merge_artifact_chunk(artifacts, Artifact(parts=[TextPart(text="b")]))
+        self.assertEqual([a.parts[0].text for a in artifacts], ["a", "b"])
+
+    def test_append_extends_the_artifact_with_the_same_index(self):
+        first = Artifact(parts=[TextPart(text="a")], index=3, lastChunk=False)
+        artifacts = [Artifact(parts=[TextPart(text="other")], index=0)]
+        merge_artifact_chunk(artifacts, first)
+        merge_artifact_chunk(
+            artifacts,
+            Artifact(
+                parts=[TextPart(text="b"), file_part(b"x")],
+                index=3,
+                append=True,
+                lastChunk=True,
+                metadata={"tokens": 2},
+            ),
+        )
+
+        self.assertEqual(len(artifacts), 2)
+        merged = artifacts[1]
+        self.assertEqual([p.type for p in merged.parts], ["text", "file"])
+        self.assertEqual(merged.parts[0].text, "ab")
+        self.assertTrue(merged.lastChunk)
+        self.assertEqual(merged.metadata, {"tokens": 2})
+        # The chunk that was stored first is left as it was sent.
+        self.assertEqual(first.parts, [TextPart(text="a")])
+
+    def test_join_parts(self):
+        parts = join_parts(
+            [
+                file_part(b"a"),
+                file_part(b"bc"),
+                file_part(b"d", name="other.bin"),
+                TextPart(text="x"),
+                TextPart(text="y"),
+            ]
+        )
+        self.assertEqual(
+            [base64.b64decode(p.file.bytes) for p in parts[:2]], [b"abc", b"d"]
+        )
+        self.assertEqual(parts[2:], [TextPart(text="xy")])
+
+    def test_append_without_a_stored_artifact_starts_one(self):
+        artifacts = []
+        merge_artifact_chunk(artifacts, Artifact(parts=[TextPart(text="a")], index=1, append=True))
+        self.assertEqual(len(artifacts), 1)
@@ -0,0 +1,164 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+import httpx
+from common.client.card_resolver import (
+    A2ACardResolver,
+    AgentCardCache,
+    CachedAgentCard,
+    cache_lifetime,
+    get_agent_cards,
+)
+from common.server import A2AServer
+from common.types import AgentCapabilities, AgentCard
+
+
+def make_card(version: str = "1.0.0") -> AgentCard:
+    return AgentCard(
+        name="Echo",
+        url="http://test/",
+        version=version,
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+
+
+class CardServer:
+    """Serves an agent card through A2AServer and records the requests."""
+
+    def __init__(self, max_age: int = 300):
+        self.server = A2AServer(agent_card=make_card(), agent_card_max_age=max_age)
+        self.requests: list[httpx.Request] = []
+        self.statuses: list[int] = []
+        transport = httpx.ASGITransport(app=self.server.app)
+
+        async def handle(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            response = await transport.handle_async_request(request)
+            self.statuses.append(response.status_code)
+            return response
+
+        self.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+
+    def resolver(self, cache: AgentCardCache) -> A2ACardResolver:
+        return A2ACardResolver("http://test", cache=cache, http_client=self.http_client)
+
+
+class TestCacheLifetime(unittest.TestCase):
+    def test_cache_control(self):
+        self.assertEqual(cache_lifetime(None, 300), 300)
+        self.assertEqual(cache_lifetime("public, max-age=60", 300), 60)
+        self.assertEqual(cache_lifetime("no-cache", 300), 0)
+        self.assertIsNone(cache_lifetime("no-store", 300))
+
+
+class TestA2ACardResolver(unittest.IsolatedAsyncioTestCase):
+    async def test_fresh_card_is_served_from_cache(self):
+        server = CardServer()
+        cache = AgentCardCache()
+
+        for _ in range(3):
+            card = await server.resolver(cache).get_agent_card_async()
+            self.assertEqual(card.name, "Echo")
+
+        self.assertEqual(len(server.requests), 1)
+
+    async def test_expired_card_is_revalidated_with_etag(self):
+        server = CardServer(max_age=0)
+        cache = AgentCardCache()
+        resolver = server.resolver(cache)
+
+        await resolver.refresh()
+        await resolver.refresh()
+
+        self.assertIn("If-None-Match", server.requests[1].headers)
+        self.assertEqual(server.statuses, [200, 304])
+
+        server.server.agent_card = make_card(version="2.0.0")
+        card = await resolver.refresh()
+        self.assertEqual(card.version, "2.0.0")
+        self.assertEqual(server.statuses[-1], 200)
+
+    async def test_stale_card_is_returned_and_refreshed_in_background(self):
+        server = CardServer()
+        cache = AgentCardCache()
+        resolver = server.resolver(cache)
+        await resolver.get_agent_card_async()
+        cache.entries[resolver.url].expires_at = time.time() - 1
+        server.server.agent_card = make_card(version="2.0.0")
+
+        card = await resolver.get_agent_card_async()
+        self.assertEqual(card.version, "1.0.0")
+        await asyncio.gather(*cache.refreshing.values())
+
+        self.assertEqual(cache.get(resolver.url).card.version, "2.0.0")
+        self.assertTrue(cache.get(resolver.url).fresh)
+
+    async def test_no_cache_card_is_revalidated_before_use(self):
+        server = CardServer(max_age=0)
+        cache = AgentCardCache()
+        resolver = server.resolver(cache)
+        await resolver.get_agent_card_async()
+
+        card = await resolver.get_agent_card_async()
+        self.assertEqual(card.version, "1.0.0")
+        self.assertEqual(server.statuses, [200, 304])
+        self.assertIn("If-None-Match", server.requests[1].headers)
+
+        server.server.agent_card = make_card(version="2.0.0")
+        card = await resolver.get_agent_card_async()
+        self.assertEqual(card.version, "2.0.0")
+        self.assertEqual(cache.refreshing, {})
+
+    async def test_no_cache_card_is_served_stale_when_unreachable(self):
+        server = CardServer(max_age=0)
+        cache = AgentCardCache()
+        await server.resolver(cache).get_agent_card_async()
+
+        def refuse(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        resolver = A2ACardResolver(
+            "http://test", cache=cache, http_client=httpx.AsyncClient(transport=httpx.MockTransport(refuse))
+        )
+        card = await resolver.get_agent_card_async()
+        self.assertEqual(card.name, "Echo")
+
+    async def test_disk_cache_survives_restart(self):
+        server = CardServer()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            await server.resolver(AgentCardCache(cache_dir=cache_dir)).get_agent_card_async()
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            card = await server.resolver(AgentCardCache(cache_dir=cache_dir)).get_agent_card_async()
+
+        self.assertEqual(card.name, "Echo")
+        self.assertEqual(len(server.requests), 1)
+
+
+class TestUnreachableAgent(unittest.TestCase):
+    UNREACHABLE = "http://127.0.0.1:9"
+
+    def cache_with_card(self, base_url: str, expires_at: float) -> AgentCardCache:
+        cache = AgentCardCache()
+        cache.put(
+            base_url + "/.well-known/agent.json",
+            CachedAgentCard(card=make_card(), etag=None, last_modified=None, expires_at=expires_at),
+        )
+        return cache
+
+    def test_stale_card_is_served_when_revalidation_fails(self):
+        cache = self.cache_with_card(self.UNREACHABLE, expires_at=time.time() - 1)
+
+        card = A2ACardResolver(self.UNREACHABLE, cache=cache).get_agent_card()
+
+        self.assertEqual(card.name, "Echo")
+
+    def test_unreachable_agents_are_left_out(self):
+        cache = self.cache_with_card("http://cached", expires_at=time.time() + 300)
+
+        cards = asyncio.run(get_agent_cards(["http://cached", self.UNREACHABLE], cache=cache))
+
+        self.assertEqual([card.name for card in cards], ["Echo"])
@@ -0,0 +1,485 @@
+import asyncio
+import base64
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+import httpx
+from common.client import A2AClient, gather_tasks
+from common.server import A2AServer, BlobStore, InMemoryTaskManager
+from common.server.task_store import InMemoryTaskStore
+from common.types import (
+    A2AClientHTTPError,
+    AgentCapabilities,
+    AgentCard,
+    FileContent,
+    FilePart,
+    Message,
+    SendTaskResponse,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from common.utils.file_content import read_file_content
+
+
+class DelayedTaskManager(InMemoryTaskManager):
+    """Completes each task after the delay given in its metadata."""
+
+    def __init__(self, shared: "DelayedTaskManager | None" = None):
+        super().__init__(task_store=InMemoryTaskStore())
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # Another manager that also counts this one's requests.
+        self.shared = shared
+
+    async def on_send_task(self, request):
+        for counter in (self, self.shared):
+            if counter is not None:
+                counter.in_flight += 1
+                counter.max_in_flight = max(counter.max_in_flight, counter.in_flight)
+        try:
+            await self.upsert_task(request.params)
+            await asyncio.sleep(request.params.metadata["delay"])
+            task = await self.update_store(
+                request.params.id, TaskStatus(state=TaskState.COMPLETED), None
+            )
+            return SendTaskResponse(id=request.id, result=task)
+        finally:
+            for counter in (self, self.shared):
+                if counter is not None:
+                    counter.in_flight -= 1
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+def make_client(task_manager: InMemoryTaskManager, **kwargs) -> A2AClient:
+    agent_card = AgentCard(
+        name="Delayed",
+        url="http://test/",
+        version="1.0.0",
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+    server = A2AServer(agent_card=agent_card, task_manager=task_manager)
+    return A2AClient(
+        agent_card=agent_card,
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app)),
+        **kwargs,
+    )
+
+
+def task_params(task_id: str, delay: float) -> TaskSendParams:
+    return TaskSendParams(
+        id=task_id,
+        message=Message(role="user", parts=[TextPart(text="hi")]),
+        metadata={"delay": delay},
+    )
+
+
+class TestGatherTasks(unittest.IsolatedAsyncioTestCase):
+    async def test_yields_results_as_they_complete(self):
+        task_manager = DelayedTaskManager()
+        client = make_client(task_manager)
+        payloads = [task_params("slow", 0.2), task_params("fast", 0.0)]
+
+        results = [result async for result in client.send_many(payloads)]
+
+        self.assertEqual([r.response.result.id for r in results], ["fast", "slow"])
+        self.assertEqual([r.index for r in results], [1, 0])
+        self.assertGreaterEqual(results[1].latency, 0.2)
+        self.assertIsNone(results[0].error)
+
+    async def test_respects_per_agent_and_global_limits(self):
+        total = DelayedTaskManager()
+        first, second = DelayedTaskManager(total), DelayedTaskManager(total)
+        clients = [
+            make_client(first, max_concurrent_requests=2),
+            make_client(second, max_concurrent_requests=10),
+        ]
+        requests = [
+            (clients[i % 2], task_params(f"task_{i}", 0.01)) for i in range(40)
+        ]
+
+        results = [r async for r in gather_tasks(requests, max_concurrency=5)]
+
+        self.assertEqual(sorted(r.index for r in results), list(range(40)))
+        self.assertLessEqual(first.max_in_flight, 2)
+        self.assertLessEqual(total.max_in_flight, 5)
+        self.assertGreater(second.max_in_flight, 2)
+
+    async def test_waiting_for_the_global_limit_holds_no_agent_slot(self):
+        slow = make_client(DelayedTaskManager())
+        fast = make_client(DelayedTaskManager(), max_concurrent_requests=1)
+        # The request to `fast` waits behind the slow one for the only
+        # global slot of this batch...
+        batch = gather_tasks(
+            [(slow, task_params("slow", 0.5)), (fast, task_params("queued", 0))],
+            max_concurrency=1,
+        )
+        consumer = asyncio.create_task(anext(batch))
+        await asyncio.sleep(0.05)
+
+        # ...without keeping the agent's slot from other batches.
+        start = time.perf_counter()
+        [result] = [r async for r in gather_tasks([(fast, task_params("other", 0))])]
+        self.assertEqual(result.response.result.id, "other")
+        self.assertLess(time.perf_counter() - start, 0.3)
+
+        await consumer
+        await batch.aclose()
+
+    async def test_failures_do_not_stop_other_requests(self):
+        client = make_client(DelayedTaskManager())
+        broken = A2AClient(
+            url="http://test/",
+            http_client=httpx.AsyncClient(
+                transport=httpx.MockTransport(lambda request: httpx.Response(500))
+            ),
+        )
+
+        results = [
+            r
+            async for r in gather_tasks(
+                [(broken, task_params("a", 0)), (client, task_params("b", 0))]
+            )
+        ]
+
+        by_index = {r.index: r for r in results}
+        self.assertIsNotNone(by_index[0].error)
+        self.assertIsNone(by_index[0].response)
+        self.assertEqual(by_index[1].response.result.id, "b")
+
+    async def test_stopping_early_cancels_pending_requests(self):
+        task_manager = DelayedTaskManager()
+        client = make_client(task_manager)
+        results = client.send_many(
+            [task_params("fast", 0)] + [task_params(f"slow_{i}", 10) for i in range(3)]
+        )
+
+        first = await anext(results)
+        await results.aclose()
+        await asyncio.sleep(0)
+
+        self.assertEqual(first.response.result.id, "fast")
+        self.assertEqual(task_manager.in_flight, 0)
+
+
+class DroppingStream(httpx.AsyncByteStream):
+    """SSE body that fails with a transport error after its events."""
+
+    def __init__(self, events: list[tuple[int | None, dict]], drop: bool):
+        self.events = events
+        self.drop = drop
+
+    async def __aiter__(self):
+        for event_id, data in self.events:
+            frame = f"data: {json.dumps(data)}\n"
+            if event_id is not None:
+                frame += f"id: {event_id}\n"
+            yield (frame + "\n").encode()
+        if self.drop:
+            raise httpx.ReadError("connection reset")
+
+
+def status_event(request_id, state: str, final: bool = False) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {"id": "task", "status": {"state": state}, "final": final},
+    }
+
+
+def sse_response(events, drop=False) -> httpx.Response:
+    return httpx.Response(
+        200,
+        headers={"content-type": "text/event-stream"},
+        stream=DroppingStream(events, drop),
+    )
+
+
+def streaming_client(handler) -> A2AClient:
+    return A2AClient(
+        url="http://test/",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+STREAM_PAYLOAD = {
+    "id": "task",
+    "message": {"role": "user", "parts": [{"type": "text", "text": "hi"}]},
+}
+
+
+class TestStreamResumption(unittest.IsolatedAsyncioTestCase):
+    async def test_resubscribes_with_last_event_id(self):
+        requests = []
+
+        def handler(request: httpx.Request):
+            body = json.loads(request.content)
+            requests.append((body["method"], request.headers.get("Last-Event-ID")))
+            if body["method"] == "tasks/sendSubscribe":
+                return sse_response(
+                    [(0, status_event(body["id"], "working")), (1, status_event(body["id"], "working"))],
+                    drop=True,
+                )
+            return sse_response([(2, status_event(body["id"], "completed", final=True))])
+
+        stream = streaming_client(handler).send_task_streaming(STREAM_PAYLOAD)
+        events = [response.result async for response in stream]
+
+        self.assertEqual([e.status.state for e in events], ["working", "working", "completed"])
+        self.assertEqual(requests, [("tasks/sendSubscribe", None), ("tasks/resubscribe", "1")])
+        self.assertEqual(stream.reconnects, 1)
+        self.assertEqual(stream.resyncs, 0)
+        self.assertEqual(stream.last_event_id, 2)
+
+    async def test_falls_back_to_get_without_event_ids(self):
+        methods = []
+
+        def handler(request: httpx.Request):
+            body = json.loads(request.content)
+            methods.append(body["method"])
+            if body["method"] == "tasks/sendSubscribe":
+                return sse_response([(None, status_event(body["id"], "working"))], drop=True)
+            return httpx.Response(
+                200,
+                json={
+                    "jsonrpc": "2.0",
+                    "id": body["id"],
+                    "result": {"id": "task", "status": {"state": "completed"}},
+                },
+            )
+
+        stream = streaming_client(handler).send_task_streaming(STREAM_PAYLOAD)
+        events = [response.result async for response in stream]
+
+        self.assertEqual([e.status.state for e in events], ["working", "completed"])
+        self.assertTrue(events[-1].final)
+        self.assertEqual(methods, ["tasks/sendSubscribe", "tasks/get"])
+        self.assertEqual((stream.reconnects, stream.resyncs), (1, 1))
+
+    async def test_gives_up_after_max_reconnects(self):
+        def handler(request: httpx.Request):
+            body = json.loads(request.content)
+            return sse_response([(0, status_event(body["id"], "working"))], drop=True)
+
+        client = streaming_client(handler)
+        client.max_stream_reconnects = 2
+        stream = client.send_task_streaming(STREAM_PAYLOAD)
+        with self.assertRaises(A2AClientHTTPError):
+            async for _ in stream:
+                pass
+        self.assertEqual(stream.reconnects, 2)
+        self.assertEqual(client.stream_reconnects, 2)
+
+    async def test_failed_connect_resends_instead_of_resuming(self):
+        methods = []
+
+        def handler(request: httpx.Request):
+            body = json.loads(request.content)
+            methods.append(body["method"])
+            if len(methods) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            return sse_response([(0, status_event(body["id"], "completed", final=True))])
+
+        stream = streaming_client(handler).send_task_streaming(STREAM_PAYLOAD)
+        events = [response.result async for response in stream]
+
+        self.assertEqual([e.status.state for e in events], ["completed"])
+        self.assertEqual(methods, ["tasks/sendSubscribe", "tasks/sendSubscribe"])
+        self.assertEqual((stream.reconnects, stream.resyncs), (1, 0))
+
+    async def test_unreachable_agent_raises_http_error(self):
+        def handler(request: httpx.Request):
+            raise httpx.ConnectError("refused", request=request)
+
+        client = streaming_client(handler)
+        client.max_stream_reconnects = 1
+        stream = client.send_task_streaming(STREAM_PAYLOAD)
+        with self.assertRaises(A2AClientHTTPError):
+            async for _ in stream:
+                pass
+        self.assertEqual(stream.resyncs, 0)
+
+
+class RecordingTaskManager(InMemoryTaskManager):
+    def __init__(self):
+        super().__init__(task_store=InMemoryTaskStore())
+        self.received: list[TaskSendParams] = []
+
+    async def on_send_task(self, request):
+        self.received.append(request.params)
+        await self.upsert_task(request.params)
+        task = await self.update_store(
+            request.params.id, TaskStatus(state=TaskState.COMPLETED), None
+        )
+        return SendTaskResponse(id=request.id, result=task)
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+def file_params(data: bytes) -> TaskSendParams:
+    return TaskSendParams(
+        id="task",
+        message=Message(
+            role="user",
+            parts=[
+                TextPart(text="summarize"),
+                FilePart(
+                    file=FileContent(
+                        name="report.pdf",
+                        mimeType="application/pdf",
+                        bytes=base64.b64encode(data).decode(),
+                    )
+                ),
+            ],
+        ),
+    )
+
+
+class TestFileUploads(unittest.IsolatedAsyncioTestCase):
+    def make_client(self, blob_store: BlobStore | None, **kwargs) -> A2AClient:
+        self.task_manager = RecordingTaskManager()
+        agent_card = AgentCard(
+            name="Files",
+            url="http://test/",
+            version="1.0.0",
+            capabilities=AgentCapabilities(),
+            skills=[],
+        )
+        server = A2AServer(
+            agent_card=agent_card, task_manager=self.task_manager, blob_store=blob_store
+        )
+        return A2AClient(
+            agent_card=agent_card,
+            http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app)),
+            **kwargs,
+        )
+
+    async def test_large_inline_file_is_sent_by_uri(self):
+        blob_store = BlobStore()
+        self.addCleanup(blob_store.close)
+        client = self.make_client(blob_store, upload_threshold=1024)
+        data = os.urandom(4096)
+        params = file_params(data)
+
+        await client.send_task(params)
+        await client.send_task(file_params(b"small"))
+        # The caller's own message still holds the file inline.
+        self.assertEqual(params.message.parts[1].file.bytes, base64.b64encode(data).decode())
+
+        large, small = (params.message.parts[1].file for params in self.task_manager.received)
+        self.assertIsNone(large.bytes)
+        self.assertTrue(large.uri.startswith("http://test/blobs/"))
+        self.assertEqual(large.name, "report.pdf")
+        self.assertEqual(small.bytes, base64.b64encode(b"small").decode())
+        self.assertEqual(client.uploaded_files, 1)
+
+        response = await client.http_client.get(large.uri)
+        self.assertEqual(response.content, data)
+        self.assertEqual(response.headers["content-type"], "application/pdf")
+
+    async def test_upload_streams_a_file(self):
+        blob_store = BlobStore()
+        self.addCleanup(blob_store.close)
+        client = self.make_client(blob_store)
+        data = os.urandom(600 * 1024)
+        with tempfile.NamedTemporaryFile(suffix=".png") as f:
+            f.write(data)
+            f.flush()
+            file = await client.upload_file(f.name)
+
+        self.assertEqual(file.mimeType, "image/png")
+        blob_id = file.uri.rsplit("/", 1)[1]
+        self.assertEqual(blob_store.read_bytes(blob_id), data)
+
+    async def test_oversized_upload_is_refused(self):
+        blob_store = BlobStore(max_blob_size=1024)
+        self.addCleanup(blob_store.close)
+        client = self.make_client(blob_store)
+
+        # Streamed without a Content-Length, so the limit applies while writing.
+        with self.assertRaises(A2AClientHTTPError) as e:
+            await client.upload_file(io.BytesIO(os.urandom(2048)))
+        self.assertEqual(e.exception.status_code, 413)
+        self.assertEqual(os.listdir(blob_store.directory), [])
+
+    async def test_upload_to_a_full_store_is_refused(self):
+        blob_store = BlobStore(max_total_size=3000)
+        self.addCleanup(blob_store.close)
+        client = self.make_client(blob_store)
+        await client.upload_file(os.urandom(2000))
+
+        for data in (os.urandom(2000), io.BytesIO(os.urandom(2000))):
+            with self.assertRaises(A2AClientHTTPError) as e:
+                await client.upload_file(data)
+            self.assertEqual(e.exception.status_code, 507)
+        self.assertEqual(blob_store.total_size, 2000)
+        self.assertEqual(len(os.listdir(blob_store.directory)), 1)
+
+    async def test_agent_without_blob_endpoint_gets_files_inline(self):
+        client = self.make_client(None, upload_threshold=1024)
+        data = os.urandom(4096)
+
+        await client.send_task(file_params(data))
+
+        self.assertEqual(
+            self.task_manager.received[0].message.parts[1].file.bytes,
+            base64.b64encode(data).decode(),
+        )
+        self.assertFalse(client.blob_uploads_supported)
+
+    async def test_uploads_are_off_by_default(self):
+        blob_store = BlobStore()
+        self.addCleanup(blob_store.close)
+        client = self.make_client(blob_store)
+        data = os.urandom(2 * 2**20)
+
+        await client.send_task(file_params(data))
+
+        self.assertIsNotNone(self.task_manager.received[0].message.parts[1].file.bytes)
+        self.assertEqual(blob_store.blobs, {})
+
+    async def test_malformed_content_length_is_rejected(self):
+        blob_store = BlobStore()
+        self.addCleanup(blob_store.close)
+        client = self.make_client(blob_store)
+
+        response = await client.http_client.post(
+            client.blob_url, content=b"data", headers={"Content-Length": "lots"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_blobs_expire(self):
+        blob_store = BlobStore(ttl=60)
+        self.addCleanup(blob_store.close)
+        client = self.make_client(blob_store)
+        file = await client.upload_file(b"data")
+        blob_id = file.uri.rsplit("/", 1)[1]
+
+        self.assertEqual(blob_store.expire(time.monotonic() + 30), 0)
+        self.assertEqual(blob_store.expire(time.monotonic() + 60), 1)
+        self.assertIsNone(blob_store.get(blob_id))
+        self.assertEqual(os.listdir(blob_store.directory), [])
+
+    async def test_agents_read_files_sent_either_way(self):
+        blob_store = BlobStore()
+        self.addCleanup(blob_store.close)
+        client = self.make_client(blob_store)
+        data = os.urandom(100)
+
+        uploaded = await client.upload_file(data)
+        inline = FileContent(bytes=base64.b64encode(data).decode())
+        self.assertEqual(await read_file_content(uploaded, blob_store), data)
+        self.assertEqual(await read_file_content(inline), data)
+        with self.assertRaises(ValueError):
+            await read_file_content(FileContent(uri="file:///etc/passwd"))
+        # Other servers are only fetched from when explicitly allowed.
+        with self.assertRaises(ValueError):
+            await read_file_content(FileContent(uri="http://169.254.169.254/latest"), blob_store)
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import unittest
+import httpx
+import jwt
+from starlette.requests import Request
+from common.utils.push_notification_auth import (
+    SIGNING_ALGORITHMS,
+    PushNotificationReceiverAuth,
+    PushNotificationSenderAuth,
+)
+
+
+def make_request(body: bytes, headers: dict[str, str]) -> Request:
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/notify",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    return Request(scope, receive)
+
+
+class TestPushNotificationAuth(unittest.IsolatedAsyncioTestCase):
+    def make_auth(self, algorithm):
+        sender = PushNotificationSenderAuth()
+        sender.generate_jwk(algorithm)
+        receiver = PushNotificationReceiverAuth()
+        receiver.add_signing_keys(sender.public_keys)
+        return sender, receiver
+
+    async def test_round_trip_for_every_algorithm(self):
+        for algorithm in SIGNING_ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                sender, receiver = self.make_auth(algorithm)
+                self.assertEqual(sender.public_keys[0]["alg"], algorithm)
+
+                body = sender.encode_body({"id": "task", "text": "héllo"})
+                headers = sender.get_auth_headers(body)
+                self.assertTrue(
+                    await receiver.verify_push_notification(make_request(body, headers))
+                )
+
+    async def test_signs_the_bytes_that_are_sent(self):
+        sender, receiver = self.make_auth("ES256")
+        # Not the compact form the receiver would re-serialize to.
+        body = b'{"id": "task",  "n": 1.0}'
+        headers = sender.get_auth_headers(body)
+        token = headers["Authorization"].removeprefix("Bearer ")
+        claims = jwt.decode(token, options={"verify_signature": False})
+        self.assertEqual(claims["request_body_sha256"], hashlib.sha256(body).hexdigest())
+        self.assertTrue(await receiver.verify_push_notification(make_request(body, headers)))
+
+    async def test_tampered_body_is_rejected(self):
+        sender, receiver = self.make_auth("EdDSA")
+        headers = sender.get_auth_headers(sender.encode_body({"id": "task"}))
+        with self.assertRaises(ValueError):
+            await receiver.verify_push_notification(
+                make_request(json.dumps({"id": "other"}).encode(), headers)
+            )
+
+    async def test_returns_the_verified_payload(self):
+        sender, receiver = self.make_auth("ES256")
+        body = sender.encode_body({"id": "task", "status": {"state": "completed"}})
+        payload = await receiver.read_push_notification(
+            make_request(body, sender.get_auth_headers(body))
+        )
+        self.assertEqual(payload, {"id": "task", "status": {"state": "completed"}})
+
+    async def test_unknown_kid_refreshes_jwks_within_budget(self):
+        sender = PushNotificationSenderAuth()
+        sender.generate_jwk("EdDSA")
+        fetches = []
+
+        def handler(request: httpx.Request):
+            fetches.append(request)
+            return httpx.Response(200, json={"keys": sender.public_keys})
+
+        receiver = PushNotificationReceiverAuth(
+            min_refresh_interval=60,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        await receiver.load_jwks("http://agent/.well-known/jwks.json")
+        body = sender.encode_body({"id": "task"})
+        for _ in range(3):
+            await receiver.read_push_notification(make_request(body, sender.get_auth_headers(body)))
+        self.assertEqual(len(fetches), 1)
+
+        # A rotated key is picked up once the refresh budget allows it.
+        sender.generate_jwk("EdDSA")
+        headers = sender.get_auth_headers(body)
+        with self.assertRaises(ValueError):
+            await receiver.read_push_notification(make_request(body, headers))
+        self.assertEqual(len(fetches), 1)
+
+        receiver.last_refresh -= 60
+        await receiver.read_push_notification(make_request(body, headers))
+        self.assertEqual(len(fetches), 2)
+        self.assertEqual(receiver.jwks_refreshes, 2)
+
+    def test_unsupported_algorithm(self):
+        with self.assertRaises(ValueError):
+            PushNotificationSenderAuth().generate_jwk("HS256")
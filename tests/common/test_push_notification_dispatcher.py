@@ -0,0 +1,104 @@
+import asyncio
+import json
+import unittest
+import httpx
+from common.utils.push_notification_auth import PushNotificationSenderAuth
+from common.utils.push_notification_dispatcher import PushNotificationDispatcher
+
+URL = "http://webhook.test/notify"
+
+
+class TestPushNotificationDispatcher(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sender_auth = PushNotificationSenderAuth()
+        cls.sender_auth.generate_jwk()
+
+    def make_dispatcher(self, handler, **kwargs) -> PushNotificationDispatcher:
+        dispatcher = PushNotificationDispatcher(
+            self.sender_auth, initial_backoff=0.001, **kwargs
+        )
+        dispatcher.clients[("http", "webhook.test")] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        return dispatcher
+
+    async def test_preserves_order_per_task_across_retries(self):
+        received = []
+        attempts = {}
+
+        async def handler(request: httpx.Request):
+            body = json.loads(request.content)
+            self.assertTrue(request.headers["Authorization"].startswith("Bearer "))
+            key = (body["id"], body["seq"])
+            attempts[key] = attempts.get(key, 0) + 1
+            if body["seq"] == 0 and attempts[key] < 3:
+                return httpx.Response(503)
+            await asyncio.sleep(0)
+            received.append(key)
+            return httpx.Response(200)
+
+        dispatcher = self.make_dispatcher(handler, workers=4)
+        for seq in range(5):
+            for task_id in ("a", "b"):
+                self.assertTrue(
+                    dispatcher.enqueue(task_id, URL, {"id": task_id, "seq": seq})
+                )
+        await dispatcher.close()
+
+        for task_id in ("a", "b"):
+            self.assertEqual(
+                [seq for t, seq in received if t == task_id], list(range(5))
+            )
+        metrics = dispatcher.metrics()
+        self.assertEqual(metrics["push_notifications_delivered"], 10)
+        self.assertEqual(metrics["push_notifications_retried"], 4)
+        self.assertEqual(metrics["push_notifications_failed"], 0)
+        self.assertEqual(metrics["push_notifications_pending"], 0)
+        self.assertIsNotNone(metrics["push_notification_latency_p99"])
+
+    async def test_gives_up_after_max_attempts(self):
+        calls = []
+
+        def handler(request: httpx.Request):
+            calls.append(request)
+            return httpx.Response(500)
+
+        dispatcher = self.make_dispatcher(handler, max_attempts=3)
+        dispatcher.enqueue("a", URL, {"id": "a"})
+        await dispatcher.close()
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(dispatcher.metrics()["push_notifications_failed"], 1)
+
+    async def test_client_errors_are_not_retried(self):
+        calls = []
+
+        def handler(request: httpx.Request):
+            calls.append(request)
+            return httpx.Response(400)
+
+        dispatcher = self.make_dispatcher(handler)
+        dispatcher.enqueue("a", URL, {"id": "a"})
+        await dispatcher.close()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(dispatcher.metrics()["push_notifications_failed"], 1)
+
+    async def test_drops_when_queue_is_full(self):
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request):
+            await release.wait()
+            return httpx.Response(200)
+
+        dispatcher = self.make_dispatcher(handler, max_queue_size=2)
+        self.assertTrue(dispatcher.enqueue("a", URL, {"id": "a"}))
+        self.assertTrue(dispatcher.enqueue("b", URL, {"id": "b"}))
+        self.assertFalse(dispatcher.enqueue("c", URL, {"id": "c"}))
+        release.set()
+        await dispatcher.close()
+
+        metrics = dispatcher.metrics()
+        self.assertEqual(metrics["push_notifications_dropped"], 1)
+        self.assertEqual(metrics["push_notifications_delivered"], 2)
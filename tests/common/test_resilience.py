@@ -0,0 +1,219 @@
+import asyncio
+import json
+import time
+import unittest
+import httpx
+from common.client import A2AClient, CircuitBreaker, CircuitState, ResiliencePolicy
+from common.types import A2AClientCircuitOpenError, A2AClientHTTPError, TaskSendParams
+
+
+def task_result(task_id: str, request_id, history: list | None = None) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {"id": task_id, "status": {"state": "working"}, "history": history},
+    }
+
+
+USER_MESSAGE = {"role": "user", "parts": [{"type": "text", "text": "hi"}]}
+
+
+def make_client(handler, **policy) -> A2AClient:
+    return A2AClient(
+        url="http://test/",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        resilience=ResiliencePolicy(initial_backoff=0.001, **policy),
+    )
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_half_opens_and_closes(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertFalse(breaker.allow())
+
+        breaker.opened_at = time.monotonic() - 60
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        # Only one probe at a time.
+        self.assertFalse(breaker.allow())
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+        breaker.opened_at = time.monotonic() - 60
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+
+class TestA2AClientResilience(unittest.IsolatedAsyncioTestCase):
+    async def test_retries_unavailable_agent(self):
+        calls = []
+
+        def handler(request: httpx.Request):
+            calls.append(request)
+            if len(calls) < 3:
+                return httpx.Response(503)
+            return httpx.Response(200, json=task_result("task", json.loads(request.content)["id"]))
+
+        client = make_client(handler)
+        response = await client.get_task({"id": "task"})
+
+        self.assertEqual(response.result.id, "task")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(client.retried_requests, 2)
+        self.assertEqual(client.circuit_state, CircuitState.CLOSED)
+
+    async def test_client_errors_are_not_retried(self):
+        calls = []
+
+        def handler(request: httpx.Request):
+            calls.append(request)
+            return httpx.Response(400)
+
+        client = make_client(handler)
+        with self.assertRaises(A2AClientHTTPError):
+            await client.get_task({"id": "task"})
+        self.assertEqual(len(calls), 1)
+
+    async def test_send_task_is_not_resent_once_received(self):
+        methods = []
+        history = []
+
+        def handler(request: httpx.Request):
+            body = json.loads(request.content)
+            methods.append(body["method"])
+            if body["method"] == "tasks/send":
+                history.append(body["params"]["message"])
+                raise httpx.ReadTimeout("timed out", request=request)
+            return httpx.Response(
+                200, json=task_result(body["params"]["id"], body["id"], history)
+            )
+
+        client = make_client(handler)
+        response = await client.send_task({"id": "task", "message": USER_MESSAGE})
+
+        self.assertEqual(response.result.id, "task")
+        self.assertEqual(methods, ["tasks/send", "tasks/get"])
+
+    async def test_send_task_to_an_existing_task_is_resent_if_lost(self):
+        # A later turn of a conversation reuses the task id: the task exists,
+        # but the lost message is not in its history.
+        methods = []
+        previous_turn = [{**USER_MESSAGE, "metadata": {"messageId": "previous"}}]
+
+        def handler(request: httpx.Request):
+            body = json.loads(request.content)
+            methods.append(body["method"])
+            if body["method"] == "tasks/send" and methods.count("tasks/send") == 1:
+                raise httpx.ReadTimeout("timed out", request=request)
+            return httpx.Response(
+                200, json=task_result(body["params"]["id"], body["id"], previous_turn)
+            )
+
+        client = make_client(handler)
+        response = await client.send_task({"id": "task", "message": USER_MESSAGE})
+
+        self.assertEqual(response.result.id, "task")
+        self.assertEqual(methods, ["tasks/send", "tasks/get", "tasks/send"])
+
+    async def test_reused_message_gets_a_new_id_per_send(self):
+        message_ids = []
+
+        def handler(request: httpx.Request):
+            body = json.loads(request.content)
+            message_ids.append(body["params"]["message"]["metadata"]["messageId"])
+            return httpx.Response(200, json=task_result("task", body["id"]))
+
+        client = make_client(handler)
+        params = TaskSendParams(id="task", message=USER_MESSAGE)
+        await client.send_task(params)
+        await client.send_task(params)
+
+        self.assertEqual(len(set(message_ids)), 2)
+        self.assertIsNone(params.message.metadata)
+
+    async def test_hedged_get_returns_the_first_answer(self):
+        calls = 0
+
+        async def handler(request: httpx.Request):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(10)
+            return httpx.Response(200, json=task_result("task", json.loads(request.content)["id"]))
+
+        client = make_client(handler, hedge_after=0.01)
+        response = await asyncio.wait_for(client.get_task({"id": "task"}), timeout=5)
+
+        self.assertEqual(response.result.id, "task")
+        self.assertEqual(client.hedged_requests, 1)
+
+    async def test_open_circuit_fails_fast(self):
+        calls = []
+
+        def handler(request: httpx.Request):
+            calls.append(request)
+            raise httpx.ConnectError("refused", request=request)
+
+        client = make_client(handler, max_attempts=1, failure_threshold=2)
+        for _ in range(2):
+            with self.assertRaises(httpx.ConnectError):
+                await client.get_task({"id": "task"})
+        self.assertEqual(client.circuit_state, CircuitState.OPEN)
+
+        with self.assertRaises(A2AClientCircuitOpenError):
+            await client.get_task({"id": "task"})
+        self.assertEqual(len(calls), 2)
+
+    async def test_stream_probe_closes_the_circuit(self):
+        failing = True
+
+        def handler(request: httpx.Request):
+            if failing:
+                raise httpx.ConnectError("refused", request=request)
+            event = {"jsonrpc": "2.0", "id": 1, "result": {
+                "id": "task", "status": {"state": "completed"}, "final": True,
+            }}
+            return httpx.Response(
+                200,
+                content=f"id: 1\ndata: {json.dumps(event)}\n\n",
+                headers={"content-type": "text/event-stream"},
+            )
+
+        client = make_client(handler, max_attempts=1, failure_threshold=1)
+        with self.assertRaises(httpx.ConnectError):
+            await client.get_task({"id": "task"})
+        self.assertEqual(client.circuit_state, CircuitState.OPEN)
+
+        failing = False
+        client.circuit_breaker.opened_at -= client.circuit_breaker.reset_timeout
+        stream = client.send_task_streaming({"id": "task", "message": USER_MESSAGE})
+        events = [event async for event in stream]
+
+        self.assertTrue(events[0].result.final)
+        self.assertEqual(client.circuit_state, CircuitState.CLOSED)
+
+    async def test_abandoned_probe_is_released(self):
+        async def handler(request: httpx.Request):
+            await asyncio.sleep(10)
+
+        client = make_client(handler, failure_threshold=1)
+        client.circuit_breaker.record_failure()
+        client.circuit_breaker.opened_at -= client.circuit_breaker.reset_timeout
+
+        probe = asyncio.create_task(client.get_task({"id": "task"}))
+        await asyncio.sleep(0.01)
+        with self.assertRaises(A2AClientCircuitOpenError):
+            await client.get_task({"id": "task"})
+        probe.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await probe
+
+        self.assertEqual(client.circuit_state, CircuitState.HALF_OPEN)
+        self.assertFalse(client.circuit_breaker.probing)
+
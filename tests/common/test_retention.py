@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+from common.types import (
+    GetTaskRequest,
+    Message,
+    TaskNotFoundError,
+    TaskQueryParams,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from common.server.task_manager import InMemoryTaskManager
+from common.server.task_store import InMemoryTaskStore
+from common.server.retention import TaskRetention
+
+
+class RetainingTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        pass
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+class TestTaskRetention(unittest.IsolatedAsyncioTestCase):
+    def make_task_manager(self, **retention):
+        return RetainingTaskManager(
+            task_store=InMemoryTaskStore(), task_retention=TaskRetention(**retention)
+        )
+
+    async def add_task(self, task_manager, task_id, state):
+        await task_manager.upsert_task(
+            TaskSendParams(
+                id=task_id, message=Message(role="user", parts=[TextPart(text="hi")])
+            )
+        )
+        await task_manager.update_store(task_id, TaskStatus(state=state), None)
+
+    async def test_ttl_evicts_only_finished_tasks(self):
+        task_manager = self.make_task_manager(terminal_task_ttl=0)
+        await self.add_task(task_manager, "done", TaskState.COMPLETED)
+        await self.add_task(task_manager, "busy", TaskState.WORKING)
+        await task_manager.enqueue_events_for_sse(
+            "done",
+            TaskStatusUpdateEvent(
+                id="done", status=TaskStatus(state=TaskState.COMPLETED), final=True
+            ),
+        )
+
+        self.assertEqual(await task_manager.sweep_expired_tasks(), 1)
+        self.assertEqual(list(task_manager.tasks), ["busy"])
+        self.assertNotIn("done", task_manager.task_event_buffers)
+        self.assertEqual(task_manager.metrics()["tasks_evicted"]["ttl"], 1)
+
+    async def test_capacity_evicts_least_recently_used_idle_task(self):
+        task_manager = self.make_task_manager(max_tasks=2)
+        await self.add_task(task_manager, "busy", TaskState.WORKING)
+        await self.add_task(task_manager, "old", TaskState.COMPLETED)
+        await self.add_task(task_manager, "recent", TaskState.INPUT_REQUIRED)
+
+        self.assertEqual(sorted(task_manager.tasks), ["busy", "recent"])
+        self.assertEqual(task_manager.metrics()["tasks_evicted"]["capacity"], 1)
+
+    async def test_get_evicted_task(self):
+        task_manager = self.make_task_manager(terminal_task_ttl=0)
+        await self.add_task(task_manager, "done", TaskState.COMPLETED)
+        await task_manager.sweep_expired_tasks()
+
+        response = await task_manager.on_get_task(
+            GetTaskRequest(id="1", params=TaskQueryParams(id="done"))
+        )
+        self.assertIsInstance(response.error, TaskNotFoundError)
+        self.assertIn("evicted", response.error.message)
+
+    async def test_start_runs_sweeper(self):
+        task_manager = RetainingTaskManager(
+            task_store=InMemoryTaskStore(),
+            task_retention=TaskRetention(terminal_task_ttl=0),
+            sweep_interval=0.01,
+        )
+        await task_manager.start()
+        await self.add_task(task_manager, "done", TaskState.COMPLETED)
+        for _ in range(100):
+            if not task_manager.tasks:
+                break
+            await asyncio.sleep(0.01)
+        await task_manager.close()
+        self.assertEqual(task_manager.tasks, {})
+
+    async def test_nothing_is_tracked_without_limits(self):
+        task_manager = self.make_task_manager()
+        await self.add_task(task_manager, "done", TaskState.COMPLETED)
+
+        self.assertEqual(task_manager.task_retention.task_states, {})
+        self.assertEqual(task_manager.task_retention.finished_at, {})
+        self.assertEqual(await task_manager.sweep_expired_tasks(), 0)
@@ -0,0 +1,340 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+import httpx
+from starlette.testclient import TestClient
+from common.client import A2AClient
+from common.server import A2AServer, InMemoryTaskManager
+from common.server.task_store import InMemoryTaskStore
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    GetTaskRequest,
+    GetTaskResponse,
+    Message,
+    SendTaskStreamingRequest,
+    SendTaskStreamingResponse,
+    Task,
+    TaskIdParams,
+    TaskQueryParams,
+    TaskResubscriptionRequest,
+    TaskSendParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+
+class EchoTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        pass
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+def make_server() -> A2AServer:
+    task_manager = EchoTaskManager(task_store=InMemoryTaskStore())
+    for i in range(3):
+        task_manager.tasks[f"task_{i}"] = Task(
+            id=f"task_{i}", status=TaskStatus(state=TaskState.WORKING)
+        )
+    agent_card = AgentCard(
+        name="Echo",
+        url="http://test/",
+        version="1.0.0",
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+    return A2AServer(agent_card=agent_card, task_manager=task_manager)
+
+
+def get_task_payload(request_id, task_id):
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tasks/get",
+        "params": {"id": task_id},
+    }
+
+
+class TestA2AServer(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(make_server().app)
+
+    def test_single_request(self):
+        response = self.client.post("/", json=get_task_payload(1, "task_0"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["result"]["id"], "task_0")
+
+    def test_batch_request(self):
+        response = self.client.post(
+            "/",
+            json=[
+                get_task_payload(1, "task_0"),
+                get_task_payload(2, "task_2"),
+                get_task_payload(3, "missing"),
+            ],
+        )
+        self.assertEqual(response.status_code, 200)
+        body = {entry["id"]: entry for entry in response.json()}
+        self.assertEqual(body[1]["result"]["id"], "task_0")
+        self.assertEqual(body[2]["result"]["id"], "task_2")
+        self.assertEqual(body[3]["error"]["code"], -32001)
+
+    def test_batch_rejects_streaming_and_invalid_entries(self):
+        streaming = SendTaskStreamingRequest(
+            id="stream",
+            params=TaskSendParams(
+                id="task_0", message=Message(role="user", parts=[TextPart(text="hi")])
+            ),
+        ).model_dump()
+        response = self.client.post(
+            "/",
+            json=[streaming, {"jsonrpc": "2.0", "id": "bad", "method": "tasks/unknown"}],
+        )
+        body = {entry["id"]: entry for entry in response.json()}
+        self.assertEqual(body["stream"]["error"]["code"], -32600)
+        self.assertEqual(body["bad"]["error"]["code"], -32600)
+
+    def test_invalid_json(self):
+        response = self.client.post(
+            "/", content=b'{"jsonrpc": "2.0",', headers={"Content-Type": "application/json"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], -32700)
+
+    def test_invalid_request(self):
+        response = self.client.post("/", json={"jsonrpc": "2.0", "method": "tasks/get"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], -32600)
+
+    def test_agent_card(self):
+        response = self.client.get("/.well-known/agent.json")
+        self.assertEqual(response.json()["name"], "Echo")
+        self.assertNotIn("provider", response.json())
+
+    def test_empty_batch(self):
+        response = self.client.post("/", json=[])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], -32600)
+
+
+class TestA2AClientBatch(unittest.IsolatedAsyncioTestCase):
+    async def test_batch(self):
+        server = make_server()
+        client = A2AClient(
+            url="http://test/",
+            http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app)),
+        )
+        requests = [
+            GetTaskRequest(params=TaskQueryParams(id=f"task_{i}")) for i in range(3)
+        ]
+        responses = await client.batch(requests)
+
+        self.assertEqual([r.id for r in responses], [r.id for r in requests])
+        for i, response in enumerate(responses):
+            self.assertIsInstance(response, GetTaskResponse)
+            self.assertEqual(response.result.id, f"task_{i}")
+
+    async def test_batch_rejects_streaming(self):
+        client = A2AClient(url="http://test/")
+        with self.assertRaises(ValueError):
+            await client.batch(
+                [
+                    SendTaskStreamingRequest(
+                        params=TaskSendParams(
+                            id="task",
+                            message=Message(role="user", parts=[TextPart(text="hi")]),
+                        )
+                    )
+                ]
+            )
+
+
+class TestA2AServerResubscribe(unittest.IsolatedAsyncioTestCase):
+    async def test_resubscribe_honours_last_event_id(self):
+        server = make_server()
+        for i in range(3):
+            await server.task_manager.enqueue_events_for_sse(
+                "task_0",
+                TaskStatusUpdateEvent(
+                    id="task_0",
+                    final=i == 2,
+                    status=TaskStatus(state=TaskState.WORKING),
+                ),
+            )
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.app), base_url="http://test"
+        ) as client:
+            response = await client.post(
+                "/",
+                json=TaskResubscriptionRequest(
+                    id="1", params=TaskIdParams(id="task_0")
+                ).model_dump(),
+                headers={"Last-Event-ID": "0"},
+            )
+
+        event_ids = [
+            line.removeprefix("id:").strip()
+            for line in response.text.splitlines()
+            if line.startswith("id:")
+        ]
+        self.assertEqual(event_ids, ["1", "2"])
+
+
+    async def test_last_event_id_header_wins_over_metadata(self):
+        server = make_server()
+        for i in range(3):
+            await server.task_manager.enqueue_events_for_sse(
+                "task_0",
+                TaskStatusUpdateEvent(
+                    id="task_0",
+                    final=i == 2,
+                    status=TaskStatus(state=TaskState.WORKING),
+                ),
+            )
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=server.app), base_url="http://test"
+        ) as client:
+            response = await client.post(
+                "/",
+                json=TaskResubscriptionRequest(
+                    id="1", params=TaskIdParams(id="task_0", metadata={"lastEventId": 0})
+                ).model_dump(),
+                headers={"Last-Event-ID": "1"},
+            )
+
+        event_ids = [
+            line.removeprefix("id:").strip()
+            for line in response.text.splitlines()
+            if line.startswith("id:")
+        ]
+        self.assertEqual(event_ids, ["2"])
+
+
+class TestA2AClientConnections(unittest.IsolatedAsyncioTestCase):
+    async def test_requests_share_one_pooled_client(self):
+        server = make_server()
+        async_client = httpx.AsyncClient
+        created = []
+
+        def make_client(*args, **kwargs):
+            created.append(kwargs)
+            return async_client(transport=httpx.ASGITransport(app=server.app))
+
+        with patch("common.client.client.httpx.AsyncClient", make_client):
+            async with A2AClient(url="http://test/", http2=False) as client:
+                for i in range(3):
+                    response = await client.get_task({"id": f"task_{i}"})
+                    self.assertEqual(response.result.id, f"task_{i}")
+                http_client = client.http_client
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(created[0]["timeout"], 30)
+        self.assertTrue(http_client.is_closed)
+
+    async def test_caller_owned_client_is_not_closed(self):
+        http_client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=make_server().app)
+        )
+        async with A2AClient(url="http://test/", http_client=http_client) as client:
+            response = await client.get_task({"id": "task_0"})
+            self.assertEqual(response.result.id, "task_0")
+        self.assertFalse(http_client.is_closed)
+        await http_client.aclose()
+
+
+class StreamingTaskManager(EchoTaskManager):
+    """Holds every stream open until `expected_streams` have been started."""
+
+    def __init__(self, expected_streams: int):
+        super().__init__(task_store=InMemoryTaskStore())
+        self.expected_streams = expected_streams
+        self.started = 0
+        self.all_started = asyncio.Event()
+        self.closed = 0
+
+    async def on_send_task_subscribe(self, request):
+        return self.stream(request)
+
+    async def stream(self, request):
+        task_id = request.params.id
+        try:
+            yield SendTaskStreamingResponse(
+                id=request.id,
+                result=TaskStatusUpdateEvent(
+                    id=task_id, status=TaskStatus(state=TaskState.WORKING)
+                ),
+            )
+            self.started += 1
+            if self.started == self.expected_streams:
+                self.all_started.set()
+            await self.all_started.wait()
+            yield SendTaskStreamingResponse(
+                id=request.id,
+                result=TaskStatusUpdateEvent(
+                    id=task_id, final=True, status=TaskStatus(state=TaskState.COMPLETED)
+                ),
+            )
+        finally:
+            self.closed += 1
+
+
+def make_streaming_client(task_manager: StreamingTaskManager) -> A2AClient:
+    server = A2AServer(agent_card=make_server().agent_card, task_manager=task_manager)
+    return A2AClient(
+        url="http://test/",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app)),
+    )
+
+
+def stream_payload(task_id: str) -> dict:
+    return TaskSendParams(
+        id=task_id, message=Message(role="user", parts=[TextPart(text="hi")])
+    ).model_dump()
+
+
+class TestA2AClientStreaming(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_streams_share_one_loop(self):
+        # No stream can finish until all of them have reached the server, so
+        # this only completes if the client never blocks the event loop.
+        task_manager = StreamingTaskManager(expected_streams=100)
+        client = make_streaming_client(task_manager)
+
+        async def consume(task_id):
+            return [
+                response.result
+                async for response in client.send_task_streaming(stream_payload(task_id))
+            ]
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(consume(f"task_{i}") for i in range(100))), timeout=30
+        )
+
+        for i, events in enumerate(results):
+            self.assertEqual([event.id for event in events], [f"task_{i}"] * 2)
+            self.assertTrue(events[-1].final)
+        await client.close()
+
+    async def test_cancelling_the_consumer_closes_the_stream(self):
+        task_manager = StreamingTaskManager(expected_streams=2)
+        client = make_streaming_client(task_manager)
+
+        async def consume():
+            async for _ in client.send_task_streaming(stream_payload("task")):
+                pass
+
+        consumer = asyncio.create_task(consume())
+        async with asyncio.timeout(10):
+            while task_manager.started < 1:
+                await asyncio.sleep(0.01)
+        consumer.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await consumer
+
+        self.assertEqual(task_manager.closed, 1)
+        await client.close()
@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+from common.types import (
+    Artifact,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from common.server.subscriber_queue import OverflowPolicy, SequencedEvent, SubscriberQueue
+
+
+def status_event(state=TaskState.WORKING, final=False, seq=0):
+    return SequencedEvent(
+        seq, TaskStatusUpdateEvent(id="task", status=TaskStatus(state=state), final=final)
+    )
+
+
+def artifact_event(seq=0):
+    return SequencedEvent(
+        seq, TaskArtifactUpdateEvent(id="task", artifact=Artifact(parts=[TextPart(text="a")]))
+    )
+
+
+def drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+class TestSubscriberQueue(unittest.IsolatedAsyncioTestCase):
+    async def test_block_waits_for_consumer(self):
+        queue = SubscriberQueue(maxsize=1)
+        await queue.put(status_event())
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(queue.put(status_event()), timeout=0.05)
+
+    async def test_drop_oldest_working(self):
+        queue = SubscriberQueue(maxsize=3, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        first = status_event(seq=0)
+        artifact = artifact_event(seq=1)
+        second = status_event(seq=2)
+        final = status_event(TaskState.COMPLETED, final=True, seq=3)
+        for event in (first, artifact, second, final):
+            await queue.put(event)
+
+        self.assertEqual(drain(queue), [artifact, second, final])
+        self.assertEqual(queue.dropped, 1)
+
+    async def test_drop_oldest_never_drops_final_or_artifacts(self):
+        queue = SubscriberQueue(maxsize=1, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        await queue.put(artifact_event())
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(queue.put(status_event()), timeout=0.05)
+
+    async def test_coalesce_keeps_latest_status(self):
+        queue = SubscriberQueue(maxsize=2, overflow_policy=OverflowPolicy.COALESCE)
+        artifact = artifact_event(seq=0)
+        latest = status_event(TaskState.INPUT_REQUIRED, seq=3)
+        for event in (artifact, status_event(seq=1), status_event(seq=2), latest):
+            await queue.put(event)
+
+        self.assertEqual(drain(queue), [artifact, latest])
+        self.assertEqual(queue.coalesced, 2)
+
+    async def test_coalesce_does_not_replace_with_final(self):
+        queue = SubscriberQueue(maxsize=1, overflow_policy=OverflowPolicy.COALESCE)
+        await queue.put(status_event())
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                queue.put(status_event(TaskState.COMPLETED, final=True)), timeout=0.05
+            )
+
+    async def test_close_releases_blocked_producer(self):
+        queue = SubscriberQueue(maxsize=1)
+        await queue.put(status_event())
+        producer = asyncio.create_task(queue.put(status_event()))
+        await asyncio.sleep(0)
+        queue.close()
+        await asyncio.wait_for(producer, timeout=1)
+        await queue.put(status_event())
@@ -1,3 +1,5 @@
+import asyncio
+import json
 import unittest
 from unittest.mock import patch
 from common.types import (
@@ -16,7 +18,6 @@ from common.types import (
     TaskNotFoundError,
     TaskNotCancelableError,
     PushNotificationNotSupportedError,
-    UnsupportedOperationError,
     SendTaskStreamingResponse,
     GetTaskResponse,
     CancelTaskResponse,
@@ -180,7 +181,53 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
         request = TaskResubscriptionRequest(id="1", params=TaskIdParams(id="test_task"))
         response = await self.task_manager.on_resubscribe_to_task(request)
         self.assertIsInstance(response, JSONRPCResponse)
-        self.assertIsInstance(response.error, UnsupportedOperationError)
+        self.assertIsInstance(response.error, TaskNotFoundError)
+
+    async def test_on_resubscribe_to_task_replays_missed_events(self):
+        task_id = "test_task"
+        sse_queue = await self.task_manager.setup_sse_consumer(task_id)
+        events = [
+            TaskStatusUpdateEvent(
+                id=task_id, final=i == 4, status=TaskStatus(state=TaskState.WORKING)
+            )
+            for i in range(5)
+        ]
+        await self.task_manager.enqueue_events_for_sse(task_id, events[0])
+        await self.task_manager.enqueue_events_for_sse(task_id, events[1])
+        # The client disconnects after seeing the first two events.
+        stream = self.task_manager.dequeue_events_for_sse("1", task_id, sse_queue)
+        seen = [await anext(stream), await anext(stream)]
+        await stream.aclose()
+        for event in events[2:]:
+            await self.task_manager.enqueue_events_for_sse(task_id, event)
+
+        request = TaskResubscriptionRequest(
+            id="2",
+            params=TaskIdParams(id=task_id, metadata={"lastEventId": seen[-1].event_id}),
+        )
+        response = await self.task_manager.on_resubscribe_to_task(request)
+        replayed = [item async for item in response]
+        self.assertEqual([r.event_id for r in replayed], [2, 3, 4])
+        self.assertEqual([r.result for r in replayed], events[2:])
+
+    async def test_replay_buffer_is_dropped_after_the_final_event(self):
+        task_id = "test_task"
+        self.task_manager.replay_grace_period = 0
+        await self.task_manager.enqueue_events_for_sse(
+            task_id,
+            TaskStatusUpdateEvent(id=task_id, final=False, status=TaskStatus(state=TaskState.WORKING)),
+        )
+        await asyncio.sleep(0)
+        self.assertIn(task_id, self.task_manager.task_event_buffers)
+
+        await self.task_manager.enqueue_events_for_sse(
+            task_id,
+            TaskStatusUpdateEvent(id=task_id, final=True, status=TaskStatus(state=TaskState.COMPLETED)),
+        )
+        self.assertIn(task_id, self.task_manager.task_event_buffers)
+        await asyncio.sleep(0.01)
+        self.assertNotIn(task_id, self.task_manager.task_event_buffers)
+        self.assertNotIn(task_id, self.task_manager.buffer_drops)
 
     async def test_update_store_success(self):
         task_id = "test_task"
@@ -220,8 +267,12 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
             ],
         )
         new_task = self.task_manager.append_task_history(task, 3)
-        self.assertEqual(len(new_task.history), 3)
-        self.assertEqual(new_task.history[0].parts[0].text, "Message 2")
+        history = new_task.model_dump()["history"]
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history[0]["parts"][0]["text"], "Message 2")
+        # The window is applied on serialization; the list itself is shared.
+        self.assertIs(new_task.history, task.history)
+        self.assertEqual(len(task.model_dump()["history"]), 5)
 
     async def test_append_task_history_no_length(self):
         task = Task(
@@ -234,7 +285,8 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
             ],
         )
         new_task = self.task_manager.append_task_history(task, None)
-        self.assertEqual(len(new_task.history), 0)
+        self.assertEqual(len(new_task.model_dump()["history"]), 0)
+        self.assertEqual(json.loads(new_task.model_dump_json())["history"], [])
 
     async def test_setup_sse_consumer_new_task(self):
         task_id = "new_task"
@@ -271,7 +323,7 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
         )
         await self.task_manager.enqueue_events_for_sse(task_id, task_update_event)
         retrieved_event = await sse_queue.get()
-        self.assertEqual(retrieved_event, task_update_event)
+        self.assertEqual(retrieved_event.event, task_update_event)
 
     async def test_dequeue_events_for_sse_success(self):
         task_id = "test_task"
@@ -313,4 +365,83 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
             request_id, task_id, sse_queue
         ):
             pass
-        self.assertEqual(len(self.task_manager.task_sse_subscribers[task_id]), 0)
+        self.assertNotIn(task_id, self.task_manager.task_sse_subscribers)
+
+    async def test_resubscribe_to_finished_task_sends_its_status(self):
+        task_id = "test_task"
+        await self.task_manager.upsert_task(
+            TaskSendParams(id=task_id, message=self.get_test_message(role="user"))
+        )
+        status = TaskStatus(state=TaskState.COMPLETED)
+        await self.task_manager.update_store(task_id, status, None)
+        sse_queue = await self.task_manager.setup_sse_consumer(task_id)
+        await self.task_manager.enqueue_events_for_sse(
+            task_id, TaskStatusUpdateEvent(id=task_id, final=True, status=status)
+        )
+        async for _ in self.task_manager.dequeue_events_for_sse("1", task_id, sse_queue):
+            pass
+
+        response = await self.task_manager.on_resubscribe_to_task(
+            TaskResubscriptionRequest(id="2", params=TaskIdParams(id=task_id))
+        )
+        events = await asyncio.wait_for(self.collect(response), timeout=1)
+        self.assertEqual(len(events), 1)
+        self.assertTrue(events[0].result.final)
+        self.assertEqual(events[0].result.status.state, TaskState.COMPLETED)
+
+    @staticmethod
+    async def collect(stream):
+        return [event async for event in stream]
+
+    async def test_get_task_does_not_wait_for_task_lock(self):
+        task_send_params = TaskSendParams(
+            id="hot_task", message=self.get_test_message(role="user")
+        )
+        await self.task_manager.upsert_task(task_send_params)
+        request = GetTaskRequest(id="1", params=TaskQueryParams(id="hot_task"))
+        async with self.task_manager.task_lock("hot_task"):
+            response = await asyncio.wait_for(
+                self.task_manager.on_get_task(request), timeout=1
+            )
+        self.assertEqual(response.result.id, "hot_task")
+
+    async def test_update_store_only_waits_for_own_stripe(self):
+        other_id = next(
+            f"task_{i}"
+            for i in range(1000)
+            if self.task_manager.task_lock(f"task_{i}")
+            is not self.task_manager.task_lock("hot_task")
+        )
+        for task_id in ("hot_task", other_id):
+            await self.task_manager.upsert_task(
+                TaskSendParams(id=task_id, message=self.get_test_message(role="user"))
+            )
+        async with self.task_manager.task_lock("hot_task"):
+            task = await asyncio.wait_for(
+                self.task_manager.update_store(
+                    other_id, TaskStatus(state=TaskState.WORKING), None
+                ),
+                timeout=1,
+            )
+            self.assertEqual(task.status.state, TaskState.WORKING)
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self.task_manager.update_store(
+                        "hot_task", TaskStatus(state=TaskState.WORKING), None
+                    ),
+                    timeout=0.05,
+                )
+
+    async def test_sse_queue_depth_metric(self):
+        task_id = "metrics_task"
+        await self.task_manager.setup_sse_consumer(task_id)
+        for _ in range(3):
+            await self.task_manager.enqueue_events_for_sse(
+                task_id,
+                TaskStatusUpdateEvent(
+                    id=task_id, final=False, status=TaskStatus(state=TaskState.WORKING)
+                ),
+            )
+        metrics = self.task_manager.metrics()
+        self.assertEqual(metrics["sse_queue_depth"][task_id], 3)
+        self.assertEqual(metrics["sse_events_dropped"], 0)
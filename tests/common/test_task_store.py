@@ -0,0 +1,146 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from common.types import (
+    Task,
+    TaskStatus,
+    TaskState,
+    TaskSendParams,
+    Message,
+    TextPart,
+    PushNotificationConfig,
+    GetTaskRequest,
+    GetTaskResponse,
+    TaskQueryParams,
+    TaskNotFoundError,
+)
+from common.server.task_manager import InMemoryTaskManager
+from common.server.task_store import InMemoryTaskStore, SQLiteTaskStore
+
+
+class StoreBackedTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        pass
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+def get_test_message(role="user", text="Test Message"):
+    return Message(role=role, parts=[TextPart(text=text)])
+
+
+class TestInMemoryTaskStore(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.store = InMemoryTaskStore()
+
+    async def test_save_and_get_task(self):
+        task = Task(id="task", status=TaskStatus(state=TaskState.WORKING))
+        await self.store.save_task(task)
+        self.assertIs(await self.store.get_task("task"), task)
+        self.assertIsNone(await self.store.get_task("missing"))
+
+    async def test_delete_task_removes_push_notification_info(self):
+        await self.store.save_task(
+            Task(id="task", status=TaskStatus(state=TaskState.WORKING))
+        )
+        await self.store.set_push_notification_info(
+            "task", PushNotificationConfig(url="http://test.com")
+        )
+        await self.store.delete_task("task")
+        self.assertIsNone(await self.store.get_task("task"))
+        self.assertIsNone(await self.store.get_push_notification_info("task"))
+
+
+class TestSQLiteTaskStore(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "tasks.db")
+        self.store = SQLiteTaskStore(self.path)
+
+    async def asyncTearDown(self):
+        await self.store.close()
+        self.tmpdir.cleanup()
+
+    async def reopen(self):
+        await self.store.close()
+        self.store = SQLiteTaskStore(self.path)
+
+    async def test_tasks_survive_restart(self):
+        task = Task(
+            id="task",
+            status=TaskStatus(state=TaskState.WORKING),
+            history=[get_test_message()],
+        )
+        await self.store.save_task(task)
+        await self.store.set_push_notification_info(
+            "task", PushNotificationConfig(url="http://test.com", token="token")
+        )
+        await self.reopen()
+
+        restored = await self.store.get_task("task")
+        self.assertEqual(restored.status.state, TaskState.WORKING)
+        self.assertEqual(restored.history[0].parts[0].text, "Test Message")
+        notification_config = await self.store.get_push_notification_info("task")
+        self.assertEqual(notification_config.token, "token")
+
+    async def test_terminal_tasks_leave_working_set(self):
+        task = Task(id="task", status=TaskStatus(state=TaskState.WORKING))
+        await self.store.save_task(task)
+        self.assertIn("task", self.store.tasks)
+
+        task.status = TaskStatus(state=TaskState.COMPLETED)
+        await self.store.save_task(task)
+        self.assertNotIn("task", self.store.tasks)
+        restored = await self.store.get_task("task")
+        self.assertEqual(restored.status.state, TaskState.COMPLETED)
+
+    async def test_close_closes_read_connections(self):
+        await self.store.save_task(
+            Task(id="task", status=TaskStatus(state=TaskState.COMPLETED))
+        )
+        await self.store.get_task("task")
+        read_conns = list(self.store._read_conns)
+        self.assertTrue(read_conns)
+
+        await self.store.close()
+
+        for conn in read_conns:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+    def test_in_memory_database_is_rejected(self):
+        with self.assertRaises(ValueError):
+            SQLiteTaskStore(":memory:")
+
+    async def test_delete_task(self):
+        await self.store.save_task(
+            Task(id="task", status=TaskStatus(state=TaskState.WORKING))
+        )
+        await self.store.delete_task("task")
+        await self.reopen()
+        self.assertIsNone(await self.store.get_task("task"))
+
+    async def test_task_manager_uses_store(self):
+        task_manager = StoreBackedTaskManager(task_store=self.store)
+        await task_manager.upsert_task(
+            TaskSendParams(id="task", message=get_test_message())
+        )
+        await task_manager.update_store(
+            "task", TaskStatus(state=TaskState.COMPLETED), None
+        )
+        await self.reopen()
+
+        task_manager = StoreBackedTaskManager(task_store=self.store)
+        response = await task_manager.on_get_task(
+            GetTaskRequest(id="1", params=TaskQueryParams(id="task", historyLength=1))
+        )
+        self.assertIsInstance(response, GetTaskResponse)
+        self.assertEqual(response.result.status.state, TaskState.COMPLETED)
+        self.assertEqual(len(response.result.history), 1)
+
+        response = await task_manager.on_get_task(
+            GetTaskRequest(id="2", params=TaskQueryParams(id="missing"))
+        )
+        self.assertIsInstance(response.error, TaskNotFoundError)
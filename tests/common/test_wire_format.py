@@ -0,0 +1,182 @@
+import base64
+import json
+import os
+import unittest
+import httpx
+from common.client import A2AClient
+from common.server import A2AServer, InMemoryTaskManager
+from common.server.task_store import InMemoryTaskStore
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    FileContent,
+    FilePart,
+    GetTaskRequest,
+    Message,
+    SendTaskResponse,
+    SendTaskStreamingResponse,
+    Task,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from common.utils.wire_format import (
+    available_wire_formats,
+    get_wire_format,
+    negotiate_wire_format,
+)
+
+HAS_BINARY_FORMATS = {"application/msgpack", "application/cbor"} <= set(available_wire_formats())
+
+
+class EchoFileTaskManager(InMemoryTaskManager):
+    """Answers with the files it was sent, and streams two status updates."""
+
+    def __init__(self):
+        super().__init__(task_store=InMemoryTaskStore())
+
+    async def on_send_task(self, request):
+        await self.upsert_task(request.params)
+        task = await self.update_store(
+            request.params.id,
+            TaskStatus(state=TaskState.COMPLETED, message=request.params.message),
+            None,
+        )
+        return SendTaskResponse(id=request.id, result=task)
+
+    async def on_send_task_subscribe(self, request):
+        async def events():
+            for state, final in ((TaskState.WORKING, False), (TaskState.COMPLETED, True)):
+                yield SendTaskStreamingResponse(
+                    id=request.id,
+                    result=TaskStatusUpdateEvent(
+                        id=request.params.id, status=TaskStatus(state=state), final=final
+                    ),
+                )
+
+        return events()
+
+
+def make_client(**kwargs) -> A2AClient:
+    agent_card = AgentCard(
+        name="Echo",
+        url="http://test/",
+        version="1.0.0",
+        capabilities=AgentCapabilities(streaming=True),
+        skills=[],
+    )
+    server = A2AServer(agent_card=agent_card, task_manager=EchoFileTaskManager())
+    requests: list[httpx.Request] = []
+    transport = httpx.ASGITransport(app=server.app)
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return await transport.handle_async_request(request)
+
+    client = A2AClient(
+        agent_card=agent_card,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handle)),
+        upload_threshold=None,
+        **kwargs,
+    )
+    client.requests = requests
+    return client
+
+
+def file_message(data: bytes) -> Message:
+    return Message(
+        role="user",
+        parts=[
+            TextPart(text="hi"),
+            FilePart(file=FileContent(name="a.bin", bytes=base64.b64encode(data).decode())),
+        ],
+    )
+
+
+@unittest.skipUnless(HAS_BINARY_FORMATS, "msgpack and cbor2 are not installed")
+class TestWireFormats(unittest.TestCase):
+    def test_round_trip_carries_file_bytes_raw(self):
+        data = os.urandom(3000)
+        task = Task(id="task", status=TaskStatus(state=TaskState.WORKING), history=[file_message(data)])
+        for name in ("msgpack", "cbor"):
+            with self.subTest(name=name):
+                wire_format = get_wire_format(name)
+                body = wire_format.dump(task, exclude_none=True)
+                self.assertIn(data, body)
+                self.assertLess(len(body), len(task.model_dump_json(exclude_none=True)))
+                self.assertEqual(Task.model_validate(wire_format.decode(body)), task)
+
+    def test_negotiation(self):
+        self.assertIsNone(negotiate_wire_format("application/json"))
+        self.assertIsNone(negotiate_wire_format("*/*"))
+        self.assertEqual(negotiate_wire_format("application/msgpack").name, "msgpack")
+        self.assertEqual(
+            negotiate_wire_format("application/msgpack;q=0.5, application/cbor").name, "cbor"
+        )
+        self.assertIsNone(negotiate_wire_format("application/json, application/cbor"))
+
+
+@unittest.skipUnless(HAS_BINARY_FORMATS, "msgpack and cbor2 are not installed")
+class TestA2AClientWireFormat(unittest.IsolatedAsyncioTestCase):
+    async def test_send_task_in_each_format(self):
+        data = os.urandom(1024)
+        for name in ("msgpack", "cbor"):
+            with self.subTest(name=name):
+                client = make_client(wire_format=name)
+                response = await client.send_task(
+                    {"id": "task", "message": file_message(data).model_dump()}
+                )
+
+                file = response.result.status.message.parts[1].file
+                self.assertEqual(base64.b64decode(file.bytes), data)
+                request = client.requests[0]
+                self.assertEqual(request.headers["content-type"], get_wire_format(name).media_type)
+                self.assertIn(data, request.content)
+
+    async def test_streaming_and_batch(self):
+        client = make_client(wire_format="msgpack")
+        events = [
+            response.result
+            async for response in client.send_task_streaming(
+                {"id": "task", "message": file_message(b"x").model_dump()}
+            )
+        ]
+        self.assertEqual([e.status.state for e in events], ["working", "completed"])
+
+        await client.send_task({"id": "task", "message": file_message(b"x").model_dump()})
+        responses = await client.batch(
+            [GetTaskRequest(params={"id": "task"}), GetTaskRequest(params={"id": "missing"})]
+        )
+        self.assertEqual(responses[0].result.id, "task")
+        self.assertIsNotNone(responses[1].error)
+
+    async def test_json_stays_the_default(self):
+        client = make_client()
+        await client.get_task({"id": "missing"})
+        self.assertEqual(client.requests[0].headers["content-type"], "application/json")
+
+    async def test_falls_back_to_json_on_unsupported_media_type(self):
+        content_types = []
+
+        def handler(request: httpx.Request):
+            content_types.append(request.headers["content-type"])
+            if request.headers["content-type"] != "application/json":
+                return httpx.Response(415)
+            body = json.loads(request.content)
+            return httpx.Response(
+                200, json={"jsonrpc": "2.0", "id": body["id"], "result": None}
+            )
+
+        client = A2AClient(
+            url="http://test/",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            wire_format="cbor",
+        )
+        await client.get_task({"id": "task"})
+        await client.get_task({"id": "task"})
+
+        self.assertEqual(
+            content_types, ["application/cbor", "application/json", "application/json"]
+        )
+        self.assertIsNone(client.wire_format)
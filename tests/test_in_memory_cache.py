@@ -1,4 +1,5 @@
 """Test cases for the InMemoryCache utility"""
+import asyncio
 import pytest
 import time
 import threading
@@ -6,7 +7,7 @@ from typing import List
 
 # Assuming your InMemoryCache class is in a file named 'in_memory_cache.py'
 # If it's in the same file, you don't need this import line.
-from common.utils.in_memory_cache import InMemoryCache
+from common.utils.in_memory_cache import AsyncCache, CacheNamespace, InMemoryCache
 
 # --- Fixtures ---
 
@@ -21,6 +22,10 @@ def cache_instance():
     # Clear any state from previous tests
     instance.clear()
     yield instance
+    # Undo any limits, listeners or sweeper a test set up
+    instance.stop_sweeper()
+    instance.configure()
+    instance._eviction_callbacks.clear()
     
 
 # --- Test Cases ---
@@ -205,4 +210,154 @@ def test_concurrent_set_get_different_keys(cache_instance):
 
     # Final verification in main thread
     for k, v in keys_values.items():
-        assert cache_instance.get(k) == v
\ No newline at end of file
+        assert cache_instance.get(k) == v
+
+
+# --- Limits, sweeping and eviction callbacks ---
+
+def record_evictions(cache):
+    evicted = []
+    cache.add_eviction_listener(lambda key, value, reason: evicted.append((key, reason)))
+    return evicted
+
+def test_max_entries_evicts_least_recently_used(cache_instance):
+    evicted = record_evictions(cache_instance)
+    cache_instance.configure(max_entries=2)
+    cache_instance.set("a", 1)
+    cache_instance.set("b", 2)
+    cache_instance.get("a")  # "b" is now the least recently used
+    cache_instance.set("c", 3)
+
+    assert evicted == [("b", "max_entries")]
+    assert cache_instance.get("a") == 1
+    assert cache_instance.get("b") is None
+    assert cache_instance.get("c") == 3
+
+def test_max_bytes_evicts_until_within_limit(cache_instance):
+    evicted = record_evictions(cache_instance)
+    cache_instance.configure(max_bytes=100)
+    cache_instance.set("a", "x" * 40)
+    cache_instance.set("b", {"image": "y" * 40})
+    assert cache_instance.metrics()["bytes"] == 85
+
+    cache_instance.set("c", b"z" * 50)
+    assert evicted == [("a", "max_bytes")]
+    cache_instance.set("b", "small", size=1)  # explicit sizes are trusted
+    assert cache_instance.metrics()["bytes"] == 51
+
+    # A value over the limit by itself is not kept.
+    cache_instance.set("huge", "x" * 101)
+    assert cache_instance.get("huge") is None
+    assert evicted[-1] == ("huge", "max_bytes")
+
+def test_configure_applies_limits_to_existing_entries(cache_instance):
+    cache_instance.set("a", "x" * 60)
+    cache_instance.set("b", "y" * 60)
+    cache_instance.configure(max_bytes=100)
+    assert cache_instance.get("a") is None
+    assert cache_instance.metrics()["bytes"] == 60
+
+def test_sweep_removes_expired_keys_without_a_get(cache_instance):
+    evicted = record_evictions(cache_instance)
+    cache_instance.set("short", 1, ttl=0.05)
+    cache_instance.set("long", 2, ttl=60)
+    cache_instance.set("overwritten", 3, ttl=0.05)
+    cache_instance.set("overwritten", 4)
+    time.sleep(0.1)
+
+    assert cache_instance.sweep() == 1
+    assert evicted == [("short", "expired")]
+    assert "short" not in cache_instance._cache_data
+    assert cache_instance.get("overwritten") == 4
+    assert cache_instance.metrics()["evictions"]["expired"] == 1
+
+def test_background_sweeper(cache_instance):
+    swept = threading.Event()
+    cache_instance.add_eviction_listener(lambda key, value, reason: swept.set())
+    cache_instance.configure(default_ttl=0.05, sweep_interval=0.02)
+    cache_instance.set("key", "value")
+    assert swept.wait(timeout=2)
+    assert "key" not in cache_instance._cache_data
+
+
+
+# --- Namespaces, lock striping and AsyncCache ---
+
+def test_namespaces_have_separate_keys(cache_instance):
+    images = InMemoryCache.namespace("test-images")
+    images.clear()
+    assert InMemoryCache.namespace("test-images") is images
+    assert InMemoryCache.namespace("default") is cache_instance
+
+    images.set("session", "image")
+    cache_instance.set("session", "text")
+    assert images.get("session") == "image"
+    assert cache_instance.get("session") == "text"
+    images.clear()
+    assert cache_instance.get("session") == "text"
+
+def test_striped_namespace_shares_limits_between_stripes():
+    cache = CacheNamespace("striped", lock_stripes=4)
+    cache.configure(max_entries=40)
+    for i in range(400):
+        cache.set(f"key{i}", i)
+    assert len(cache) <= 40
+    assert all(len(stripe.data) <= 10 for stripe in cache._stripes)
+    assert cache.metrics()["evictions"]["max_entries"] == 400 - len(cache)
+    assert cache.get("key399") == 399
+
+def test_striped_namespace_concurrent_access():
+    cache = CacheNamespace("striped", lock_stripes=8)
+
+    def worker(n):
+        for i in range(200):
+            cache.set(f"{n}-{i}", i)
+            assert cache.get(f"{n}-{i}") == i
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(cache) == 1600
+
+def test_async_cache():
+    async def run():
+        cache = AsyncCache()
+        evicted = record_evictions(cache)
+        cache.configure(max_entries=1)
+        await cache.set("a", 1)
+        await cache.set("b", 2, ttl=0.01)
+        assert evicted == [("a", "max_entries")]
+        assert await cache.get("a") is None
+        await asyncio.sleep(0.02)
+        assert await cache.get("b") is None
+        assert evicted[-1] == ("b", "expired")
+        assert await cache.delete("b") is False
+        await cache.close()
+
+    asyncio.run(run())
+
+def test_async_cache_get_or_set_loads_once():
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def fail():
+        raise ValueError("no value")
+
+    async def run():
+        cache = AsyncCache()
+        results = await asyncio.gather(*(cache.get_or_set("key", load) for _ in range(5)))
+        assert results == ["value"] * 5
+        assert await cache.get_or_set("key", load) == "value"
+
+        with pytest.raises(ValueError):
+            await cache.get_or_set("other", fail)
+        assert await cache.get("other") is None
+
+    asyncio.run(run())
+    assert len(loads) == 1
@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+import httpx
+from hosts.cli.push_notification_listener import PushNotificationListener
+from common.utils.push_notification_auth import (
+    PushNotificationReceiverAuth,
+    PushNotificationSenderAuth,
+)
+
+
+def notification(task_id: str, timestamp: str) -> dict:
+    return {"id": task_id, "status": {"state": "working", "timestamp": timestamp}}
+
+
+class TestPushNotificationListener(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.sender = PushNotificationSenderAuth()
+        self.sender.generate_jwk("ES256")
+        receiver = PushNotificationReceiverAuth()
+        receiver.add_signing_keys(self.sender.public_keys)
+        self.batches = []
+
+        async def consumer(batch):
+            self.batches.append(batch)
+
+        self.listener = PushNotificationListener(
+            "localhost", 0, receiver, consumer=consumer, max_queue_size=4, batch_size=3
+        )
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.listener.app), base_url="http://test"
+        )
+
+    async def post(self, data: dict, headers: dict | None = None) -> httpx.Response:
+        body = self.sender.encode_body(data)
+        return await self.client.post(
+            "/notify", content=body, headers=headers or self.sender.get_auth_headers(body)
+        )
+
+    async def test_batches_verified_notifications_and_drops_duplicates(self):
+        for i in range(5):
+            self.assertEqual((await self.post(notification(f"task_{i % 4}", f"t{i % 4}"))).status_code, 200)
+
+        worker = asyncio.create_task(self.listener.deliver_batches())
+        await asyncio.wait_for(self.listener.queue.join(), 5)
+        worker.cancel()
+
+        self.assertEqual([len(batch) for batch in self.batches], [3, 1])
+        self.assertEqual(
+            [n["id"] for batch in self.batches for n in batch],
+            ["task_0", "task_1", "task_2", "task_3"],
+        )
+        metrics = self.listener.metrics()
+        self.assertEqual(metrics["push_notifications_duplicate"], 1)
+        self.assertEqual(metrics["push_notifications_delivered"], 4)
+        self.assertIsNotNone(metrics["push_notification_verify_latency_p99"])
+        self.assertGreater(metrics["push_notification_ingest_rate"], 0)
+
+    async def test_full_queue_asks_sender_to_retry(self):
+        for i in range(4):
+            await self.post(notification("task", f"t{i}"))
+
+        response = await self.post(notification("task", "t4"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.listener.metrics()["push_notifications_dropped"], 1)
+
+        # The dropped notification is not remembered as seen.
+        self.listener.queue.get_nowait()
+        self.assertEqual((await self.post(notification("task", "t4"))).status_code, 200)
+        self.assertEqual(self.listener.accepted, 5)
+
+    async def test_unverified_notification_is_rejected(self):
+        headers = self.sender.get_auth_headers(b"{}")
+
+        response = await self.post(notification("task", "t0"), headers=headers)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.listener.rejected, 1)
+        self.assertTrue(self.listener.queue.empty())